@@ -0,0 +1,85 @@
+# shellcheck shell=bash
+# Result cache for the pre-push check; sourced into strict-mode
+# (set -euo pipefail) callers; do not re-set shell options.
+#
+# A pass is recorded against HEAD^{tree}, the bodies of the package.json
+# scripts the check runs, and the lockfiles, so pushing the same tree again
+# (a no-op rebase, a retried push, re-creating a PR) skips the checks:
+#
+#   source "$CLAUDE_PROJECT_DIR/.claude/hooks/pre-push-cache.bash"
+#   key=$(pre_push_cache_key "$0")
+#   if pre_push_cache_hit "$key"; then allow; fi
+#   ... build, lint, typecheck, test ...
+#   pre_push_cache_record "$key"
+#
+# The checks run against the working tree, so a tree with uncommitted or
+# untracked (non-ignored) changes has no key and is never cached.
+#
+# Inputs (env):
+#   PRE_PUSH_CACHE      Set to 0 to always run the full checks
+#   PRE_PUSH_CACHE_MAX  Entries kept, least recently used evicted (default 64)
+#   PRE_PUSH_SCRIPTS    package.json scripts the check runs
+#                       (default: "build lint typecheck test")
+
+PRE_PUSH_LOCKFILES=(pnpm-lock.yaml package-lock.json yarn.lock uv.lock poetry.lock)
+
+# pre_push_cache_key [FILE...] — "<tree> <inputs>" for a clean HEAD, or
+# nothing when the cache is disabled or the tree can't be keyed. FILEs (e.g.
+# the calling hook) are hashed into <inputs> alongside the lockfiles.
+pre_push_cache_key() {
+  local root tree scripts f
+  local -a inputs=()
+  [[ "${PRE_PUSH_CACHE:-1}" != "0" ]] || return 0
+  root=$(git rev-parse --show-toplevel 2>/dev/null) || return 0
+  tree=$(git rev-parse --verify --quiet 'HEAD^{tree}') || return 0
+  [[ -z "$(git -C "$root" status --porcelain --untracked-files=normal)" ]] || return 0
+
+  scripts="{}"
+  if [[ -f "$root/package.json" ]]; then
+    # shellcheck disable=SC2086  # PRE_PUSH_SCRIPTS is a word list
+    scripts=$(jq -cS '(.scripts // {}) | with_entries(select(.key as $k | $ARGS.positional | index($k)))' \
+      "$root/package.json" --args ${PRE_PUSH_SCRIPTS:-build lint typecheck test}) || return 0
+  fi
+  for f in "${PRE_PUSH_LOCKFILES[@]}"; do
+    [[ -f "$root/$f" ]] && inputs+=("$root/$f")
+  done
+  for f in "$@"; do
+    [[ -f "$f" ]] && inputs+=("$f")
+  done
+  printf '%s %s\n' "$tree" "$({
+    printf '%s\n' "$scripts"
+    ((${#inputs[@]} == 0)) || git hash-object -- "${inputs[@]}"
+  } | git hash-object --stdin)"
+}
+
+# _pre_push_cache_file — the cache's path inside the git dir, so it is shared
+# by all worktrees of a clone and never committed.
+_pre_push_cache_file() {
+  git rev-parse --git-path pre-push-cache
+}
+
+# pre_push_cache_hit KEY — true if KEY already passed; refreshes its recency.
+pre_push_cache_hit() {
+  local cache_file
+  [[ -n "$1" ]] || return 1
+  cache_file=$(_pre_push_cache_file)
+  [[ -f "$cache_file" ]] && grep -qxF -- "$1" "$cache_file" || return 1
+  pre_push_cache_record "$1"
+}
+
+# pre_push_cache_record KEY — move KEY to the most-recent end of the cache,
+# evicting the least recently used entries beyond PRE_PUSH_CACHE_MAX.
+pre_push_cache_record() {
+  local cache_file
+  [[ -n "$1" ]] || return 0
+  cache_file=$(_pre_push_cache_file)
+  # A cache write failure never blocks a push.
+  if {
+    [[ -f "$cache_file" ]] && grep -vxF -- "$1" "$cache_file"
+    printf '%s\n' "$1"
+  } | tail -n "${PRE_PUSH_CACHE_MAX:-64}" >"$cache_file.tmp.$$"; then
+    mv "$cache_file.tmp.$$" "$cache_file" || rm -f "$cache_file.tmp.$$"
+  else
+    rm -f "$cache_file.tmp.$$"
+  fi
+}
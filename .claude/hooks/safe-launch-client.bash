@@ -0,0 +1,87 @@
+# shellcheck shell=bash
+# PreToolUse payload parsing for safe-launch.sh, optionally served by the
+# persistent safe-launch-daemon.py; sourced into strict-mode
+# (set -euo pipefail) callers; do not re-set shell options.
+#
+#   source "${BASH_SOURCE[0]%/*}/safe-launch-client.bash"
+#   { read -r tool_name; read -r file_path; } < <(
+#     safe_launch_parse "$hooks_dir/safe-launch-parse.py" "$project_dir" <<<"$payload")
+#
+# With SAFE_LAUNCH_DAEMON=1 the payload goes to the daemon over a Unix socket
+# (via socat, or an OpenBSD-style `nc -U`), saving an interpreter start per
+# tool call. The first call of a session starts the daemon in the background
+# and parses cold. Any daemon failure — no socket client, no daemon, a
+# timeout, or a non-"ok" reply — falls back to running the parser directly,
+# so the output is always what the parser itself would print.
+#
+# The daemon's reply decides what the guard sees, so the socket must be one
+# this user's daemon created: it lives in a private directory, and both the
+# directory and the socket must be owned by this user with no group or other
+# access. Anything else (say, a socket another local user planted first) is
+# never connected to; the parser runs cold instead.
+#
+# Inputs (env):
+#   SAFE_LAUNCH_DAEMON         Set to 1 to use the daemon (default: off)
+#   SAFE_LAUNCH_SOCKET         Socket path (default: daemon.sock in a 0700
+#                              per-user dir under $XDG_RUNTIME_DIR or /tmp)
+#   SAFE_LAUNCH_DAEMON_IDLE    Seconds the daemon stays up without requests
+#                              (default 1800)
+
+SAFE_LAUNCH_SOCKET="${SAFE_LAUNCH_SOCKET:-${XDG_RUNTIME_DIR:-/tmp}/claude-safe-launch-$UID/daemon.sock}"
+
+# _safe_launch_trusted — true iff the socket and its directory belong to this
+# user and are closed to everyone else.
+_safe_launch_trusted() {
+  local dir="${SAFE_LAUNCH_SOCKET%/*}" modes
+  [[ "$dir" != "$SAFE_LAUNCH_SOCKET" ]] || dir=.
+  [[ -S "$SAFE_LAUNCH_SOCKET" && -O "$SAFE_LAUNCH_SOCKET" && -O "$dir" ]] || return 1
+  # Permission bits in octal: GNU stat, then BSD stat.
+  modes=$(stat -c '%a' "$dir" "$SAFE_LAUNCH_SOCKET" 2>/dev/null) ||
+    modes=$(stat -f '%Lp' "$dir" "$SAFE_LAUNCH_SOCKET" 2>/dev/null) ||
+    return 1
+  [[ "$modes" == $'700\n700' ]]
+}
+
+# _safe_launch_ask PARSER PROJECT_DIR PAYLOAD — the daemon's raw reply;
+# fails without output when the daemon can't be reached or isn't trusted.
+_safe_launch_ask() {
+  local request="$1"$'\n'"$2"$'\n'"$3"
+  _safe_launch_trusted || return 1
+  if command -v socat >/dev/null 2>&1; then
+    printf '%s' "$request" | socat -T 2 - "UNIX-CONNECT:$SAFE_LAUNCH_SOCKET" 2>/dev/null
+  elif command -v nc >/dev/null 2>&1; then
+    printf '%s' "$request" | nc -U -N -w 2 "$SAFE_LAUNCH_SOCKET" 2>/dev/null
+  else
+    return 1
+  fi
+}
+
+# _safe_launch_start_daemon — detach a daemon for later calls. It exits at
+# once if another is already serving the socket.
+_safe_launch_start_daemon() {
+  command -v socat >/dev/null 2>&1 || command -v nc >/dev/null 2>&1 || return 0
+  (
+    umask 077
+    mkdir -p "${SAFE_LAUNCH_SOCKET%/*}" 2>/dev/null || exit 0
+    nohup python3 "${BASH_SOURCE[0]%/*}/safe-launch-daemon.py" "$SAFE_LAUNCH_SOCKET" \
+      </dev/null >/dev/null 2>&1 &
+  )
+}
+
+# safe_launch_parse PARSER PROJECT_DIR — parse the payload on stdin; prints
+# what `python3 PARSER PROJECT_DIR` would.
+safe_launch_parse() {
+  local parser="$1" project_dir="$2" payload="" reply
+  IFS= read -r -d '' payload || true
+  if [[ "${SAFE_LAUNCH_DAEMON:-0}" == "1" ]]; then
+    if reply=$(_safe_launch_ask "$parser" "$project_dir" "$payload") && [[ "$reply" == ok* ]]; then
+      reply="${reply#ok}"
+      [[ -z "${reply#$'\n'}" ]] || printf '%s\n' "${reply#$'\n'}"
+      return 0
+    fi
+    # An "err" reply means the daemon is up but the parser failed; only a
+    # missing daemon needs starting.
+    [[ -n "${reply:-}" ]] || _safe_launch_start_daemon
+  fi
+  printf '%s' "$payload" | python3 "$parser" "$project_dir"
+}
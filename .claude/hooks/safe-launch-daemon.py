@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Persistent PreToolUse payload parser for safe-launch.sh.
+
+Runs safe-launch-parse.py in-process so a tool call doesn't pay for a fresh
+interpreter. One daemon per user serves every project; it exits after
+SAFE_LAUNCH_DAEMON_IDLE seconds (default 1800) without a request.
+
+Usage: safe-launch-daemon.py SOCKET   (SOCKET.lock is held while serving)
+
+Protocol (one request per connection):
+  request   parser path, newline, project dir, newline, raw JSON payload
+            until EOF
+  response  "ok\\n" followed by exactly what the parser would print, or
+            "err\\n" if it raised or exited non-zero
+
+Parser scripts are compiled once and recompiled when their mtime or size
+changes. Clients fall back to running the parser directly on anything but an
+"ok" response (see safe-launch-client.bash), so a broken daemon can only cost
+time, never a wrong allow. Clients also refuse a socket that isn't this
+user's own in a private directory, so another user can't stand in for it.
+"""
+
+import contextlib
+import fcntl
+import io
+import os
+import socketserver
+import sys
+from pathlib import Path
+from types import CodeType
+
+_compiled: dict[str, tuple[tuple[int, int], CodeType]] = {}
+
+
+def load(parser: str) -> CodeType:
+    """Compiled code for *parser*, reusing the cached copy while unchanged."""
+    st = os.stat(parser)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _compiled.get(parser)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    code = compile(Path(parser).read_bytes(), parser, "exec")
+    _compiled[parser] = (stamp, code)
+    return code
+
+
+def run_parser(parser: str, project_dir: str, payload: bytes) -> bytes | None:
+    """Run *parser* as `parser project_dir < payload`; its stdout, or None on failure."""
+    raw = io.BytesIO()
+    # Text streams over bytes, so parsers may use sys.stdin or sys.stdin.buffer.
+    out = io.TextIOWrapper(raw, encoding="utf-8", write_through=True)
+    saved = sys.argv, sys.stdin
+    sys.argv = [parser, project_dir]
+    sys.stdin = io.TextIOWrapper(
+        io.BytesIO(payload), encoding="utf-8", errors="replace"
+    )
+    try:
+        with contextlib.redirect_stdout(out):
+            exec(load(parser), {"__name__": "__main__", "__file__": parser})
+    except SystemExit as exc:
+        if exc.code not in (None, 0):
+            return None
+    except Exception:
+        return None
+    finally:
+        sys.argv, sys.stdin = saved
+    return raw.getvalue()
+
+
+class Handler(socketserver.StreamRequestHandler):
+    timeout = 5  # a client that never finishes its request can't wedge the daemon
+
+    def handle(self) -> None:
+        parser = self.rfile.readline().decode().rstrip("\n")
+        project_dir = self.rfile.readline().decode().rstrip("\n")
+        output = run_parser(parser, project_dir, self.rfile.read()) if parser else None
+        self.wfile.write(b"err\n" if output is None else b"ok\n" + output)
+
+
+class Server(socketserver.UnixStreamServer):
+    """Serves until a full idle timeout passes without a request."""
+
+    idle = False
+
+    def handle_timeout(self) -> None:
+        self.idle = True
+
+
+def main() -> int:
+    if len(sys.argv) != 2:
+        print(f"usage: {sys.argv[0]} SOCKET", file=sys.stderr)
+        return 2
+    path = sys.argv[1]
+    os.umask(0o077)
+    # One daemon per socket: the lock is held for the daemon's lifetime, so a
+    # second daemon (started alongside, or while one serves) exits at once
+    # instead of racing it for the path.
+    lock = open(f"{path}.lock", "a")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return 0
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)  # stale socket from a daemon that died
+    # Requests are handled one at a time: the parser runs with process-wide
+    # sys.stdin/sys.stdout swapped in. The socket is bound under a temporary
+    # name and renamed into place once listening, so a client never finds a
+    # socket file that still refuses connections.
+    staging = f"{path}.{os.getpid()}.tmp"
+    with lock, Server(staging, Handler) as server:
+        os.rename(staging, path)
+        bound = os.stat(path).st_ino
+        server.timeout = float(os.environ.get("SAFE_LAUNCH_DAEMON_IDLE", "1800"))
+        try:
+            while not server.idle:
+                server.handle_request()
+        finally:
+            # Only remove the socket this daemon bound, never a successor's.
+            with contextlib.suppress(FileNotFoundError):
+                if os.stat(path).st_ino == bound:
+                    os.unlink(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+# shellcheck shell=bash
+# Version-pinned, content-addressed tool cache for session setup; sourced into
+# strict-mode (set -euo pipefail) callers; do not re-set shell options.
+#
+# Tools are declared with their pins, then installed once into a store shared
+# by every session and checkout on the machine:
+#
+#   source "$CLAUDE_PROJECT_DIR/.claude/hooks/tool-cache.bash"
+#   tool_cache_add shfmt 3.12.0 url "https://.../shfmt_v3.12.0_linux_amd64" "$sha"
+#   tool_cache_add shellcheck 0.11.0 url "https://.../shellcheck.tar.xz" "" shellcheck-v0.11.0/shellcheck
+#   tool_cache_add ruff 0.15.0 uv "ruff==0.15.0"
+#   tool_cache_install || echo "warning: some tools are unavailable" >&2
+#   export PATH="$TOOL_CACHE_BIN:$PATH"
+#
+# Layout under TOOL_CACHE_DIR:
+#   store/<key>/         one pinned tool; <key> hashes name, version, source
+#                        and archive member, so a pin change is a new entry
+#   store/<key>/.ok      written last: the entry is complete
+#   store/<key>.lock     held while a uv tool installs in place
+#   sets/<key>/bin/      symlinks for one combination of pins
+#   sets/<key>/manifest  "name<TAB>store dir" per tool
+#
+# When every pin is already present, tool_cache_install only reads the
+# manifest and stats each entry: no downloads and no per-tool processes.
+# Missing tools are fetched concurrently.
+#
+# Inputs (env):
+#   TOOL_CACHE_DIR  Cache root (default: $XDG_CACHE_HOME/claude-tools)
+#
+# Outputs:
+#   TOOL_CACHE_BIN  Directory to put on PATH (set by tool_cache_install)
+
+TOOL_CACHE_DIR="${TOOL_CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/claude-tools}"
+TOOL_CACHE_BIN=""
+_tool_cache_specs=()
+
+# _tool_cache_sha256 — SHA-256 hex digest of stdin.
+_tool_cache_sha256() {
+  local digest
+  if command -v sha256sum >/dev/null 2>&1; then
+    read -r digest _ < <(sha256sum)
+  else
+    read -r digest _ < <(shasum -a 256)
+  fi
+  printf '%s\n' "$digest"
+}
+
+# _tool_cache_lock PATH — block until this process holds the lock PATH.
+# Uses flock(1) where available, released by the kernel if the holder dies;
+# otherwise a lock directory, broken once the pid recorded in it is gone.
+_tool_cache_lock() {
+  local owner
+  if command -v flock >/dev/null 2>&1; then
+    exec {_tool_cache_lock_fd}>"$1"
+    flock "$_tool_cache_lock_fd"
+    return
+  fi
+  until mkdir "$1" 2>/dev/null; do
+    owner=$(cat "$1/pid" 2>/dev/null) || owner=""
+    if [[ -n "$owner" ]] && ! kill -0 "$owner" 2>/dev/null; then
+      rm -rf "$1"
+      continue
+    fi
+    sleep 0.1
+  done
+  echo "$BASHPID" >"$1/pid"
+}
+
+# _tool_cache_unlock PATH — release a lock taken with _tool_cache_lock.
+_tool_cache_unlock() {
+  if [[ -n "${_tool_cache_lock_fd:-}" ]]; then
+    exec {_tool_cache_lock_fd}>&-
+    _tool_cache_lock_fd=""
+  else
+    rm -rf "$1"
+  fi
+}
+
+# tool_cache_add NAME VERSION KIND SOURCE [SHA256] [MEMBER]
+#   KIND url: SOURCE is a download URL — a bare binary, or a .tar.gz/.tgz/
+#             .tar.xz archive with the binary at path MEMBER. SHA256, when
+#             given, must match the download.
+#   KIND uv:  SOURCE is a `uv tool install` requirement (e.g. ruff==0.15.0).
+tool_cache_add() {
+  local name="$1" version="$2" kind="$3" source="$4" sha="${5:-}" member="${6:-}"
+  case "$kind" in
+  url | uv) ;;
+  *)
+    echo "tool_cache_add: unknown kind '$kind' for $name" >&2
+    return 2
+    ;;
+  esac
+  # Unit-separated: tab is IFS whitespace, so `read` would merge empty fields.
+  _tool_cache_specs+=("$name"$'\x1f'"$version"$'\x1f'"$kind"$'\x1f'"$source"$'\x1f'"$sha"$'\x1f'"$member")
+}
+
+# _tool_cache_fetch STORE_DIR NAME KIND SOURCE SHA256 MEMBER — install one tool
+# so that STORE_DIR/bin/NAME exists, then mark STORE_DIR complete.
+_tool_cache_fetch() {
+  local dest="$1" name="$2" kind="$3" source="$4" sha="$5" member="$6" tmp actual
+  if [[ "$kind" == "uv" ]]; then
+    # uv tool environments embed absolute paths, so they can't be built aside
+    # and renamed in; install in place, one session at a time.
+    _tool_cache_lock "$dest.lock"
+    if [[ ! -f "$dest/.ok" ]]; then
+      rm -rf "$dest"
+      mkdir -p "$dest/bin"
+      if UV_TOOL_DIR="$dest/tools" UV_TOOL_BIN_DIR="$dest/bin" \
+        uv tool install --quiet "$source" >&2; then
+        touch "$dest/.ok"
+      else
+        rm -rf "$dest"
+      fi
+    fi
+    _tool_cache_unlock "$dest.lock"
+    [[ -f "$dest/.ok" ]]
+    return
+  fi
+
+  tmp=$(mktemp -d "$dest.tmp.XXXXXX")
+  mkdir -p "$tmp/bin"
+  if ! curl -fsSL --retry 2 -o "$tmp/download" "$source"; then
+    rm -rf "$tmp"
+    return 1
+  fi
+  if [[ -n "$sha" ]]; then
+    actual=$(_tool_cache_sha256 <"$tmp/download")
+    if [[ "$actual" != "$sha" ]]; then
+      echo "tool-cache: $name checksum mismatch (expected $sha, got $actual)" >&2
+      rm -rf "$tmp"
+      return 1
+    fi
+  fi
+  case "$source" in
+  *.tar.gz | *.tgz | *.tar.xz)
+    if ! tar -xf "$tmp/download" -C "$tmp" -- "$member" || [[ ! -f "$tmp/$member" ]]; then
+      echo "tool-cache: $name archive has no $member" >&2
+      rm -rf "$tmp"
+      return 1
+    fi
+    mv "$tmp/$member" "$tmp/bin/$name"
+    ;;
+  *) mv "$tmp/download" "$tmp/bin/$name" ;;
+  esac
+  chmod +x "$tmp/bin/$name"
+  touch "$tmp/.ok"
+  # Another session may have finished the same entry first; either copy is
+  # identical, so keep theirs.
+  if [[ -e "$dest" ]] || ! mv "$tmp" "$dest" 2>/dev/null; then
+    rm -rf "$tmp"
+  fi
+  [[ -f "$dest/.ok" ]]
+}
+
+# _tool_cache_set_ready MANIFEST — true if every entry MANIFEST lists is
+# complete. Pure bash: one stat per tool.
+_tool_cache_set_ready() {
+  local name dir
+  [[ -f "$1" ]] || return 1
+  while IFS=$'\t' read -r name dir; do
+    [[ -f "$dir/.ok" && -x "$dir/bin/$name" ]] || return 1
+  done <"$1"
+}
+
+# tool_cache_install — make every declared tool available and set
+# TOOL_CACHE_BIN. Returns 1 if any tool could not be installed; the others
+# are still linked.
+tool_cache_install() {
+  local set_key set_dir spec name version kind source sha member key dir
+  local -a names=() dirs=() pids=() pending=()
+  local i failed=0 manifest=""
+
+  set_key=$(printf '%s\n' "${_tool_cache_specs[@]}" | _tool_cache_sha256)
+  set_dir="$TOOL_CACHE_DIR/sets/$set_key"
+  TOOL_CACHE_BIN="$set_dir/bin"
+  if _tool_cache_set_ready "$set_dir/manifest"; then
+    return 0
+  fi
+
+  mkdir -p "$TOOL_CACHE_DIR/store"
+  for spec in "${_tool_cache_specs[@]}"; do
+    IFS=$'\x1f' read -r name version kind source sha member <<<"$spec"
+    key=$(printf '%s\n' "$spec" | _tool_cache_sha256)
+    dir="$TOOL_CACHE_DIR/store/$key"
+    names+=("$name")
+    dirs+=("$dir")
+    if [[ -f "$dir/.ok" ]]; then
+      pids+=("")
+      continue
+    fi
+    echo "tool-cache: installing $name $version" >&2
+    _tool_cache_fetch "$dir" "$name" "$kind" "$source" "$sha" "$member" &
+    pids+=("$!")
+  done
+
+  for i in "${!names[@]}"; do
+    if [[ -n "${pids[i]}" ]] && ! wait "${pids[i]}"; then
+      echo "tool-cache: failed to install ${names[i]}" >&2
+      failed=1
+      continue
+    fi
+    pending+=("$i")
+  done
+
+  mkdir -p "$TOOL_CACHE_BIN"
+  for i in "${pending[@]}"; do
+    ln -sfn "${dirs[i]}/bin/${names[i]}" "$TOOL_CACHE_BIN/${names[i]}"
+    manifest+="${names[i]}"$'\t'"${dirs[i]}"$'\n'
+  done
+  # Only a complete set gets a manifest, so a partial one is retried.
+  if [[ "$failed" -eq 0 ]]; then
+    printf '%s' "$manifest" >"$set_dir/manifest.tmp.$$"
+    mv "$set_dir/manifest.tmp.$$" "$set_dir/manifest"
+  fi
+  return "$failed"
+}
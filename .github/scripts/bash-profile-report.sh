@@ -0,0 +1,193 @@
+#!/usr/bin/env bash
+# Fold bash xtrace profiles (see lib/profile.bash) into per-line and
+# per-function wall time and fork counts, slowest first, or into folded stacks
+# for flamegraph.pl / speedscope / inferno.
+#
+# Usage: bash-profile-report.sh [--folded] [--top N] TRACE...
+#   --folded  Print "script;outer;inner;file:line MICROSECONDS" lines instead
+#   --top N   Rows per table (default: 20)
+#
+# Times are wall clock. A line is charged from its trace stamp to the next
+# stamp, so concurrent pipeline stages split the time between them, and the
+# columns sum to the run's wall time. The last command of each trace has no
+# next stamp and shows 0. Bash traces a command after expanding it, so the
+# start-up of a $(...) lands on the line traced just before it; the commands
+# inside the substitution are traced and timed on their own.
+#
+# Forks are estimated from the trace: one per subshell, plus one per external
+# command. An external command is anything that is not a builtin, keyword or
+# traced function. A subshell's fork is charged to the first command traced
+# in it; if that command is external it is taken to be exec'd in place, so it
+# adds no second fork.
+
+set -euo pipefail
+
+folded=0
+top=20
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+  --folded)
+    folded=1
+    shift
+    ;;
+  --top)
+    top="${2:?--top needs a number}"
+    shift 2
+    ;;
+  --)
+    shift
+    break
+    ;;
+  -*)
+    echo "Unknown option: $1" >&2
+    exit 2
+    ;;
+  *) break ;;
+  esac
+done
+if [[ $# -eq 0 ]]; then
+  echo "Usage: $0 [--folded] [--top N] TRACE..." >&2
+  exit 2
+fi
+
+builtins="$(compgen -b | tr '\n' ' ') $(compgen -k | tr '\n' ' ') (("
+out=$(mktemp)
+trap 'rm -f "$out"' EXIT
+
+# Keep only trace lines (a multi-line command continues on unprefixed lines),
+# tag each with its file's index, and order each file's lines by time.
+# shellcheck disable=SC2016  # awk program
+awk -v OFS='\t' '
+  FNR == 1 { file++ }
+  /^\++\t[0-9]+[.,][0-9]+\t[0-9]+\t[0-9]+\t/ {
+    sub(/,/, ".", $2)
+    print file, $0
+  }
+' FS='\t' "$@" | LC_ALL=C sort -t $'\t' -k1,1n -k3,3n -s | awk -F '\t' \
+  -v folded="$folded" -v builtins="$builtins" -v q="'" '
+  # Fields: file, depth, time, pid, loader pid, root script, file:line,
+  # function stack (innermost first), command.
+  function base(path) { sub(/.*\//, "", path); return path }
+
+  # First word of an xtrace command after any VAR=value prefixes.
+  function command_word(cmd,   n, w, i, quoted) {
+    n = split(cmd, w, " ")
+    for (i = 1; i <= n; i++) {
+      if (quoted) {
+        if (w[i] ~ (q "$")) quoted = 0
+        continue
+      }
+      if (w[i] ~ /^[A-Za-z_][A-Za-z0-9_]*(\[.*\])?\+?=/) {
+        if (w[i] ~ ("=" q) && w[i] !~ ("=" q ".*" q "$")) quoted = 1
+        continue
+      }
+      return w[i]
+    }
+    return ""
+  }
+
+  BEGIN {
+    n = split(builtins, b, " ")
+    for (i = 1; i <= n; i++) builtin[b[i]] = 1
+  }
+
+  {
+    events++
+    split($3, t, ".")
+    if (!(($1) in base_sec)) base_sec[$1] = t[1]
+    us[events] = (t[1] - base_sec[$1]) * 1000000 + substr(t[2] "000000", 1, 6)
+    src[events] = $1
+    pid[events] = $4
+    loader[events] = $5
+    root[events] = base($6)
+    loc[events] = $7
+    stack[events] = $8
+    cmd = $9
+    for (i = 10; i <= NF; i++) cmd = cmd "\t" $i
+    word[events] = command_word(cmd)
+    k = split($8, f, " ")
+    for (i = 1; i <= k; i++) is_function[f[i]] = 1
+  }
+
+  END {
+    for (e = 1; e <= events; e++) {
+      key = src[e] SUBSEP pid[e]
+      first = !(key in seen_pid)
+      seen_pid[key] = 1
+      subshell_start[e] = first && pid[e] != loader[e]
+      forks[e] = subshell_start[e]
+      w = word[e]
+      if (w != "" && !(w in builtin) && !(w in is_function) && !subshell_start[e]) forks[e]++
+    }
+    for (e = 1; e <= events; e++) {
+      spent[e] = (e < events && src[e + 1] == src[e]) ? us[e + 1] - us[e] : 0
+    }
+
+    for (e = 1; e <= events; e++) {
+      k = split(stack[e], f, " ")
+      inner = k > 0 ? f[1] : "main"
+      if (folded) {
+        path = root[e]
+        for (i = k; i >= 1; i--) if (!(i == k && f[i] == "main")) path = path ";" f[i]
+        folded_us[path ";" loc[e]] += spent[e]
+        continue
+      }
+      line = loc[e] "\t" inner
+      line_us[line] += spent[e]
+      line_hits[line]++
+      line_forks[line] += forks[e]
+      delete counted
+      for (i = 1; i <= k; i++) {
+        # The bottom "main" frame is top-level code, not a function.
+        if ((i == k && f[i] == "main") || f[i] in counted) continue
+        counted[f[i]] = 1
+        func_us[f[i]] += spent[e]
+        func_forks[f[i]] += forks[e]
+      }
+      total_us += spent[e]
+      total_forks += forks[e]
+    }
+
+    if (folded) {
+      for (path in folded_us) printf "%s %d\n", path, folded_us[path]
+      exit
+    }
+    printf "T\t%.1f\t%d\t%d\n", total_us / 1000, events, total_forks
+    for (line in line_us) {
+      printf "L\t%s\t%.1f\t%d\t%d\n", line, line_us[line] / 1000, line_hits[line], line_forks[line]
+    }
+    for (name in func_us) {
+      printf "F\t%s\t%.1f\t%d\n", name, func_us[name] / 1000, func_forks[name]
+    }
+  }
+' >"$out"
+
+if [[ "$folded" == "1" ]]; then
+  LC_ALL=C sort "$out"
+  exit 0
+fi
+
+# rows TAG SORT_KEY — the table rows tagged TAG, slowest first, at most $top.
+rows() {
+  awk -F '\t' -v tag="$1" '$1 == tag' "$out" | sort -t $'\t' -k"$2,$2"gr -k2,2 | sed -n "1,${top}p"
+}
+
+IFS=$'\t' read -r _ total_ms events forks < <(rows T 2)
+printf 'total %s ms over %s traced commands, ~%s forks\n\n' "$total_ms" "$events" "$forks"
+
+line_format="%-32s %-24s %10s %7s %6s\n"
+# shellcheck disable=SC2059  # shared column layout
+printf "$line_format" line function ms hits forks
+while IFS=$'\t' read -r _ loc fn ms hits nforks; do
+  # shellcheck disable=SC2059
+  printf "$line_format" "$loc" "$fn" "$ms" "$hits" "$nforks"
+done < <(rows L 4)
+
+echo
+func_format="%-32s %14s %6s\n"
+# shellcheck disable=SC2059
+printf "$func_format" function cumulative_ms forks
+while IFS=$'\t' read -r _ fn ms nforks; do
+  # shellcheck disable=SC2059
+  printf "$func_format" "$fn" "$ms" "$nforks"
+done < <(rows F 3)
@@ -14,7 +14,12 @@ set -euo pipefail
 : "${DEFAULT_BRANCH:?DEFAULT_BRANCH must be set}"
 GITHUB_OUTPUT="${GITHUB_OUTPUT:-/dev/null}"
 
-EXISTING_BRANCH=$(gh pr list --label "security-scan" --state open \
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+# shellcheck source=lib/gh-api.bash disable=SC1091
+source "$SCRIPT_DIR/lib/gh-api.bash"
+trap gh_api_summary EXIT
+
+EXISTING_BRANCH=$(gh_api_run gh pr list --label "security-scan" --state open \
   --json headRefName --jq '.[0].headRefName // empty')
 
 if [[ -n "$EXISTING_BRANCH" ]]; then
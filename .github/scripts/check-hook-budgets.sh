@@ -0,0 +1,95 @@
+#!/usr/bin/env bash
+# Compare hook-lifecycle phase timings against budgets and a stored baseline.
+#
+# Each phase in BUDGETS_FILE may set:
+#   budget_seconds  absolute ceiling; exceeding it is an "over_budget" finding
+#   over_budget     "fail" or "warn" (default fail)
+#   regression      "fail" or "warn" (default warn) for a phase that took more
+#                   than regression.ratio × its baseline AND at least
+#                   regression.min_delta_seconds longer, so noise on
+#                   short phases doesn't trip it
+# Phases without an entry are reported but never gated.
+#
+# Inputs (env):
+#   TIMINGS_FILE         TSV of "phase<TAB>milliseconds", in run order (required)
+#   BUDGETS_FILE         Budget config (default: .github/hook-lifecycle-budgets.json;
+#                        if absent, timings are reported without gating)
+#   BASELINE_FILE        Previous RESULTS_FILE to compare against (optional;
+#                        missing or unreadable means no regression check)
+#   RESULTS_FILE         Where to write this run's timings as JSON (optional)
+#   GITHUB_STEP_SUMMARY  Markdown table is appended here when set
+#
+# Exit status: 1 if any finding is configured to fail, else 0.
+
+set -euo pipefail
+
+: "${TIMINGS_FILE:?TIMINGS_FILE must be set}"
+BUDGETS_FILE="${BUDGETS_FILE:-.github/hook-lifecycle-budgets.json}"
+BASELINE_FILE="${BASELINE_FILE:-}"
+RESULTS_FILE="${RESULTS_FILE:-}"
+
+budgets='{}'
+if [[ -f "$BUDGETS_FILE" ]]; then
+  budgets=$(jq -c . "$BUDGETS_FILE")
+fi
+
+baseline='{}'
+if [[ -n "$BASELINE_FILE" && -s "$BASELINE_FILE" ]]; then
+  baseline=$(jq -c '.phases // {}' "$BASELINE_FILE" 2>/dev/null) || {
+    echo "::warning::Ignoring unreadable hook timing baseline $BASELINE_FILE"
+    baseline='{}'
+  }
+fi
+
+# One row per phase: phase, seconds, budget, baseline, level, finding.
+rows=$(jq -r -n \
+  --rawfile timings "$TIMINGS_FILE" \
+  --argjson cfg "$budgets" \
+  --argjson baseline "$baseline" '
+  def secs: . / 1000 * 10 | round / 10;
+  ($cfg.regression.ratio // 1.5) as $ratio
+  | ($cfg.regression.min_delta_seconds // 10) as $min_delta
+  | $timings | split("\n")[] | select(length > 0) | split("\t")
+  | .[0] as $phase | (.[1] | tonumber) as $ms
+  | ($cfg.phases[$phase] // null) as $p
+  | ($baseline[$phase] // null) as $base
+  | (if $p and $p.budget_seconds and ($ms / 1000) > $p.budget_seconds then
+       [($p.over_budget // "fail"), "over budget"]
+     elif $p and $base and $ms > $base * $ratio and ($ms - $base) / 1000 >= $min_delta then
+       [($p.regression // "warn"), "regressed \(($ms / $base * 100 | round) - 100)% vs baseline"]
+     else ["ok", ""] end) as [$level, $finding]
+  | [$phase, ($ms | secs), ($p.budget_seconds // "-"),
+     (if $base then $base | secs else "-" end), $level, $finding]
+  | @tsv
+')
+
+status=0
+summary="| Phase | Seconds | Budget | Baseline | Status |"$'\n'"| --- | --- | --- | --- | --- |"$'\n'
+while IFS=$'\t' read -r phase seconds budget base level finding; do
+  [[ -n "$phase" ]] || continue
+  context=""
+  [[ "$budget" == "-" ]] || context+="budget ${budget}s"
+  [[ "$base" == "-" ]] || context+="${context:+, }baseline ${base}s"
+  line="Hook phase $phase took ${seconds}s${finding:+: $finding}${context:+ ($context)}"
+  case "$level" in
+  fail)
+    echo "::error::$line"
+    status=1
+    ;;
+  warn) echo "::warning::$line" ;;
+  *) echo "$line" ;;
+  esac
+  summary+="| $phase | $seconds | $budget | $base | ${finding:-ok}${finding:+ ($level)} |"$'\n'
+done <<<"$rows"
+
+if [[ -n "${GITHUB_STEP_SUMMARY:-}" ]]; then
+  printf '## Hook lifecycle timings\n\n%s\n' "$summary" >>"$GITHUB_STEP_SUMMARY"
+fi
+
+if [[ -n "$RESULTS_FILE" ]]; then
+  jq -R -s '{phases: (split("\n") | map(select(length > 0) | split("\t")
+    | {key: .[0], value: (.[1] | tonumber)}) | from_entries)}' \
+    "$TIMINGS_FILE" >"$RESULTS_FILE"
+fi
+
+exit "$status"
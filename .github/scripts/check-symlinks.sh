@@ -1,21 +1,76 @@
 #!/usr/bin/env bash
 # Reject tracked symlinks whose target is an absolute path (e.g.,
 # `/Users/foo/...`) — they silently break on every machine but the author's.
+#
+# Symlink entries (mode 120000) are picked out of one NUL-separated index
+# listing and all their targets are read through a single `git cat-file
+# --batch`, so cost is one pass over the index plus one process per run.
+#
+# Inputs:
+#   --base REF / SYMLINK_BASE_REF   Only check symlinks added or changed in the
+#                                   index relative to REF. Falls back to a full
+#                                   scan (with a notice) if REF doesn't resolve,
+#                                   e.g. in a shallow clone.
 
 set -euo pipefail
 
-violations=""
-while IFS= read -r line; do
-  [[ -z "$line" ]] && continue
-  mode=$(printf '%s' "$line" | awk '{print $1}')
-  hash=$(printf '%s' "$line" | awk '{print $2}')
-  path=$(printf '%s' "$line" | cut -f2-)
-  [[ "$mode" = "120000" ]] || continue
-  target=$(git cat-file blob "$hash")
-  case "$target" in
-  /*) violations="${violations}${path} -> ${target}"$'\n' ;;
+base="${SYMLINK_BASE_REF:-}"
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+  --base)
+    base="${2:?--base requires a ref}"
+    shift 2
+    ;;
+  *)
+    echo "usage: check-symlinks.sh [--base REF]" >&2
+    exit 2
+    ;;
   esac
-done < <(git ls-files -s)
+done
+
+if [[ -n "$base" ]] && ! git rev-parse --verify --quiet "$base^{tree}" >/dev/null; then
+  echo "::notice::check-symlinks: base '$base' not found; checking every symlink"
+  base=""
+fi
+
+# Byte semantics for `read -N` below (object sizes are in bytes).
+export LC_ALL=C
+
+oids=()
+paths=()
+if [[ -n "$base" ]]; then
+  # Raw diff records: ":oldmode newmode oldoid newoid status" NUL path NUL.
+  # Plumbing never detects renames, so each record carries exactly one path.
+  while IFS= read -r -d '' meta && IFS= read -r -d '' path; do
+    read -r _ mode _ oid _ <<<"$meta"
+    [[ "$mode" = "120000" ]] || continue
+    oids+=("$oid")
+    paths+=("$path")
+  done < <(git diff-index --cached -z --diff-filter=AMT "$base")
+else
+  # Index records: "mode oid stage<TAB>path" NUL.
+  while IFS= read -r -d '' entry; do
+    [[ "$entry" = 120000\ * ]] || continue
+    read -r _ oid _ <<<"${entry%%$'\t'*}"
+    oids+=("$oid")
+    paths+=("${entry#*$'\t'}")
+  done < <(git ls-files -s -z)
+fi
+
+violations=""
+if [[ ${#oids[@]} -gt 0 ]]; then
+  # Each answer is "oid type size" LF, SIZE bytes of content, LF.
+  i=0
+  while IFS=' ' read -r _ _ size; do
+    target=""
+    [[ "$size" -gt 0 ]] && IFS= read -r -N "$size" target
+    IFS= read -r _ || true
+    case "$target" in
+    /*) violations="${violations}${paths[i]} -> ${target}"$'\n' ;;
+    esac
+    i=$((i + 1))
+  done < <(printf '%s\n' "${oids[@]}" | git cat-file --batch)
+fi
 
 if [[ -n "$violations" ]]; then
   echo "::error::Tracked symlinks resolve to absolute paths (not portable across machines):"
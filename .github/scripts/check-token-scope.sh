@@ -10,9 +10,14 @@ set -euo pipefail
 
 : "${TOKEN:?TOKEN must be set}"
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+# shellcheck source=lib/gh-api.bash disable=SC1091
+source "$SCRIPT_DIR/lib/gh-api.bash"
+trap gh_api_summary EXIT
+
 # Capture stderr so a network error gets surfaced instead of silently producing
 # an empty $HEADERS (which would misclassify a classic PAT as fine-grained).
-if ! HEADERS=$(curl --proto '=https' -sSf -I -H "Authorization: token $TOKEN" \
+if ! HEADERS=$(gh_api_run curl --proto '=https' -sSf -I -H "Authorization: token $TOKEN" \
   https://api.github.com/user 2>&1); then
   echo "::error::Could not query GitHub to validate TEMPLATE_SYNC_TOKEN scopes:" >&2
   echo "$HEADERS" >&2
@@ -1,16 +1,28 @@
 #!/usr/bin/env bash
 # Collect open security alerts (Dependabot, code scanning, secret scanning,
-# pnpm audit, Socket.dev) into a single Markdown report. Writes the report to
-# $REPORT_PATH and exports SECURITY_REPORT (first 50KB) to $GITHUB_ENV.
+# pnpm audit, Socket.dev) into a single Markdown report plus a normalized JSON
+# alert set, diff that set against the previous run's snapshot, and export only
+# the new and changed alerts (most severe first, within a byte budget) to
+# $GITHUB_ENV as SECURITY_REPORT.
 #
 # Inputs (env):
-#   GH_TOKEN       GitHub token (Dependabot/secret APIs require security_events scope)
-#   REPO           owner/repo
-#   GITHUB_ENV     Path to GitHub Actions env file (optional outside CI)
-#   REPORT_PATH    Output report file (default: /tmp/security-report.md)
+#   GH_TOKEN              GitHub token (Dependabot/secret APIs require security_events scope)
+#   REPO                  owner/repo
+#   GITHUB_ENV            Path to GitHub Actions env file (optional outside CI)
+#   REPORT_PATH           Output report file (default: /tmp/security-report.md)
+#   ALERTS_PATH           Normalized alert snapshot written by this run
+#                         (default: /tmp/security-alerts.json)
+#   PREVIOUS_ALERTS_PATH  Snapshot from the previous run (optional; may equal
+#                         ALERTS_PATH). Missing or unreadable = every alert is new.
+#   REPORT_BYTE_BUDGET    Max bytes exported as SECURITY_REPORT (default: 50000)
+#
+# Snapshot format: {"version": 1, "failed_sources": [...], "alerts": [...]},
+# where each alert is {source, id, severity, package, location, title, url}.
+# An alert is "changed" when its severity, package, or location differs from
+# the previous snapshot; title/url edits alone don't resurface it.
 
-# --jq arguments are literal jq expressions; $-tokens in jq strings (e.g.
-# `\(.number)`) are intentional and shouldn't be shell-expanded.
+# jq programs are literal single-quoted strings; $-tokens inside them (e.g.
+# `\(.number)`, `$repo`) are intentional and shouldn't be shell-expanded.
 # shellcheck disable=SC2016
 
 set -uo pipefail
@@ -19,89 +31,272 @@ set -uo pipefail
 : "${REPO:?REPO must be set (owner/repo)}"
 GITHUB_ENV="${GITHUB_ENV:-/dev/null}"
 REPORT_PATH="${REPORT_PATH:-/tmp/security-report.md}"
+ALERTS_PATH="${ALERTS_PATH:-/tmp/security-alerts.json}"
+PREVIOUS_ALERTS_PATH="${PREVIOUS_ALERTS_PATH:-}"
+REPORT_BYTE_BUDGET="${REPORT_BYTE_BUDGET:-50000}"
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+# shellcheck source=lib/gh-api.bash disable=SC1091
+source "$SCRIPT_DIR/lib/gh-api.bash"
+
+work=$(mktemp -d)
+trap 'rm -rf "$work"; gh_api_summary' EXIT
+: >"$work/failed"
+
+# Read the previous snapshot up front: ALERTS_PATH may point at the same file
+# (the workflow restores and saves one cache path), and it's overwritten below.
+echo '{"alerts": [], "failed_sources": []}' >"$work/previous.json"
+has_previous=false
+if [[ -n "$PREVIOUS_ALERTS_PATH" ]] && [[ -s "$PREVIOUS_ALERTS_PATH" ]]; then
+  if jq -e '.alerts | type == "array"' "$PREVIOUS_ALERTS_PATH" >/dev/null 2>&1; then
+    cp "$PREVIOUS_ALERTS_PATH" "$work/previous.json"
+    has_previous=true
+  else
+    echo "::warning::Ignoring unreadable previous alert snapshot at $PREVIOUS_ALERTS_PATH; every alert will be reported as new."
+  fi
+fi
+
+# Shared jq helpers: severity ranking and the one-line Markdown rendering used
+# by both the full report and the delta payload.
+JQ_DEFS='
+def rank: {"critical": 0, "high": 1, "medium": 2, "low": 3}[.severity] // 4;
+def link: if .url then "[\(.title)](\(.url))" else .title end;
+def detail: (if .package then " in `\(.package)`" else "" end)
+  + (if .location then " at `\(.location)`" else "" end);
+def line: "- **\(.severity | ascii_upcase)**: \(link)\(detail)";
+'
+
+# Per-source alert endpoints and the jq expression that maps one raw alert
+# onto the snapshot schema.
+declare -A ALERT_ENDPOINT ALERT_NORMALIZE
+
+# fetch_alerts SOURCE
+# Fetch every page of SOURCE's endpoint and map each alert through its
+# normalizer into $work/SOURCE.json (a JSON array). One request per page: the
+# same payload feeds both the Markdown report and the snapshot. On failure,
+# records SOURCE in $work/failed and leaves an empty array so the rest of the
+# report still renders. Runs as a gh_api_map job, so it only writes files.
+fetch_alerts() {
+  local source="$1"
+  if gh_api --paginate "${ALERT_ENDPOINT[$source]}" >"$work/$source.raw" 2>"$work/$source.err" &&
+    jq -s --arg repo "$REPO" --arg source "$source" \
+      "add // [] | map(${ALERT_NORMALIZE[$source]})" "$work/$source.raw" >"$work/$source.json" 2>>"$work/$source.err"; then
+    return 0
+  fi
+  echo "$source" >>"$work/failed"
+  echo '[]' >"$work/$source.json"
+  return 1
+}
 
-# Append a section heading + `gh api` result to the report. Passes $REPO into
-# jq via `--arg repo` (not string interpolation) to keep jq parsing safe even
-# if the repo name later contains special characters.
-gh_api_section() {
-  local heading="$1" endpoint="$2" jq_expr="$3" fallback="$4"
+# render_section HEADING SOURCE FALLBACK
+# Append SOURCE's alerts to the report under HEADING, or FALLBACK if the fetch
+# failed. Built in a scratch file, since the section's leading blank line
+# depends on whether the report is still empty.
+render_section() {
+  local heading="$1" source="$2" fallback="$3" section="$work/section.md"
   {
-    echo ""
+    [[ -s "$REPORT_PATH" ]] && echo ""
     echo "$heading"
-  } >>"$REPORT_PATH"
-  gh api "$endpoint" --arg repo "$REPO" --jq "$jq_expr" \
-    >>"$REPORT_PATH" 2>&1 || echo "$fallback" >>"$REPORT_PATH"
+    if grep -qx "$source" "$work/failed"; then
+      echo "$fallback"
+    else
+      jq -r "$JQ_DEFS"' if length == 0 then "_No open alerts._" else sort_by(rank, .id)[] | line end' "$work/$source.json"
+    fi
+  } >"$section"
+  cat "$section" >>"$REPORT_PATH"
 }
 
-echo "## Dependabot Alerts" >"$REPORT_PATH"
-gh api "repos/${REPO}/dependabot/alerts?state=open&per_page=100" \
-  --arg repo "$REPO" \
-  --jq '.[] | "- **\(.security_advisory.severity | ascii_upcase)**: [\(.security_advisory.summary)](https://github.com/\($repo)/security/dependabot/\(.number)) in `\(.dependency.package.name)` (\(.dependency.package.ecosystem))"' \
-  >>"$REPORT_PATH" 2>&1 || echo "_Could not fetch Dependabot alerts (check repo permissions)._" >>"$REPORT_PATH"
+ALERT_ENDPOINT[dependabot]="repos/${REPO}/dependabot/alerts?state=open&per_page=100"
+ALERT_NORMALIZE[dependabot]='{
+  source: $source,
+  id: (.number | tostring),
+  severity: (.security_advisory.severity // "unknown" | ascii_downcase),
+  package: .dependency.package.name,
+  location: .dependency.manifest_path,
+  title: .security_advisory.summary,
+  url: "https://github.com/\($repo)/security/dependabot/\(.number)"
+}'
 
-gh_api_section \
-  "## Code Scanning Alerts" \
-  "repos/${REPO}/code-scanning/alerts?state=open&per_page=100" \
-  '.[] | "- **\(.rule.severity // .rule.security_severity_level | ascii_upcase)**: [\(.rule.description)](https://github.com/\($repo)/security/code-scanning/\(.number)) at `\(.most_recent_instance.location.path):\(.most_recent_instance.location.start_line)`"' \
-  "_No code scanning alerts or code scanning not enabled._"
+# Code scanning reports a CVSS-style security_severity_level for security
+# rules and only a generic error/warning/note level otherwise; fold the latter
+# onto the same scale so the two sort together.
+ALERT_ENDPOINT["code-scanning"]="repos/${REPO}/code-scanning/alerts?state=open&per_page=100"
+ALERT_NORMALIZE["code-scanning"]='{
+  source: $source,
+  id: (.number | tostring),
+  severity: ((.rule.security_severity_level // .rule.severity // "unknown") | ascii_downcase
+    | ({"error": "high", "warning": "medium", "note": "low", "none": "low"}[.] // .)),
+  package: null,
+  location: "\(.most_recent_instance.location.path):\(.most_recent_instance.location.start_line)",
+  title: (.rule.description // .rule.id),
+  url: "https://github.com/\($repo)/security/code-scanning/\(.number)"
+}'
 
-gh_api_section \
-  "## Secret Scanning Alerts" \
-  "repos/${REPO}/secret-scanning/alerts?state=open&per_page=100" \
-  '.[] | "- **\(.state | ascii_upcase)**: \(.secret_type_display_name) — [Alert #\(.number)](https://github.com/\($repo)/security/secret-scanning/\(.number))"' \
-  "_No secret scanning alerts or secret scanning not enabled._"
+# Secret scanning alerts carry no severity; an exposed credential is directly
+# exploitable, so rank it with the most severe findings.
+ALERT_ENDPOINT["secret-scanning"]="repos/${REPO}/secret-scanning/alerts?state=open&per_page=100"
+ALERT_NORMALIZE["secret-scanning"]='{
+  source: $source,
+  id: (.number | tostring),
+  severity: "critical",
+  package: (.secret_type_display_name // .secret_type),
+  location: null,
+  title: "\(.secret_type_display_name // .secret_type) exposed",
+  url: "https://github.com/\($repo)/security/secret-scanning/\(.number)"
+}'
+
+# Failures are recorded per source in $work/failed; the report covers the rest.
+gh_api_map fetch_alerts dependabot code-scanning secret-scanning || true
 
-{
-  echo ""
-  echo "## pnpm audit"
-} >>"$REPORT_PATH"
 # Skip when there's no Node project — setup-base-env leaves pnpm uninstalled
 # in that case, and `pnpm audit` would error out instead of returning "clean".
+pnpm_note=""
+echo '[]' >"$work/pnpm-audit.json"
 if [[ -f package.json ]]; then
-  pnpm audit 2>&1 | head -100 >>"$REPORT_PATH"
-  pnpm_rc=${PIPESTATUS[0]}
+  pnpm audit --json >"$work/pnpm-audit.raw" 2>"$work/pnpm-audit.err"
+  pnpm_rc=$?
   # Exit 0 = clean, exit 1 = vulnerabilities found (expected); higher = real error
-  [[ "${pnpm_rc:-0}" -le 1 ]] || echo "_pnpm audit encountered an error (exit code $pnpm_rc); output above may be incomplete._" >>"$REPORT_PATH"
+  if [[ "$pnpm_rc" -gt 1 ]] || ! jq --arg source pnpm-audit '[.advisories // {} | .[] | {
+    source: $source,
+    id: (.github_advisory_id // (.id | tostring)),
+    severity: (.severity // "unknown" | ascii_downcase),
+    package: .module_name,
+    location: (.findings[0].paths[0] // null),
+    title: .title,
+    url: .url
+  }]' "$work/pnpm-audit.raw" >"$work/pnpm-audit.json" 2>/dev/null; then
+    echo "pnpm-audit" >>"$work/failed"
+    echo '[]' >"$work/pnpm-audit.json"
+    pnpm_note="_pnpm audit encountered an error (exit code $pnpm_rc); results are incomplete._"
+  fi
 else
-  echo "_Skipped: no package.json (not a Node project)._" >>"$REPORT_PATH"
+  pnpm_note="_Skipped: no package.json (not a Node project)._"
 fi
 
-{
-  echo ""
-  echo "## Socket.dev Alerts"
-} >>"$REPORT_PATH"
-
 # Bot username is "socket-security[bot]" (as of 2025); if Socket changes
-# their bot name this will silently return no results.
-socket_found=false
-socket_tmp=$(mktemp)
-trap 'rm -f "$socket_tmp"' EXIT
-for pr_num in $(gh api "repos/${REPO}/pulls?state=open&per_page=5" --jq '.[].number' 2>/dev/null); do
-  # Fetch once into a temp file; avoids a second API call and command
-  # substitution (which strips trailing newlines and merges multi-comment output).
-  if ! gh api "repos/${REPO}/issues/${pr_num}/comments?per_page=30" \
+# their bot name this will silently return no results. Socket findings are
+# free-form bot comments, so they stay Markdown-only (not in the snapshot).
+socket_md="$work/socket.md"
+
+# fetch_socket_comments PR_NUM
+# Write PR_NUM's Socket.dev comments, under a heading, to $work/socket-PR_NUM.md
+# (empty when there are none). Runs as a gh_api_map job.
+fetch_socket_comments() {
+  local pr_num="$1" out="$work/socket-$1.md"
+  # Fetch into a temp file rather than a command substitution, which strips
+  # trailing newlines and merges multi-comment output.
+  if ! gh_api "repos/${REPO}/issues/${pr_num}/comments?per_page=30" \
     --jq '.[] | select(.user.login == "socket-security[bot]") | .body' \
-    >"$socket_tmp" 2>/dev/null; then
+    >"$out.tmp" 2>/dev/null; then
     # Tolerate a single PR's comment fetch failing (permissions/transient API
-    # error) — it must not abort the whole security report. Reset to empty so a
-    # prior iteration's content can't leak into this PR's section.
-    : >"$socket_tmp"
+    # error) — it must not abort the whole security report.
+    : >"$out.tmp"
   fi
-  if [[ -s "$socket_tmp" ]]; then
-    socket_found=true
+  : >"$out"
+  if [[ -s "$out.tmp" ]]; then
     {
       echo "### PR #${pr_num}"
-      cat "$socket_tmp"
+      cat "$out.tmp"
       echo ""
-    } >>"$REPORT_PATH"
+    } >"$out"
   fi
+}
+
+mapfile -t socket_prs < <(gh_api "repos/${REPO}/pulls?state=open&per_page=5" --jq '.[].number' 2>/dev/null)
+gh_api_map fetch_socket_comments "${socket_prs[@]}" || true
+: >"$socket_md"
+for pr_num in "${socket_prs[@]}"; do
+  cat "$work/socket-$pr_num.md" >>"$socket_md"
 done
-if [[ "$socket_found" = "false" ]]; then
-  echo "_No Socket.dev alerts found in recent open PRs._" >>"$REPORT_PATH"
+if [[ ! -s "$socket_md" ]]; then
+  echo "_No Socket.dev alerts found in recent open PRs._" >"$socket_md"
 fi
 
+#############################################
+# Full Markdown report
+#############################################
+
+: >"$REPORT_PATH"
+render_section "## Dependabot Alerts" dependabot \
+  "_Could not fetch Dependabot alerts (check repo permissions)._"
+render_section "## Code Scanning Alerts" code-scanning \
+  "_No code scanning alerts or code scanning not enabled._"
+render_section "## Secret Scanning Alerts" secret-scanning \
+  "_No secret scanning alerts or secret scanning not enabled._"
+if [[ -n "$pnpm_note" ]]; then
+  printf '\n## pnpm audit\n%s\n' "$pnpm_note" >>"$REPORT_PATH"
+else
+  render_section "## pnpm audit" pnpm-audit ""
+fi
+{
+  echo ""
+  echo "## Socket.dev Alerts"
+  cat "$socket_md"
+} >>"$REPORT_PATH"
+
 cat "$REPORT_PATH"
 
+#############################################
+# Snapshot + delta against the previous run
+#############################################
+
+# A source that failed to fetch keeps its previous alerts in the snapshot, so
+# they aren't all reported as new once it recovers.
+jq -n \
+  --slurpfile prev "$work/previous.json" \
+  --slurpfile dependabot "$work/dependabot.json" \
+  --slurpfile code_scanning "$work/code-scanning.json" \
+  --slurpfile secret_scanning "$work/secret-scanning.json" \
+  --slurpfile pnpm_audit "$work/pnpm-audit.json" \
+  --rawfile failed "$work/failed" \
+  '($failed | split("\n") | map(select(. != ""))) as $failed
+  | {
+    version: 1,
+    failed_sources: $failed,
+    alerts: ($dependabot[0] + $code_scanning[0] + $secret_scanning[0] + $pnpm_audit[0]
+      + ($prev[0].alerts | map(select(.source | IN($failed[])))))
+  }' >"$work/current.json"
+cp "$work/current.json" "$ALERTS_PATH"
+
+# Alerts from a source whose fetch failed this run are neither "resolved" nor
+# re-listed: the absence is a fetch error, not a fix. Their carried-over
+# snapshot entries are left out of the counts too.
+jq -r --slurpfile prev "$work/previous.json" \
+  --arg has_previous "$has_previous" \
+  --arg report_path "$REPORT_PATH" --arg alerts_path "$ALERTS_PATH" \
+  "$JQ_DEFS"'
+  def key: "\(.source)/\(.id)";
+  def shape: {severity, package, location};
+  .failed_sources as $failed
+  | .alerts |= map(select(.source | IN($failed[]) | not))
+  | ($prev[0].alerts | map({key: key, value: .}) | from_entries) as $old
+  | (.alerts | map(key) | map({key: ., value: true}) | from_entries) as $now
+  | ([.alerts[] | $old[key] as $o
+      | if $o == null then . + {change: "new"}
+        elif ($o | shape) != shape then . + {change: "changed, was \($o.severity)"}
+        else empty end]
+    | sort_by(rank, .source, .id)) as $delta
+  | ($prev[0].alerts | map(select(($now[key] | not) and ((.source | IN($failed[])) | not))) | length) as $resolved
+  | ([$delta[] | select(.change == "new")] | length) as $new
+  | "## Security alert delta",
+    "",
+    (if $has_previous == "true" then
+      "Compared with the previous scan: \($new) new, \($delta | length - $new) changed, \(.alerts | length - ($delta | length)) unchanged (omitted), \($resolved) resolved."
+    else
+      "No previous snapshot; all \(.alerts | length) open alerts are listed as new."
+    end),
+    "Only new and changed alerts are listed, most severe first. The full report is at `\($report_path)` and the normalized alert set at `\($alerts_path)` on the runner.",
+    (if ($failed | length) > 0 then "", "**Incomplete data** — could not fetch: \($failed | join(", ")). Alerts from these sources are missing below." else empty end),
+    "",
+    (if ($delta | length) == 0 then "_No new or changed alerts._"
+    else $delta[] | "- **\(.severity | ascii_upcase)** (\(.change), \(.source)): \(link)\(detail)" end)
+  ' "$work/current.json" >"$work/payload.md"
+{
+  echo ""
+  echo "## Socket.dev Alerts"
+  cat "$socket_md"
+} >>"$work/payload.md"
+
 # Use a random sentinel to prevent delimiter injection — report content comes
 # from external sources (advisory descriptions, bot comments) that an attacker
 # could craft to contain a static sentinel and inject arbitrary env vars.
@@ -112,13 +307,22 @@ elif command -v uuidgen >/dev/null 2>&1; then
 else
   report_sentinel="REPORT_EOF_$$_${RANDOM}_${RANDOM}"
 fi
-report_size=$(wc -c <"$REPORT_PATH" | tr -d '[:space:]')
-if [[ "$report_size" -gt 50000 ]]; then
-  echo "::warning::Security report is ${report_size} bytes; truncating to 50 KB for \$GITHUB_ENV. Full report is at $REPORT_PATH on the runner."
+payload_size=$(wc -c <"$work/payload.md" | tr -d '[:space:]')
+if [[ "$payload_size" -gt "$REPORT_BYTE_BUDGET" ]]; then
+  echo "::warning::Security alert delta is ${payload_size} bytes; keeping the most severe alerts that fit in ${REPORT_BYTE_BUDGET} bytes for \$GITHUB_ENV. Full report is at $REPORT_PATH on the runner."
 fi
+# Cut at a line boundary once the budget is reached. Lines are ordered most
+# severe first, so whatever is dropped is the least severe tail. LC_ALL=C makes
+# length() count bytes; 200 bytes are held back for the omission note.
 {
   echo "SECURITY_REPORT<<${report_sentinel}"
-  head -c 50000 "$REPORT_PATH"
-  echo ""
+  LC_ALL=C awk -v budget="$REPORT_BYTE_BUDGET" '
+    { n = length($0) + 1 }
+    stop || used + n > budget - 200 { stop = 1; dropped++; next }
+    { used += n; print }
+    END {
+      if (dropped) printf "\n_%d more line(s) omitted to fit the %d-byte budget; see the full report on the runner._\n", dropped, budget
+    }
+  ' "$work/payload.md"
   echo "${report_sentinel}"
 } >>"$GITHUB_ENV"
@@ -1,10 +1,51 @@
 #!/usr/bin/env bash
-# Run gitleaks scoped to this PR's commits (merge-base..HEAD) on pull_request,
-# or main's full history (--log-opts=HEAD) on push. Env: BASE_SHA
+# Run gitleaks scoped to this PR's commits (merge-base..HEAD) on pull_request.
+# On push, scan only the commits since the last clean scan (the watermark),
+# falling back to the full history (--log-opts=HEAD) when there is no usable
+# watermark or a full rescan is requested.
+#
+# Inputs (env):
+#   BASE_SHA                 PR base commit; when set, scan merge-base..HEAD
+#   GITLEAKS_WATERMARK_FILE  File holding the last fully scanned commit; read
+#                            before and rewritten after a clean push scan
+#                            (optional)
+#   GITLEAKS_FULL_SCAN       Set to 1 to ignore the watermark and rescan the
+#                            whole history
+#   GITLEAKS_BIN             gitleaks binary (default: ./gitleaks)
 set -eo pipefail
+
+GITLEAKS_BIN="${GITLEAKS_BIN:-./gitleaks}"
+scan() {
+  "$GITLEAKS_BIN" detect --no-banner --redact --verbose --log-opts="$1"
+}
+
 if [[ -n "$BASE_SHA" ]]; then
   MERGE_BASE=$(git merge-base HEAD "$BASE_SHA")
-  ./gitleaks detect --no-banner --redact --verbose --log-opts="${MERGE_BASE}..HEAD"
+  scan "${MERGE_BASE}..HEAD"
+  exit 0
+fi
+
+head=$(git rev-parse HEAD)
+watermark=""
+if [[ "${GITLEAKS_FULL_SCAN:-0}" != "1" && -s "${GITLEAKS_WATERMARK_FILE:-}" ]]; then
+  read -r watermark <"$GITLEAKS_WATERMARK_FILE" || true
+  # A watermark that is no longer in HEAD's history (force-push, or a cache
+  # from another branch) can't bound the scan.
+  if ! git merge-base --is-ancestor "$watermark" HEAD 2>/dev/null; then
+    echo "::notice::gitleaks watermark ${watermark:0:12} is not an ancestor of HEAD; scanning full history"
+    watermark=""
+  fi
+fi
+
+if [[ -z "$watermark" ]]; then
+  scan "HEAD"
+elif [[ "$watermark" == "$head" ]]; then
+  echo "gitleaks: HEAD ${head:0:12} already scanned; nothing to do"
 else
-  ./gitleaks detect --no-banner --redact --verbose --log-opts="HEAD"
+  echo "gitleaks: scanning $(git rev-list --count "${watermark}..HEAD") commit(s) since ${watermark:0:12}"
+  scan "${watermark}..HEAD"
+fi
+
+if [[ -n "${GITLEAKS_WATERMARK_FILE:-}" ]]; then
+  printf '%s\n' "$head" >"$GITLEAKS_WATERMARK_FILE"
 fi
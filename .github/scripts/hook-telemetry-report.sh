@@ -0,0 +1,40 @@
+#!/usr/bin/env bash
+# Summarize hook timing telemetry (see .hooks/telemetry.bash): one row per
+# hook and phase with run count, failures, and wall-time percentiles, slowest
+# p90 first.
+#
+# Usage: hook-telemetry-report.sh [LOG]
+#   LOG defaults to $HOOK_TELEMETRY_FILE, then $GIT_DIR/hook-telemetry.jsonl.
+#   Truncated or malformed lines are skipped.
+
+set -euo pipefail
+
+log="${1:-${HOOK_TELEMETRY_FILE:-$(git rev-parse --git-path hook-telemetry.jsonl 2>/dev/null || true)}}"
+if [[ -z "$log" || ! -s "$log" ]]; then
+  echo "No hook telemetry recorded${log:+ in $log}. Enable it with HOOK_TELEMETRY=1." >&2
+  exit 1
+fi
+
+# Nearest-rank percentiles over each group's sorted wall times.
+rows=$(jq -R -s -r '
+  def pct($p): .[(($p / 100 * length) | ceil) - 1];
+  split("\n")
+  | map(fromjson? // empty | select(.hook? and (.wall_ms | type) == "number"))
+  | group_by([.hook, .phase])
+  | map((map(.wall_ms) | sort) as $ms
+      | {hook: .[0].hook, phase: (.[0].phase // ""), runs: length,
+         failed: map(select(.exit != 0)) | length,
+         p50: ($ms | pct(50)), p90: ($ms | pct(90)), p99: ($ms | pct(99)),
+         max: $ms[-1]})
+  | sort_by(-.p90, .hook)[]
+  | [.hook, .phase, .runs, .failed, .p50, .p90, .p99, .max] | @tsv
+' "$log")
+
+format="%-24s %-12s %6s %6s %8s %8s %8s %8s\n"
+# shellcheck disable=SC2059  # shared column layout
+printf "$format" hook phase runs failed p50_ms p90_ms p99_ms max_ms
+while IFS=$'\t' read -r hook phase runs failed p50 p90 p99 max; do
+  [[ -n "$hook" ]] || continue
+  # shellcheck disable=SC2059
+  printf "$format" "$hook" "$phase" "$runs" "$failed" "$p50" "$p90" "$p99" "$max"
+done <<<"$rows"
@@ -0,0 +1,373 @@
+# shellcheck shell=bash
+# gh-api.bash — shared, rate-limit-aware GitHub API client for .github/scripts.
+# Contract: sourced into strict-mode (set -euo pipefail) callers; do not re-set shell options.
+#
+# Every request is appended to a TSV ledger shared by all scripts in a job, so
+# the request budget, the quota seen in x-ratelimit-remaining, and the
+# per-script summary survive subshells, background jobs, and step boundaries.
+#
+# Tunables (env):
+#   GH_API_BUDGET           Max requests per run across every script sharing
+#                           the ledger (default: 0 = unlimited)
+#   GH_API_STATS_FILE       Ledger path (default: $RUNNER_TEMP/gh-api-stats.tsv;
+#                           a private temp file, removed by gh_api_summary, outside CI)
+#   GH_API_MAX_ATTEMPTS     Attempts per request on rate limits, 5xx, and
+#                           network errors (default: 4)
+#   GH_API_BACKOFF          Initial backoff ceiling in seconds for 5xx/network
+#                           errors; retry_run doubles it per attempt and
+#                           applies full jitter (default: 2)
+#   GH_API_SECONDARY_WAIT   Wait after a secondary rate limit that carries no
+#                           Retry-After, doubled per attempt (default: 60)
+#   GH_API_MAX_WAIT         Longest single wait in seconds; a rate limit that
+#                           needs longer fails instead (default: 300)
+#   GH_API_RESERVE          Quota floor: at or below this many remaining
+#                           requests, wait for the reset first (default: 50)
+#   GH_API_MAX_CONCURRENCY  Upper bound on parallel requests in gh_api_map (default: 4)
+#
+# Ledger columns: start (µs since epoch), script, endpoint, status (HTTP code
+# or exit:N), duration_ms, x-ratelimit-remaining, x-ratelimit-reset, outcome
+# (ok | ratelimited | retry | error).
+
+# shellcheck source=retry.bash disable=SC1091
+source "${BASH_SOURCE[0]%/*}/retry.bash"
+
+_GH_API_SCRIPT="${0##*/}"
+_GH_API_OWN_LEDGER=false
+
+# _gh_api_init — settle the ledger path and create the file. Runs once, when
+# this file is sourced, so command substitutions and background jobs all
+# inherit the same path. Callers source this after their required-env guards
+# and register gh_api_summary as an EXIT trap, which removes a private ledger.
+_gh_api_init() {
+  if [[ -z "${GH_API_STATS_FILE:-}" ]]; then
+    if [[ -n "${RUNNER_TEMP:-}" ]]; then
+      GH_API_STATS_FILE="$RUNNER_TEMP/gh-api-stats.tsv"
+    else
+      GH_API_STATS_FILE=$(mktemp "${TMPDIR:-/tmp}/gh-api-stats.XXXXXX")
+      _GH_API_OWN_LEDGER=true
+    fi
+    # Exported so child processes append to the same ledger.
+    export GH_API_STATS_FILE
+  fi
+  : >>"$GH_API_STATS_FILE"
+}
+
+# _gh_api_record START_US ENDPOINT STATUS REMAINING RESET OUTCOME
+_gh_api_record() {
+  local start="$1" now="${EPOCHREALTIME/[.,]/}"
+  printf '%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\n' "$start" "$_GH_API_SCRIPT" "$2" "$3" \
+    "$(((now - start) / 1000))" "$4" "$5" "$6" >>"$GH_API_STATS_FILE"
+}
+
+# _gh_api_quota — print "REMAINING RESET RATELIMITED" from the ledger: the most
+# recently reported quota (empty fields if none yet) and whether any request in
+# this run has been rate limited.
+_gh_api_quota() {
+  awk -F'\t' '
+    $6 != "" { remaining = $6; reset = $7 }
+    $8 == "ratelimited" { limited = 1 }
+    END { printf "%s %s %d\n", (remaining == "" ? "-" : remaining), (reset == "" ? "-" : reset), limited }
+  ' "$GH_API_STATS_FILE"
+}
+
+# _gh_api_admit — enforce GH_API_BUDGET and the quota reserve before a request.
+# Returns 1 (with an ::error::) once the budget is spent.
+_gh_api_admit() {
+  local budget="${GH_API_BUDGET:-0}" used remaining reset _limited delay
+  if [[ "$budget" -gt 0 ]]; then
+    used=$(wc -l <"$GH_API_STATS_FILE")
+    if [[ "$used" -ge "$budget" ]]; then
+      echo "::error::GitHub API budget of $budget requests exhausted ($_GH_API_SCRIPT); raise GH_API_BUDGET if this run legitimately needs more." >&2
+      return 1
+    fi
+  fi
+  read -r remaining reset _limited < <(_gh_api_quota)
+  if [[ "$remaining" != "-" && "$reset" != "-" && "$remaining" -le "${GH_API_RESERVE:-50}" ]]; then
+    delay=$((reset - ${EPOCHREALTIME%[.,]*} + 1))
+    if [[ "$delay" -gt 0 && "$delay" -le "${GH_API_MAX_WAIT:-300}" ]]; then
+      echo "GitHub API quota low ($remaining remaining); waiting ${delay}s for the reset..." >&2
+      sleep "$delay"
+    fi
+  fi
+  return 0
+}
+
+# _gh_api_parse RAW BODY — split `gh api --include` output in RAW into headers
+# and BODY. Sets _gh_status, _gh_remaining, _gh_reset, _gh_retry_after, _gh_next.
+_gh_api_parse() {
+  local line name value next_re='<([^>]*)>; *rel="next"'
+  _gh_status="" _gh_remaining="" _gh_reset="" _gh_retry_after="" _gh_next=""
+  {
+    IFS= read -r line || line=""
+    line="${line%$'\r'}"
+    if [[ "$line" =~ ^HTTP/[0-9.]+\ ([0-9]{3}) ]]; then
+      _gh_status="${BASH_REMATCH[1]}"
+      while IFS= read -r line; do
+        line="${line%$'\r'}"
+        [[ -z "$line" ]] && break
+        name="${line%%:*}"
+        value="${line#*:}"
+        value="${value# }"
+        case "${name,,}" in
+        x-ratelimit-remaining) _gh_remaining="$value" ;;
+        x-ratelimit-reset) _gh_reset="$value" ;;
+        retry-after) _gh_retry_after="$value" ;;
+        link) [[ "$value" =~ $next_re ]] && _gh_next="${BASH_REMATCH[1]}" ;;
+        esac
+      done
+    else
+      # No status line: gh failed before getting a response (network error).
+      printf '%s\n' "$line"
+    fi
+    cat
+  } <"$1" >"$2"
+}
+
+# _gh_api_hint OUTCOME — after a retryable failure, write the server-mandated
+# wait (Retry-After, the primary-limit reset, or GH_API_SECONDARY_WAIT doubled
+# per attempt for a secondary limit) to $RETRY_HINT_FILE for retry_run; 5xx and
+# network errors leave it empty so retry_run's jittered backoff applies.
+# Returns 1 when the wait would exceed GH_API_MAX_WAIT.
+_gh_api_hint() {
+  local delay
+  [[ "$1" == "ratelimited" ]] || return 0
+  if [[ -n "$_gh_retry_after" ]]; then
+    delay="$_gh_retry_after"
+  elif [[ "$_gh_remaining" == "0" && -n "$_gh_reset" ]]; then
+    delay=$((_gh_reset - ${EPOCHREALTIME%[.,]*} + 1))
+  else
+    delay=$((${GH_API_SECONDARY_WAIT:-60} << (_gh_attempt - 1)))
+  fi
+  [[ "$delay" -lt 0 ]] && delay=0
+  [[ "$delay" -le "${GH_API_MAX_WAIT:-300}" ]] || return 1
+  echo "$delay" >"$RETRY_HINT_FILE"
+}
+
+# _gh_api_retry OUTCOME LABEL — finish a failed attempt: return 75
+# (EX_TEMPFAIL, retry_run's retryable code) with a one-line note, or 1 with the
+# command's stderr ($_gh_tmp/err) when the failure is permanent.
+_gh_api_retry() {
+  if [[ "$1" != "error" ]] && _gh_api_hint "$1"; then
+    printf '%s: %s (%s), attempt %d/%d\n' "$2" \
+      "$([[ "$1" == "ratelimited" ]] && echo "rate limited" || echo "transient failure")" \
+      "$([[ -n "$_gh_status" ]] && echo "HTTP $_gh_status" || echo "no HTTP status")" \
+      "$_gh_attempt" "${GH_API_MAX_ATTEMPTS:-4}" >&2
+    return 75
+  fi
+  cat "$_gh_tmp/err" >&2
+  return 1
+}
+
+# _gh_api_attempt URL [GH_API_ARGS...] — one `gh api` request (a retry_run
+# command). Leaves the body in $_gh_tmp/body and the headers in the _gh_* vars.
+_gh_api_attempt() {
+  local url="$1" rc start outcome
+  shift
+  _gh_attempt=$((_gh_attempt + 1))
+  _gh_api_admit || return 1
+  start="${EPOCHREALTIME/[.,]/}"
+  if gh api --include "$url" "$@" >"$_gh_tmp/raw" 2>"$_gh_tmp/err"; then rc=0; else rc=$?; fi
+  _gh_api_parse "$_gh_tmp/raw" "$_gh_tmp/body"
+
+  if [[ "$rc" -eq 0 ]]; then
+    outcome=ok
+  elif [[ "$_gh_status" == "429" ]] ||
+    { [[ "$_gh_status" == "403" ]] &&
+      { [[ -n "$_gh_retry_after" || "$_gh_remaining" == "0" ]] ||
+        grep -qi 'secondary rate limit' "$_gh_tmp/body" "$_gh_tmp/err"; }; }; then
+    outcome=ratelimited
+  elif [[ -z "$_gh_status" || "$_gh_status" == 5* ]]; then
+    outcome=retry
+  else
+    outcome=error
+  fi
+  _gh_api_record "$start" "${url%%\?*}" "${_gh_status:-exit:$rc}" \
+    "$_gh_remaining" "$_gh_reset" "$outcome"
+  [[ "$outcome" == "ok" ]] && return 0
+  _gh_api_retry "$outcome" "gh api ${url%%\?*}"
+}
+
+# _gh_api_retry_policy COMMAND... — run an attempt function under retry_run
+# with the GH_API_* policy. Attempt functions exit 75 for retryable failures.
+_gh_api_retry_policy() {
+  retry_run --quiet --max-attempts "${GH_API_MAX_ATTEMPTS:-4}" \
+    --base "${GH_API_BACKOFF:-2}" --cap "${GH_API_MAX_WAIT:-300}" \
+    --retry-on-exit 75 -- "$@"
+}
+
+# gh_api ENDPOINT [--paginate] [--jq EXPR] [GH_API_ARGS...]
+# Drop-in for `gh api` that counts every request in the ledger, follows
+# Link rel="next" itself (so each page is budgeted and quota-checked), and
+# retries 429s and secondary rate limits (honoring Retry-After and
+# x-ratelimit-reset), 5xx responses, and network errors up to
+# GH_API_MAX_ATTEMPTS via retry_run. Other 4xx responses fail immediately.
+# --paginate and --jq may appear anywhere; EXPR is applied to each page, like
+# `gh api --paginate --jq`. ENDPOINT must come before any of gh's own
+# value-taking flags (-X, -f, ...), which are passed through. Returns 0 on
+# success, 1 on failure (gh's error output is forwarded to stderr).
+gh_api() {
+  local paginate=false jq_expr="" url="" _gh_tmp _gh_attempt rc
+  local -a args=()
+  while [[ $# -gt 0 ]]; do
+    case "$1" in
+    --paginate) paginate=true ;;
+    --jq)
+      jq_expr="$2"
+      shift
+      ;;
+    -*) args+=("$1") ;;
+    *)
+      if [[ -z "$url" ]]; then url="$1"; else args+=("$1"); fi
+      ;;
+    esac
+    shift
+  done
+  _gh_tmp=$(mktemp -d)
+
+  while [[ -n "$url" ]]; do
+    _gh_attempt=0
+    if _gh_api_retry_policy _gh_api_attempt "$url" "${args[@]}"; then rc=0; else rc=$?; fi
+    if [[ "$rc" -ne 0 ]]; then
+      # Out of attempts on a retryable failure: surface gh's last error.
+      [[ "$rc" -eq 75 ]] && cat "$_gh_tmp/err" >&2
+      rm -rf "$_gh_tmp"
+      return 1
+    fi
+
+    if [[ -n "$jq_expr" ]]; then
+      if ! jq -r "$jq_expr" "$_gh_tmp/body"; then
+        rm -rf "$_gh_tmp"
+        return 1
+      fi
+    else
+      cat "$_gh_tmp/body"
+    fi
+    url=""
+    [[ "$paginate" == "true" ]] && url="$_gh_next"
+  done
+  rm -rf "$_gh_tmp"
+  return 0
+}
+
+# _gh_api_run_attempt MUTATING COMMAND... — one gh_api_run attempt (a
+# retry_run command). Records COMMAND's own exit status in _gh_rc.
+_gh_api_run_attempt() {
+  local mutating="$1" start outcome
+  shift
+  _gh_attempt=$((_gh_attempt + 1))
+  _gh_api_admit || return 1
+  start="${EPOCHREALTIME/[.,]/}"
+  if "$@" 2>"$_gh_tmp/err"; then _gh_rc=0; else _gh_rc=$?; fi
+
+  _gh_status="" _gh_remaining="" _gh_reset="" _gh_retry_after=""
+  if [[ "$_gh_rc" -eq 0 ]]; then
+    outcome=ok
+  elif grep -qiE 'rate limit|HTTP 429|returned error: 429' "$_gh_tmp/err"; then
+    outcome=ratelimited
+  elif [[ "$mutating" == "false" ]] &&
+    grep -qiE 'HTTP 5[0-9]{2}|returned error: 5[0-9]{2}|timed? ?out|connection (reset|refused)|TLS handshake' "$_gh_tmp/err"; then
+    outcome=retry
+  else
+    outcome=error
+  fi
+  _gh_api_record "$start" "$1 ${2:-}" "exit:$_gh_rc" "" "" "$outcome"
+  if [[ "$outcome" == "ok" ]]; then
+    cat "$_gh_tmp/err" >&2
+    return 0
+  fi
+  _gh_api_retry "$outcome" "$1 ${2:-}"
+}
+
+# gh_api_run [--mutating] COMMAND...
+# Run a GitHub-bound COMMAND that isn't `gh api` (e.g. `gh pr list`, `curl`)
+# through the same ledger, budget, quota reserve, and retry policy. stdout
+# passes through; stderr is forwarded once the command settles. Retries when
+# stderr reports a rate limit, a 5xx, or a network error. With --mutating,
+# only rate-limit rejections are retried: GitHub guarantees those were not
+# applied, whereas a 5xx or dropped connection may have been (and a retry
+# would, say, double-post a comment). Returns COMMAND's exit status.
+gh_api_run() {
+  local mutating=false _gh_tmp _gh_attempt=0 _gh_rc=1 rc
+  if [[ "${1:-}" == "--mutating" ]]; then
+    mutating=true
+    shift
+  fi
+  _gh_tmp=$(mktemp -d)
+  if _gh_api_retry_policy _gh_api_run_attempt "$mutating" "$@"; then rc=0; else rc=$?; fi
+  [[ "$rc" -eq 75 ]] && cat "$_gh_tmp/err" >&2
+  rm -rf "$_gh_tmp"
+  [[ "$rc" -eq 0 ]] && return 0
+  return "$_gh_rc"
+}
+
+# gh_api_concurrency — echo how many requests may run in parallel right now:
+# GH_API_MAX_CONCURRENCY while quota is healthy, 2 when under 1000 remain, and
+# 1 once quota nears the reserve or anything in this run was rate limited
+# (secondary limits punish concurrency, not volume).
+gh_api_concurrency() {
+  local max="${GH_API_MAX_CONCURRENCY:-4}" remaining _reset limited
+  read -r remaining _reset limited < <(_gh_api_quota)
+  if [[ "$limited" -eq 1 ]] ||
+    { [[ "$remaining" != "-" ]] && [[ "$remaining" -le $((${GH_API_RESERVE:-50} * 4)) ]]; }; then
+    max=1
+  elif [[ "$remaining" != "-" && "$remaining" -lt 1000 && "$max" -gt 2 ]]; then
+    max=2
+  fi
+  echo "$max"
+}
+
+# gh_api_map FUNCTION ITEM...
+# Run `FUNCTION ITEM` for every ITEM as background jobs, keeping at most
+# gh_api_concurrency of them in flight (re-evaluated before each launch).
+# Returns 1 if any call failed. Reaps jobs with `wait -n`, so don't mix with
+# other background jobs in the caller.
+gh_api_map() {
+  local fn="$1" item running=0 rc=0
+  shift
+  for item in "$@"; do
+    while [[ "$running" -ge "$(gh_api_concurrency)" ]]; do
+      wait -n || rc=1
+      running=$((running - 1))
+    done
+    "$fn" "$item" &
+    running=$((running + 1))
+  done
+  while [[ "$running" -gt 0 ]]; do
+    wait -n || rc=1
+    running=$((running - 1))
+  done
+  return "$rc"
+}
+
+# gh_api_summary — report this script's requests, retries, failures, time
+# spent, and the last quota seen: one line on stderr, plus a table row in
+# $GITHUB_STEP_SUMMARY when set. Removes a private (non-CI) ledger. Meant for
+# an EXIT trap.
+gh_api_summary() {
+  local stats n retried failed secs remaining
+  stats=$(awk -F'\t' -v script="$_GH_API_SCRIPT" '
+    $2 == script {
+      n++; ms += $5
+      if ($8 == "ratelimited" || $8 == "retry") retried++
+      else if ($8 == "error") failed++
+    }
+    $6 != "" { remaining = $6 }
+    END {
+      printf "%d\t%d\t%d\t%.1f\t%s\n", n, retried, failed, ms / 1000, (remaining == "" ? "unknown" : remaining)
+    }
+  ' "$GH_API_STATS_FILE")
+  IFS=$'\t' read -r n retried failed secs remaining <<<"$stats"
+  echo "gh-api: $_GH_API_SCRIPT made $n request(s) ($retried retried, $failed failed) in ${secs}s; quota remaining: $remaining" >&2
+  if [[ -n "${GITHUB_STEP_SUMMARY:-}" && "$n" -gt 0 ]]; then
+    {
+      echo "| Script | Requests | Retried | Failed | API time (s) | Quota left |"
+      echo "| --- | ---: | ---: | ---: | ---: | ---: |"
+      echo "| \`$_GH_API_SCRIPT\` | $n | $retried | $failed | $secs | $remaining |"
+    } >>"$GITHUB_STEP_SUMMARY"
+  fi
+  if [[ "$_GH_API_OWN_LEDGER" == "true" ]]; then
+    rm -f "$GH_API_STATS_FILE"
+  fi
+}
+
+_gh_api_init
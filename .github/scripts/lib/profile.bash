@@ -0,0 +1,31 @@
+# shellcheck shell=bash
+# profile.bash — opt-in line-level tracing for the repo's bash scripts.
+# Contract: sourced into strict-mode (set -euo pipefail) callers; do not re-set
+# shell options. The one exception is xtrace, and only when BASH_PROFILE is set.
+#
+# Bash sources $BASH_ENV when any non-interactive shell starts, so any script,
+# plus every bash script it launches, can be traced without editing it:
+#
+#   BASH_PROFILE=/tmp/sync.trace BASH_ENV=.github/scripts/lib/profile.bash \
+#     bash .github/scripts/template-sync.sh
+#   .github/scripts/bash-profile-report.sh /tmp/sync.trace
+#
+# Each traced command appends one line to the trace via BASH_XTRACEFD, so the
+# script's own stderr is left alone. PS4 fields are tab-separated: the xtrace
+# depth marker, the time ($EPOCHREALTIME), $BASHPID, the PID that loaded this
+# file, the outermost script, file:line, and the function stack. The xtrace
+# text of the command comes last. Subshells inherit the loader PID, so the
+# report can tell a forked subshell from a newly started script.
+#
+# Needs bash 5 for EPOCHREALTIME. Older shells (macOS /bin/bash) run untraced.
+#
+# Inputs (env):
+#   BASH_PROFILE  Trace file to append to (unset: tracing off)
+
+if [[ -n "${BASH_PROFILE:-}" && -n "${EPOCHREALTIME:-}" ]] &&
+  { exec {_profile_fd}>>"$BASH_PROFILE"; } 2>/dev/null; then
+  BASH_XTRACEFD=$_profile_fd
+  _profile_pid=$BASHPID
+  PS4=$'+\t${EPOCHREALTIME}\t${BASHPID}\t${_profile_pid}\t${BASH_SOURCE[@]: -1}\t${BASH_SOURCE[0]##*/}:${LINENO}\t${FUNCNAME[@]}\t'
+  set -x
+fi
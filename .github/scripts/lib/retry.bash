@@ -1,5 +1,5 @@
 # shellcheck shell=bash
-# retry.bash — shared exponential-backoff retry helper.
+# retry.bash — shared exponential-backoff retry helpers.
 # Contract: sourced into strict-mode (set -euo pipefail) callers; do not re-set shell options.
 
 # retry_cmd MAX INITIAL_DELAY COMMAND...
@@ -21,3 +21,149 @@ retry_cmd() {
   done
   return 1
 }
+
+# _retry_ms SECS — echo SECS (integer or decimal, e.g. "1.5") as milliseconds.
+_retry_ms() {
+  local whole="${1%%.*}" frac=""
+  [[ "$1" == *.* ]] && frac="${1#*.}"
+  frac="${frac}000"
+  echo $((${whole:-0} * 1000 + 10#${frac:0:3}))
+}
+
+# retry_run [OPTIONS] [--] COMMAND...
+# Policy-driven retry. Runs COMMAND until it succeeds, fails permanently, runs
+# out of attempts, or the next sleep would overrun the deadline. Between
+# attempts it sleeps a "full jitter" backoff — a random delay in
+# [0, min(cap, base * 2^(attempt-1))], or exactly that bound with --jitter none
+# — so parallel jobs that failed together don't retry in lockstep. If COMMAND
+# writes a delay in seconds to "$RETRY_HINT_FILE" (e.g. from a Retry-After
+# header), that delay is used instead.
+#
+# Options:
+#   --max-attempts N           Attempt limit; 0 = until the deadline (default: 5)
+#   --deadline SECS            Budget for all attempts and sleeps; 0 = none
+#                              (default: 0). Running attempts are not killed.
+#   --base SECS                First backoff ceiling (default: 1)
+#   --cap SECS                 Largest backoff ceiling (default: 30)
+#   --jitter full|none         Backoff randomization (default: full)
+#   --retry-on-exit CODES      Comma-separated exit codes that are retryable
+#   --retry-on-stderr ERE      stderr pattern (grep -E -i) marking a failure retryable
+#   --permanent-on-stderr ERE  stderr pattern marking a failure permanent;
+#                              checked before the retryable classifiers
+#   --label TEXT               Name for messages (default: COMMAND's first two words)
+#   --quiet                    No progress or stats lines (stats vars still set)
+#
+# With neither --retry-on-exit nor --retry-on-stderr, every failure not matched
+# by --permanent-on-stderr is retryable. COMMAND's stderr is captured per
+# attempt for classification and replayed to stderr once the attempt ends.
+#
+# Sets RETRY_LAST_ATTEMPTS and RETRY_LAST_ELAPSED_MS and, unless --quiet,
+# prints "retry: LABEL ok|failed after N attempt(s) in Mms" to stderr. Returns
+# 0 on success, otherwise COMMAND's last exit status.
+retry_run() {
+  local max_attempts=5 deadline_ms=0 base_ms=1000 cap_ms=30000 jitter=full
+  local retry_exits="" retry_re="" permanent_re="" label="" quiet=false
+  while [[ $# -gt 0 ]]; do
+    case "$1" in
+    --max-attempts) max_attempts="$2" ;;
+    --deadline) deadline_ms=$(_retry_ms "$2") ;;
+    --base) base_ms=$(_retry_ms "$2") ;;
+    --cap) cap_ms=$(_retry_ms "$2") ;;
+    --jitter)
+      case "$2" in
+      full | none) jitter="$2" ;;
+      *)
+        echo "retry_run: --jitter must be 'full' or 'none', got '$2'" >&2
+        return 2
+        ;;
+      esac
+      ;;
+    --retry-on-exit) retry_exits=",$2," ;;
+    --retry-on-stderr) retry_re="$2" ;;
+    --permanent-on-stderr) permanent_re="$2" ;;
+    --label) label="$2" ;;
+    --quiet)
+      quiet=true
+      shift
+      continue
+      ;;
+    --)
+      shift
+      break
+      ;;
+    *) break ;;
+    esac
+    shift 2
+  done
+  if [[ $# -eq 0 ]]; then
+    echo "retry_run: no command given" >&2
+    return 2
+  fi
+  label="${label:-$1${2:+ $2}}"
+
+  local start_us="${EPOCHREALTIME/[.,]/}" attempt=0 rc=0 retryable elapsed_ms ceiling delay_ms hint
+  local err
+  err=$(mktemp)
+  local RETRY_HINT_FILE
+  RETRY_HINT_FILE=$(mktemp)
+  export RETRY_HINT_FILE
+
+  while :; do
+    attempt=$((attempt + 1))
+    : >"$RETRY_HINT_FILE"
+    if "$@" 2>"$err"; then rc=0; else rc=$?; fi
+    cat "$err" >&2
+    [[ "$rc" -eq 0 ]] && break
+
+    if [[ -n "$permanent_re" ]] && grep -qiE -- "$permanent_re" "$err"; then
+      retryable=false
+    elif [[ -z "$retry_exits" && -z "$retry_re" ]]; then
+      retryable=true
+    elif [[ "$retry_exits" == *",$rc,"* ]] ||
+      { [[ -n "$retry_re" ]] && grep -qiE -- "$retry_re" "$err"; }; then
+      retryable=true
+    else
+      retryable=false
+    fi
+    if [[ "$retryable" == "false" ]]; then
+      [[ "$quiet" == "true" ]] || echo "retry: $label failed permanently (exit $rc); not retrying" >&2
+      break
+    fi
+    if [[ "$max_attempts" -gt 0 && "$attempt" -ge "$max_attempts" ]]; then
+      break
+    fi
+
+    read -r hint <"$RETRY_HINT_FILE" || true
+    if [[ -n "$hint" ]]; then
+      delay_ms=$(_retry_ms "$hint")
+    else
+      ceiling="$cap_ms"
+      if [[ "$attempt" -le 31 && $((base_ms << (attempt - 1))) -lt "$cap_ms" ]]; then
+        ceiling=$((base_ms << (attempt - 1)))
+      fi
+      if [[ "$jitter" == "full" ]]; then
+        delay_ms=$((((RANDOM << 15) | RANDOM) % (ceiling + 1)))
+      else
+        delay_ms="$ceiling"
+      fi
+    fi
+    elapsed_ms=$(((${EPOCHREALTIME/[.,]/} - start_us) / 1000))
+    if [[ "$deadline_ms" -gt 0 && $((elapsed_ms + delay_ms)) -ge "$deadline_ms" ]]; then
+      [[ "$quiet" == "true" ]] || echo "retry: $label: next attempt would exceed the ${deadline_ms}ms deadline; giving up" >&2
+      break
+    fi
+    [[ "$quiet" == "true" ]] ||
+      printf 'retry: %s attempt %d%s failed (exit %d); retrying in %d.%03ds...\n' "$label" "$attempt" \
+        "$([[ "$max_attempts" -gt 0 ]] && echo "/$max_attempts")" "$rc" \
+        $((delay_ms / 1000)) $((delay_ms % 1000)) >&2
+    sleep "$((delay_ms / 1000)).$(printf '%03d' $((delay_ms % 1000)))"
+  done
+
+  # shellcheck disable=SC2034 # read by callers
+  RETRY_LAST_ATTEMPTS="$attempt"
+  RETRY_LAST_ELAPSED_MS=$(((${EPOCHREALTIME/[.,]/} - start_us) / 1000))
+  rm -f "$err" "$RETRY_HINT_FILE"
+  [[ "$quiet" == "true" ]] ||
+    echo "retry: $label $([[ "$rc" -eq 0 ]] && echo ok || echo failed) after $attempt attempt(s) in ${RETRY_LAST_ELAPSED_MS}ms" >&2
+  return "$rc"
+}
@@ -11,6 +11,11 @@ set -euo pipefail
 : "${GH_TOKEN:?GH_TOKEN must be set}"
 GITHUB_ENV="${GITHUB_ENV:-/dev/null}"
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+# shellcheck source=lib/gh-api.bash disable=SC1091
+source "$SCRIPT_DIR/lib/gh-api.bash"
+trap gh_api_summary EXIT
+
 if [[ -r /proc/sys/kernel/random/uuid ]]; then
   sentinel="PR_EOF_$(cat /proc/sys/kernel/random/uuid)"
 elif command -v uuidgen >/dev/null 2>&1; then
@@ -21,7 +26,7 @@ fi
 # A swallowed failure here would silently hand Claude an empty list and the
 # downstream "subsume" step would close zero PRs while reporting success — fail
 # loudly per CLAUDE.md's "Fail loudly" guidance.
-listing=$(gh pr list \
+listing=$(gh_api_run gh pr list \
   --state open \
   --search "author:app/dependabot" \
   --json number,title,headRefName,headRefOid,url \
@@ -0,0 +1,187 @@
+#!/usr/bin/env node
+// @ts-check
+"use strict";
+
+// Backfill "Lessons Learned" from a repo's already-merged PRs, which the
+// phone-home workflow never saw because they predate it.
+//
+// Usage: node .github/scripts/phone-home-backfill.js OWNER/REPO [OUT_DIR]
+//
+// Pages merged PRs through `gh api graphql`, bodies included, 100 per
+// request. Paging is sequential (each request needs the previous cursor), but
+// the next page is prefetched while the current one is extracted, so at most
+// one request is in flight ahead of the work.
+// Lessons go to OUT_DIR/corpus.jsonl (default ./phone-home-backfill), one
+// {number, title, url, mergedAt, lessons} object per line. A lesson that is a
+// near-duplicate of one already in the corpus (see phone-home-index.js;
+// PHONE_HOME_DUP_THRESHOLD) is dropped.
+//
+// After every page the cursor is checkpointed to OUT_DIR/checkpoint.json; an
+// interrupted run picks up from there when rerun with the same OUT_DIR.
+// Re-reading a page that was written but not yet checkpointed is harmless:
+// its PRs are already in the corpus and are skipped.
+
+const { execFile } = require("child_process");
+const fs = require("fs");
+const path = require("path");
+const { promisify } = require("util");
+const { lessonsFromBody } = require("./phone-home-extract.js");
+const {
+  DEFAULT_THRESHOLD,
+  emptyIndex,
+  findDuplicate,
+  signature,
+} = require("./phone-home-index.js");
+
+const PER_PAGE = 100;
+const QUERY = `
+query($owner: String!, $name: String!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(states: MERGED, first: $first, after: $after, orderBy: {field: CREATED_AT, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { number title url mergedAt body }
+    }
+  }
+}`;
+
+const run = promisify(execFile);
+
+/**
+ * @typedef {{ number: number, title: string, url: string, mergedAt: string, body: string | null }} PullNode
+ * @typedef {{ pageInfo: { hasNextPage: boolean, endCursor: string | null }, nodes: PullNode[] }} PullPage
+ */
+
+/**
+ * @param {string} owner
+ * @param {string} name
+ * @param {string | null} after
+ * @returns {Promise<PullPage>}
+ */
+async function fetchPage(owner, name, after) {
+  const args = ["api", "graphql", "-f", `query=${QUERY}`];
+  args.push("-f", `owner=${owner}`, "-f", `name=${name}`);
+  args.push("-F", `first=${PER_PAGE}`);
+  if (after) args.push("-f", `after=${after}`);
+  const { stdout } = await run("gh", args, { maxBuffer: 256 * 1024 * 1024 });
+  const response = JSON.parse(stdout);
+  if (response.errors) {
+    throw new Error(response.errors.map((e) => e.message).join("; "));
+  }
+  return response.data.repository.pullRequests;
+}
+
+/**
+ * @param {string} file
+ * @param {string} contents
+ */
+function atomicWrite(file, contents) {
+  const tmp = `${file}.tmp.${process.pid}`;
+  fs.writeFileSync(tmp, contents);
+  fs.renameSync(tmp, file);
+}
+
+/**
+ * @param {string} slug  OWNER/REPO
+ * @param {string} outDir
+ */
+async function backfill(slug, outDir) {
+  const [owner, name] = slug.split("/");
+  if (!owner || !name) throw new Error(`expected OWNER/REPO, got "${slug}"`);
+  const threshold = Number(
+    process.env.PHONE_HOME_DUP_THRESHOLD || DEFAULT_THRESHOLD,
+  );
+  const corpusFile = path.join(outDir, "corpus.jsonl");
+  const checkpointFile = path.join(outDir, "checkpoint.json");
+  fs.mkdirSync(outDir, { recursive: true });
+
+  // Rebuild the dedup state from what earlier runs wrote.
+  const index = emptyIndex();
+  const seen = new Set();
+  if (fs.existsSync(corpusFile)) {
+    for (const line of fs.readFileSync(corpusFile, "utf8").split("\n")) {
+      if (!line) continue;
+      const entry = JSON.parse(line);
+      seen.add(entry.number);
+      index.entries.push({
+        number: entry.number,
+        title: entry.title,
+        signature: signature(entry.lessons),
+      });
+    }
+  }
+  /** @type {string | null} */
+  let cursor = null;
+  if (fs.existsSync(checkpointFile)) {
+    ({ cursor } = JSON.parse(fs.readFileSync(checkpointFile, "utf8")));
+    console.error(
+      `Resuming after cursor ${cursor} (${seen.size} lessons so far)`,
+    );
+  }
+
+  let prs = 0;
+  let added = 0;
+  let duplicates = 0;
+  let next = fetchPage(owner, name, cursor);
+  for (;;) {
+    const page = await next;
+    const { hasNextPage, endCursor } = page.pageInfo;
+    if (hasNextPage) {
+      next = fetchPage(owner, name, endCursor);
+      // If extracting this page throws, the prefetch is never awaited; don't
+      // let its failure surface as an unhandled rejection on top.
+      next.catch(() => {});
+    }
+
+    const lines = [];
+    for (const pr of page.nodes) {
+      prs++;
+      if (seen.has(pr.number)) continue;
+      const result = lessonsFromBody(pr.body || "");
+      if ("skip" in result) continue;
+      if (findDuplicate(index, result.lessons, threshold)) {
+        duplicates++;
+        continue;
+      }
+      seen.add(pr.number);
+      index.entries.push({
+        number: pr.number,
+        title: pr.title,
+        signature: signature(result.lessons),
+      });
+      lines.push(
+        JSON.stringify({
+          number: pr.number,
+          title: pr.title,
+          url: pr.url,
+          mergedAt: pr.mergedAt,
+          lessons: result.lessons,
+        }),
+      );
+    }
+    if (lines.length) fs.appendFileSync(corpusFile, `${lines.join("\n")}\n`);
+    added += lines.length;
+    if (endCursor) {
+      cursor = endCursor;
+      atomicWrite(checkpointFile, `${JSON.stringify({ cursor })}\n`);
+    }
+    if (!hasNextPage) break;
+  }
+
+  console.error(
+    `Scanned ${prs} merged PR(s): ${added} new lesson(s), ${duplicates} near-duplicate(s) dropped -> ${corpusFile}`,
+  );
+}
+
+if (require.main === module) {
+  const [slug, outDir = "phone-home-backfill"] = process.argv.slice(2);
+  if (!slug) {
+    console.error("usage: phone-home-backfill.js OWNER/REPO [OUT_DIR]");
+    process.exit(2);
+  }
+  backfill(slug, outDir).catch((error) => {
+    console.error(`phone-home-backfill: ${error.message}`);
+    process.exit(1);
+  });
+}
+
+module.exports = { backfill };
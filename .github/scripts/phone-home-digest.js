@@ -0,0 +1,135 @@
+// @ts-check
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const { lessonsFromBody } = require("./phone-home-extract.js");
+
+// Where lessons.txt is handed between steps; the workflow scans this dir.
+const PHONE_HOME_DIR = process.env.PHONE_HOME_DIR || "/tmp/phone-home";
+const PER_PAGE = 100;
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+/**
+ * Start of the digest window: the end of the last digest (from the state
+ * file), else PHONE_HOME_DIGEST_DAYS back from now.
+ * @param {string | undefined} stateFile
+ * @param {Date} now
+ */
+function windowStart(stateFile, now) {
+  if (stateFile) {
+    try {
+      const since = fs.readFileSync(stateFile, "utf8").trim();
+      if (!Number.isNaN(Date.parse(since))) return since;
+    } catch {
+      // no previous digest
+    }
+  }
+  const days = Number(process.env.PHONE_HOME_DIGEST_DAYS || 1);
+  return new Date(now.getTime() - days * DAY_MS).toISOString();
+}
+
+/**
+ * PRs merged in (since, until], oldest first. Lists closed PRs by most
+ * recent update and stops at the first page reaching past `since`: a PR
+ * merged in the window was updated no earlier than its merge.
+ *
+ * @param {object} params
+ * @param {{ rest: { pulls: { list(p: object): Promise<{ data: any[] }> } } }} params.github
+ * @param {string} params.owner
+ * @param {string} params.repo
+ * @param {string} params.since
+ * @param {string} params.until
+ */
+async function mergedPulls({ github, owner, repo, since, until }) {
+  const merged = [];
+  for (let page = 1; ; page++) {
+    const { data } = await github.rest.pulls.list({
+      owner,
+      repo,
+      state: "closed",
+      sort: "updated",
+      direction: "desc",
+      per_page: PER_PAGE,
+      page,
+    });
+    for (const pr of data) {
+      if (pr.merged_at && pr.merged_at > since && pr.merged_at <= until) {
+        merged.push(pr);
+      }
+    }
+    const last = data[data.length - 1];
+    if (data.length < PER_PAGE || last.updated_at < since) break;
+  }
+  return merged.sort((a, b) => (a.merged_at < b.merged_at ? -1 : 1));
+}
+
+/**
+ * Collect "Lessons Learned" from every PR merged since the last digest into
+ * one lessons file, so the digest job scans them with a single gitleaks run
+ * and files a single issue through phone-home-submit.js.
+ *
+ * Called by the phone-home workflow's digest job via actions/github-script.
+ * PHONE_HOME_DIGEST_STATE names the file holding the end of the last window;
+ * it is rewritten here and persisted by the workflow only if the job passes.
+ *
+ * @param {object}  params
+ * @param {{ rest: { pulls: { list(p: object): Promise<{ data: any[] }> } } }} params.github
+ * @param {{ repo: { owner: string, repo: string } }} params.context
+ * @param {{ setOutput(name: string, value: string): void }} params.core
+ */
+module.exports = async ({ github, context, core }) => {
+  const { owner, repo: name } = context.repo;
+  const repo = `${owner}/${name}`;
+  const templateRepo = process.env.TEMPLATE_REPO;
+
+  if (!templateRepo) {
+    throw new Error("TEMPLATE_REPO env var is required");
+  }
+
+  if (repo === templateRepo) {
+    console.log("This IS the template repo, skipping phone-home");
+    return;
+  }
+
+  const stateFile = process.env.PHONE_HOME_DIGEST_STATE;
+  const now = new Date();
+  const until = now.toISOString();
+  const since = windowStart(stateFile, now);
+  const pulls = await mergedPulls({ github, owner, repo: name, since, until });
+
+  const sections = [];
+  for (const pr of pulls) {
+    const result = lessonsFromBody(pr.body || "");
+    if ("skip" in result) continue;
+    // Bold rather than a heading: a heading would end the "Lessons Learned"
+    // section when the issue is read back (see phone-home-index.js).
+    sections.push(
+      `**[#${pr.number}](${pr.html_url}) ${pr.title}**\n\n${result.lessons}`,
+    );
+  }
+  console.log(
+    `${pulls.length} PR(s) merged since ${since}; ${sections.length} with lessons`,
+  );
+
+  if (stateFile) {
+    fs.mkdirSync(path.dirname(stateFile), { recursive: true });
+    fs.writeFileSync(stateFile, `${until}\n`);
+  }
+  if (sections.length === 0) return;
+
+  fs.mkdirSync(PHONE_HOME_DIR, { recursive: true });
+  fs.writeFileSync(`${PHONE_HOME_DIR}/lessons.txt`, sections.join("\n\n"));
+
+  const query = `is:pr is:merged merged:${since}..${until}`;
+  core.setOutput("has_lessons", "true");
+  core.setOutput(
+    "pr_title",
+    `Lessons digest: ${sections.length} merged PR(s), ${since.slice(0, 10)} to ${until.slice(0, 10)}`,
+  );
+  core.setOutput(
+    "pr_url",
+    `https://github.com/${repo}/pulls?q=${encodeURIComponent(query)}`,
+  );
+  core.setOutput("source_repo", repo);
+};
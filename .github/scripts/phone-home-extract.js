@@ -4,7 +4,154 @@
 const fs = require("fs");
 
 const MIN_CONTENT_LENGTH = 10;
-const PHONE_HOME_DIR = "/tmp/phone-home";
+// Where lessons.txt is handed between steps; the workflow scans this dir.
+const PHONE_HOME_DIR = process.env.PHONE_HOME_DIR || "/tmp/phone-home";
+// PR bodies past this are truncated before scanning; bot-generated bodies
+// can run to megabytes, and lessons live in hand-written ones.
+const MAX_BODY_LENGTH = 65536;
+
+// Opening heading allows only h2/h3 ("## "/"### ") so we extract lessons
+// written at heading level, not an inline "#### Lessons Learned" note. The
+// terminator is deliberately wider (#{2,6}) so ANY following heading ends the
+// section. Don't widen the opening heading to match.
+const LESSONS_HEADING = /^#{2,3} Lessons Learned[ \t]*\r?$/i;
+const SECTION_END = /^(?:#{2,6} |---)/;
+const TAG_LINE = /^<[^>]*>$/;
+const SESSION_LINK = "https://claude.ai/code/session_";
+const FENCE = "```";
+
+/**
+ * Find the "Lessons Learned" section of a PR body and strip its noise (HTML
+ * comments, lines that are a lone tag, session links, code fences) in one
+ * pass over the lines. Every pattern is anchored to a single line, so the
+ * work is linear in the (capped) body length.
+ *
+ * HTML comments may span lines; the text around one joins into a single
+ * line. An unclosed `<!--` is kept as text, along with everything after it.
+ *
+ * @param {string} body
+ * @returns {{ section: string, filtered: string } | null}  null if there is
+ *   no section; otherwise the trimmed raw section and its cleaned text
+ */
+function extractLessons(body) {
+  const text =
+    body.length > MAX_BODY_LENGTH ? body.slice(0, MAX_BODY_LENGTH) : body;
+  /** @type {string[]} */
+  const lines = [];
+  let found = false;
+  for (let pos = 0; pos <= text.length; ) {
+    let end = text.indexOf("\n", pos);
+    if (end === -1) end = text.length;
+    const line = text.slice(pos, end);
+    pos = end + 1;
+    if (!found) {
+      found = LESSONS_HEADING.test(line);
+    } else if (SECTION_END.test(line)) {
+      break;
+    } else {
+      lines.push(line);
+    }
+  }
+  if (!found) return null;
+
+  /** @type {string[]} */
+  const kept = [];
+  /** @param {string} line */
+  const keep = (line) => {
+    const trimmed = line.trim();
+    if (
+      !TAG_LINE.test(trimmed) &&
+      !trimmed.startsWith(SESSION_LINK) &&
+      !trimmed.startsWith(FENCE)
+    ) {
+      kept.push(line);
+    }
+  };
+
+  // A "<!--" with no "-->" anywhere after it never closes and stays as text,
+  // so knowing where the last "-->" is settles every opener up front.
+  let lastCloseLine = -1;
+  let lastCloseCol = -1;
+  for (let i = lines.length - 1; i >= 0 && lastCloseLine === -1; i--) {
+    const col = lines[i].lastIndexOf("-->");
+    if (col !== -1) [lastCloseLine, lastCloseCol] = [i, col];
+  }
+  /** @param {number} i  @param {number} col */
+  const closesAfter = (i, col) =>
+    lastCloseLine > i || (lastCloseLine === i && lastCloseCol >= col);
+
+  let current = "";
+  let inComment = false;
+  for (let i = 0; i < lines.length; i++) {
+    const line = lines[i];
+    let col = 0;
+    if (inComment) {
+      const close = line.indexOf("-->");
+      if (close === -1) continue;
+      inComment = false;
+      col = close + 3;
+    }
+    for (;;) {
+      const open = line.indexOf("<!--", col);
+      if (open === -1 || !closesAfter(i, open + 4)) {
+        current += line.slice(col);
+        break;
+      }
+      current += line.slice(col, open);
+      const close = line.indexOf("-->", open + 4);
+      if (close === -1) {
+        inComment = true;
+        break;
+      }
+      col = close + 3;
+    }
+    // Text either side of a multi-line comment joins into one line.
+    if (!inComment) {
+      keep(current);
+      current = "";
+    }
+  }
+
+  return {
+    section: lines.join("\n").trim(),
+    filtered: kept.join("\n").trim(),
+  };
+}
+
+/**
+ * The cleaned lessons worth submitting from a PR body, or why there are none.
+ *
+ * @param {string} body
+ * @returns {{ lessons: string } | { skip: string }}
+ */
+function lessonsFromBody(body) {
+  const extracted = extractLessons(body);
+  if (!extracted) {
+    return {
+      skip: 'No "Lessons Learned" section found in PR body, skipping phone-home',
+    };
+  }
+
+  if (extracted.section.length < MIN_CONTENT_LENGTH) {
+    return { skip: "Lessons section is empty or too short, skipping" };
+  }
+
+  const { filtered } = extracted;
+  if (filtered.length < MIN_CONTENT_LENGTH) {
+    return {
+      skip: "Lessons section only contains template placeholders, skipping",
+    };
+  }
+
+  const stripped = filtered.replace(/\*\*(What|Where|Why)\*\*:\s*/g, "").trim();
+  if (!stripped || stripped.length < MIN_CONTENT_LENGTH) {
+    return {
+      skip: "Lessons section only contains template skeleton, skipping",
+    };
+  }
+
+  return { lessons: filtered };
+}
 
 /**
  * Extract "Lessons Learned" from a merged PR body, filter noise, and write
@@ -30,57 +177,26 @@ module.exports = async ({ context, core }) => {
     return;
   }
 
-  // Opening anchor allows only h2/h3 ("## "/"### ") so we extract lessons
-  // written at heading level, not an inline "#### Lessons Learned" note. The
-  // terminating lookahead is deliberately wider (#{2,6}) so ANY following
-  // heading ends the section. Don't widen the opening anchor to match.
-  const lessonsMatch = prBody.match(
-    /(?:^|\n)#{2,3} Lessons Learned[ \t]*\n([\s\S]*?)(?=\n#{2,6} |\n---|\s*$)/i,
-  );
-  if (!lessonsMatch) {
-    console.log(
-      'No "Lessons Learned" section found in PR body, skipping phone-home',
-    );
-    return;
-  }
-
-  const lessons = lessonsMatch[1].trim();
-  if (!lessons || lessons.length < MIN_CONTENT_LENGTH) {
-    console.log("Lessons section is empty or too short, skipping");
-    return;
-  }
-
-  // Strip HTML comments first with a newline-aware pattern so multi-line
-  // <!-- ... --> placeholders are removed too (a per-line /^<!--.*-->$/ only
-  // catches single-line comments).
-  const filtered = lessons
-    .replace(/<!--[\s\S]*?-->/g, "")
-    .split("\n")
-    .filter((line) => !line.trim().match(/^<[^>]*>$/))
-    .filter(
-      (line) => !line.trim().match(/^https:\/\/claude\.ai\/code\/session_/),
-    )
-    .filter((line) => !line.trim().match(/^```/))
-    .join("\n")
-    .trim();
-  if (!filtered || filtered.length < MIN_CONTENT_LENGTH) {
+  if (prBody.length > MAX_BODY_LENGTH) {
     console.log(
-      "Lessons section only contains template placeholders, skipping",
+      `PR body is ${prBody.length} chars; scanning only the first ${MAX_BODY_LENGTH}`,
     );
-    return;
   }
-
-  const stripped = filtered.replace(/\*\*(What|Where|Why)\*\*:\s*/g, "").trim();
-  if (!stripped || stripped.length < MIN_CONTENT_LENGTH) {
-    console.log("Lessons section only contains template skeleton, skipping");
+  const result = lessonsFromBody(prBody);
+  if ("skip" in result) {
+    console.log(result.skip);
     return;
   }
 
   fs.mkdirSync(PHONE_HOME_DIR, { recursive: true });
-  fs.writeFileSync(`${PHONE_HOME_DIR}/lessons.txt`, filtered);
+  fs.writeFileSync(`${PHONE_HOME_DIR}/lessons.txt`, result.lessons);
 
   core.setOutput("has_lessons", "true");
   core.setOutput("pr_title", context.payload.pull_request.title);
   core.setOutput("pr_url", context.payload.pull_request.html_url);
   core.setOutput("source_repo", repo);
 };
+
+module.exports.extractLessons = extractLessons;
+module.exports.lessonsFromBody = lessonsFromBody;
+module.exports.MAX_BODY_LENGTH = MAX_BODY_LENGTH;
@@ -0,0 +1,219 @@
+// @ts-check
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const { extractLessons } = require("./phone-home-extract.js");
+
+// 2: closed issues are left out, so version-1 caches that may hold them are
+// rebuilt.
+const INDEX_VERSION = 2;
+const NUM_HASHES = 64;
+const SHINGLE_SIZE = 5;
+// Estimated Jaccard similarity of character shingles at or above which two
+// lessons count as the same report.
+const DEFAULT_THRESHOLD = 0.6;
+const PER_PAGE = 100;
+
+/**
+ * @typedef {{ number: number, title: string, signature: number[] }} IndexEntry
+ * @typedef {{ version: number, updatedAt: string | null, entries: IndexEntry[] }} LessonIndex
+ */
+
+// Seeds for the NUM_HASHES hash functions h(x) = (a*x + b) mod 2^32, a odd.
+// Derived once from a fixed xorshift stream so signatures stay comparable
+// across runs and machines.
+const SEEDS = (() => {
+  /** @type {[number, number][]} */
+  const seeds = [];
+  let state = 0x9e3779b9;
+  const next = () => {
+    state ^= state << 13;
+    state ^= state >>> 17;
+    state ^= state << 5;
+    return state >>> 0;
+  };
+  for (let i = 0; i < NUM_HASHES; i++) seeds.push([next() | 1, next()]);
+  return seeds;
+})();
+
+/**
+ * Lower-case, drop markdown punctuation and list markers, collapse whitespace,
+ * so formatting differences between two reports of a lesson don't count.
+ * @param {string} text
+ */
+function normalize(text) {
+  return text
+    .toLowerCase()
+    .replace(/https?:\/\/\S+/g, " ")
+    .replace(/[^\p{L}\p{N}]+/gu, " ")
+    .trim();
+}
+
+/** @param {string} s  32-bit FNV-1a */
+function fnv1a(s) {
+  let h = 0x811c9dc5;
+  for (let i = 0; i < s.length; i++) {
+    h ^= s.charCodeAt(i);
+    h = Math.imul(h, 0x01000193);
+  }
+  return h >>> 0;
+}
+
+/**
+ * MinHash signature of the text's character shingles.
+ * @param {string} text
+ * @returns {number[]}
+ */
+function signature(text) {
+  const norm = normalize(text);
+  const sig = new Array(NUM_HASHES).fill(0xffffffff);
+  const count = Math.max(1, norm.length - SHINGLE_SIZE + 1);
+  for (let i = 0; i < count; i++) {
+    const x = fnv1a(norm.slice(i, i + SHINGLE_SIZE));
+    for (let j = 0; j < NUM_HASHES; j++) {
+      const h = (Math.imul(SEEDS[j][0], x) + SEEDS[j][1]) >>> 0;
+      if (h < sig[j]) sig[j] = h;
+    }
+  }
+  return sig;
+}
+
+/**
+ * Estimated Jaccard similarity: the share of positions where two signatures agree.
+ * @param {number[]} a
+ * @param {number[]} b
+ */
+function similarity(a, b) {
+  let same = 0;
+  for (let i = 0; i < NUM_HASHES; i++) if (a[i] === b[i]) same++;
+  return same / NUM_HASHES;
+}
+
+/**
+ * Most similar indexed issue at or above THRESHOLD, if any.
+ * @param {LessonIndex} index
+ * @param {string} lessons
+ * @param {number} [threshold]
+ * @returns {{ entry: IndexEntry, score: number } | null}
+ */
+function findDuplicate(index, lessons, threshold = DEFAULT_THRESHOLD) {
+  const sig = signature(lessons);
+  /** @type {{ entry: IndexEntry, score: number } | null} */
+  let best = null;
+  for (const entry of index.entries) {
+    const score = similarity(sig, entry.signature);
+    if (score >= threshold && (!best || score > best.score)) {
+      best = { entry, score };
+    }
+  }
+  return best;
+}
+
+/** @returns {LessonIndex} */
+function emptyIndex() {
+  return { version: INDEX_VERSION, updatedAt: null, entries: [] };
+}
+
+/**
+ * Read the cached index; a missing, unreadable or older-format file starts
+ * over (the next refresh rebuilds it from the full issue list).
+ * @param {string} file
+ * @returns {LessonIndex}
+ */
+function loadIndex(file) {
+  try {
+    const index = JSON.parse(fs.readFileSync(file, "utf8"));
+    if (index.version === INDEX_VERSION && Array.isArray(index.entries)) {
+      return index;
+    }
+  } catch {
+    // fall through
+  }
+  return emptyIndex();
+}
+
+/**
+ * @param {string} file
+ * @param {LessonIndex} index
+ */
+function saveIndex(file, index) {
+  fs.mkdirSync(path.dirname(file), { recursive: true });
+  const tmp = `${file}.tmp.${process.pid}`;
+  fs.writeFileSync(tmp, JSON.stringify(index));
+  fs.renameSync(tmp, file);
+}
+
+/**
+ * @param {LessonIndex} index
+ * @param {IndexEntry} entry
+ */
+function upsert(index, entry) {
+  const i = index.entries.findIndex((e) => e.number === entry.number);
+  if (i === -1) index.entries.push(entry);
+  else index.entries[i] = entry;
+}
+
+/**
+ * Fold phone-home issues updated since the index's watermark into it, so a
+ * warm cache costs one listing request. Only open issues are indexed: a lesson
+ * matching a closed report opens a new issue rather than commenting on one
+ * nobody is watching. Closed issues are still listed so that closing an
+ * indexed issue drops it.
+ *
+ * @param {object} params
+ * @param {{ rest: { issues: { listForRepo(p: object): Promise<{ data: any[] }> } } }} params.github
+ * @param {string} params.owner
+ * @param {string} params.repo
+ * @param {LessonIndex} params.index
+ */
+async function refreshIndex({ github, owner, repo, index }) {
+  for (let page = 1; ; page++) {
+    const { data } = await github.rest.issues.listForRepo({
+      owner,
+      repo,
+      labels: "phone-home",
+      state: "all",
+      sort: "updated",
+      direction: "asc",
+      per_page: PER_PAGE,
+      page,
+      ...(index.updatedAt ? { since: index.updatedAt } : {}),
+    });
+    for (const issue of data) {
+      if (issue.pull_request || !String(issue.title).startsWith("[phone-home]")) {
+        continue;
+      }
+      if (issue.state === "closed") {
+        index.entries = index.entries.filter((e) => e.number !== issue.number);
+      } else {
+        const extracted = extractLessons(issue.body || "");
+        if (extracted && extracted.filtered) {
+          upsert(index, {
+            number: issue.number,
+            title: issue.title,
+            signature: signature(extracted.filtered),
+          });
+        }
+      }
+      if (issue.updated_at && (!index.updatedAt || issue.updated_at > index.updatedAt)) {
+        index.updatedAt = issue.updated_at;
+      }
+    }
+    if (data.length < PER_PAGE) break;
+  }
+  return index;
+}
+
+module.exports = {
+  DEFAULT_THRESHOLD,
+  emptyIndex,
+  findDuplicate,
+  loadIndex,
+  normalize,
+  refreshIndex,
+  saveIndex,
+  signature,
+  similarity,
+  upsert,
+};
@@ -2,8 +2,18 @@
 "use strict";
 
 const fs = require("fs");
+const {
+  DEFAULT_THRESHOLD,
+  findDuplicate,
+  loadIndex,
+  refreshIndex,
+  saveIndex,
+  signature,
+  upsert,
+} = require("./phone-home-index.js");
 
-const PHONE_HOME_DIR = "/tmp/phone-home";
+// Where lessons.txt is handed between steps; the workflow scans this dir.
+const PHONE_HOME_DIR = process.env.PHONE_HOME_DIR || "/tmp/phone-home";
 
 /**
  * Submit extracted lessons as an issue on the template repository.
@@ -11,10 +21,22 @@ const PHONE_HOME_DIR = "/tmp/phone-home";
  * Called by the phone-home workflow via actions/github-script.
  * Expects PR_TITLE, PR_URL, SOURCE_REPO, and TEMPLATE_REPO env vars.
  *
+ * With PHONE_HOME_INDEX set (a cache file path), existing phone-home issues
+ * are indexed by lesson similarity (see phone-home-index.js), and lessons
+ * that match one are added to it as a comment instead of a new issue.
+ * PHONE_HOME_DUP_THRESHOLD overrides the match threshold.
+ *
+ * Sets the `submitted` output to "true" once the lessons are filed as an
+ * issue or a comment, and "false" when they could not be. The digest job
+ * only advances its window on "true", so a failed submission is retried.
+ *
  * @param {object}  params
- * @param {{ rest: { issues: { create(p: object): Promise<{data: {html_url: string, number: number}}>; addLabels(p: object): Promise<void> } } }} params.github
+ * @param {{ rest: { issues: { create(p: object): Promise<{data: {html_url: string, number: number}}>; addLabels(p: object): Promise<void>; createComment(p: object): Promise<{data: {html_url: string}}>; listForRepo(p: object): Promise<{data: any[]}> } } }} params.github
+ * @param {{ setOutput(name: string, value: string): void }} [params.core]
  */
-module.exports = async ({ github }) => {
+module.exports = async ({ github, core }) => {
+  /** @param {boolean} ok */
+  const submitted = (ok) => core && core.setOutput("submitted", String(ok));
   const lessons = fs.readFileSync(`${PHONE_HOME_DIR}/lessons.txt`, "utf8");
   const prTitle = process.env.PR_TITLE;
   const prUrl = process.env.PR_URL;
@@ -42,6 +64,56 @@ module.exports = async ({ github }) => {
   ].join("\n");
 
   const [templateOwner, templateRepoName] = templateRepo.split("/");
+  const indexFile = process.env.PHONE_HOME_INDEX;
+  /** @type {import("./phone-home-index.js").LessonIndex | null} */
+  let index = null;
+  if (indexFile) {
+    try {
+      index = await refreshIndex({
+        github,
+        owner: templateOwner,
+        repo: templateRepoName,
+        index: loadIndex(indexFile),
+      });
+      saveIndex(indexFile, index);
+    } catch (error) {
+      console.log(`Could not refresh the phone-home index: ${error.message}`);
+      index = null;
+    }
+  }
+
+  const threshold = Number(
+    process.env.PHONE_HOME_DUP_THRESHOLD || DEFAULT_THRESHOLD,
+  );
+  const duplicate = index && findDuplicate(index, lessons, threshold);
+  if (duplicate) {
+    const { number } = duplicate.entry;
+    try {
+      const comment = await github.rest.issues.createComment({
+        owner: templateOwner,
+        repo: templateRepoName,
+        issue_number: number,
+        body: [
+          `### Also reported from \`${repo}\``,
+          "",
+          `**Source PR:** ${prUrl}`,
+          `**PR Title:** ${prTitle}`,
+          "",
+          lessons,
+        ].join("\n"),
+      });
+      console.log(
+        `Lessons match #${number} (similarity ${duplicate.score.toFixed(2)}); commented: ${comment.data.html_url}`,
+      );
+      submitted(true);
+      return;
+    } catch (error) {
+      console.log(
+        `Could not comment on #${number}: ${error.message}; opening a new issue`,
+      );
+    }
+  }
+
   let issue;
   try {
     issue = await github.rest.issues.create({
@@ -51,11 +123,21 @@ module.exports = async ({ github }) => {
       body: issueBody,
     });
     console.log(`Created issue on template repo: ${issue.data.html_url}`);
+    submitted(true);
+    if (index && indexFile) {
+      upsert(index, {
+        number: issue.data.number,
+        title: `[phone-home] ${prTitle}`,
+        signature: signature(lessons),
+      });
+      saveIndex(indexFile, index);
+    }
   } catch (error) {
     console.log(`Could not create issue on ${templateRepo}: ${error.message}`);
     console.log("This is expected if TEMPLATE_SYNC_TOKEN is not configured.");
     console.log("To enable phone-home, add a TEMPLATE_SYNC_TOKEN secret with");
     console.log("permission to create issues on the template repository.");
+    submitted(false);
     return;
   }
 
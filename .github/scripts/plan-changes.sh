@@ -0,0 +1,127 @@
+#!/usr/bin/env bash
+# Decide which path-gated CI checks a change needs, all in one pass.
+#
+# Every gate in GATES_FILE is a list of globs; a gate is open when any file
+# changed between the merge base of REF and HEAD matches one of its globs. The
+# changed files come from a single `git diff`, and one awk process matches all
+# of them against every gate. Prints "gate=true|false" per gate, in file
+# order, and appends the same lines to $GITHUB_OUTPUT when set, so a workflow
+# step can gate its later steps on `steps.<id>.outputs.<gate>`.
+#
+# Globs: `*` and `?` stay within one path segment, `**` spans any number of
+# segments, and `dir/**/x` also matches `dir/x`. Renames count as a deletion
+# plus an addition, so moving a file out of a gated path opens the gate.
+#
+# With no base (not a pull request) every gate is open. So is a base that
+# doesn't resolve, e.g. in a clone too shallow to reach it, with a notice:
+# running a check needlessly is cheaper than skipping one that mattered.
+#
+# On a pull request, CI checks out the PR merge commit with fetch-depth 2 and
+# passes HEAD^1: the base branch tip, which is its own merge base with HEAD, so
+# no further history or API listing is needed.
+#
+# Locally, predict which checks a branch will trigger:
+#   .github/scripts/plan-changes.sh --base origin/main
+#
+# Inputs:
+#   --base REF / PLAN_BASE_REF       Compare HEAD with its merge base with REF
+#   --gates FILE / PATH_GATES_FILE   Gate config (default:
+#                                    .github/scripts/path-gates.json)
+
+set -euo pipefail
+
+base="${PLAN_BASE_REF:-}"
+gates_file="${PATH_GATES_FILE:-.github/scripts/path-gates.json}"
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+  --base)
+    base="${2:?--base requires a ref}"
+    shift 2
+    ;;
+  --gates)
+    gates_file="${2:?--gates requires a file}"
+    shift 2
+    ;;
+  *)
+    echo "usage: plan-changes.sh [--base REF] [--gates FILE]" >&2
+    exit 2
+    ;;
+  esac
+done
+
+# "gate<TAB>glob" per glob; a gate with no globs still gets a line so it is
+# reported (and never opens).
+gates=$(jq -r 'to_entries[] | .key as $gate
+  | if (.value | length) == 0 then [$gate, ""] else (.value[] | [$gate, .]) end
+  | @tsv' "$gates_file")
+
+changed=""
+all_open=0
+if [[ -z "$base" ]]; then
+  all_open=1
+elif merge_base=$(git merge-base "$base" HEAD 2>/dev/null); then
+  changed=$(git -c core.quotePath=false diff --name-only --no-renames "$merge_base" HEAD)
+else
+  echo "::notice::plan-changes: no merge base with '$base'; running every check"
+  all_open=1
+fi
+
+# shellcheck disable=SC2016  # awk program
+plan=$(awk -F '\t' -v all_open="$all_open" '
+  # Anchored ERE for a glob; regex metacharacters in it are matched literally.
+  function glob_re(glob,   re, i, c) {
+    re = ""
+    for (i = 1; i <= length(glob); i++) {
+      c = substr(glob, i, 1)
+      if (c == "*" && substr(glob, i + 1, 1) == "*") {
+        i++
+        if (substr(glob, i + 1, 1) == "/") {
+          i++
+          re = re "(.*/)?"
+        } else {
+          re = re ".*"
+        }
+      } else if (c == "*") {
+        re = re "[^/]*"
+      } else if (c == "?") {
+        re = re "[^/]"
+      } else if (c == "\\" || c == "^") {
+        re = re "\\" c
+      } else if (index(".$+()[]{}|", c)) {
+        re = re "[" c "]"
+      } else {
+        re = re c
+      }
+    }
+    return "^" re "$"
+  }
+
+  FILENAME == ARGV[1] {
+    if ($1 == "") next
+    if (!($1 in open)) {
+      order[++gates] = $1
+      open[$1] = all_open + 0
+    }
+    if ($2 != "") {
+      pattern[++patterns] = glob_re($2)
+      gate_of[patterns] = $1
+    }
+    next
+  }
+
+  {
+    for (p = 1; p <= patterns; p++) {
+      if (!open[gate_of[p]] && $0 ~ pattern[p]) open[gate_of[p]] = 1
+    }
+  }
+
+  END {
+    for (g = 1; g <= gates; g++) print order[g] "=" (open[order[g]] ? "true" : "false")
+  }
+' <(printf '%s\n' "$gates") <(printf '%s' "$changed"))
+
+[[ -n "$plan" ]] || exit 0
+printf '%s\n' "$plan"
+if [[ -n "${GITHUB_OUTPUT:-}" ]]; then
+  printf '%s\n' "$plan" >>"$GITHUB_OUTPUT"
+fi
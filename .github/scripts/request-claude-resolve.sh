@@ -17,6 +17,11 @@ HAS_DELETIONS="${HAS_DELETIONS:-false}"
 CONFLICT_FILES="${CONFLICT_FILES:-}"
 DELETED_FILES="${DELETED_FILES:-}"
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+# shellcheck source=lib/gh-api.bash disable=SC1091
+source "$SCRIPT_DIR/lib/gh-api.bash"
+trap gh_api_summary EXIT
+
 BODY="@claude Resolve this template sync PR so it's ready to merge.
 
 **Important:** Check whether newly added workflow files duplicate CI that the target repo already has (e.g., the repo may already have its own test or lint workflows under different names or configurations). If a synced workflow (like \`node-tests.yaml\`, \`lint.yaml\`, \`format-check.yaml\`) duplicates existing CI, delete the redundant template workflow and add its path to EXCLUDE_PATHS in \`template-sync.yaml\` so it won't be re-added on future syncs."
@@ -45,4 +50,6 @@ BODY="$BODY
 
 Commit your changes and ensure the PR is ready for human review."
 
-gh pr comment "$PR_NUM" --body "$BODY"
+# --mutating: a comment that hit a 5xx may still have been posted; only retry
+# rate-limit rejections, which GitHub guarantees were not applied.
+gh_api_run --mutating gh pr comment "$PR_NUM" --body "$BODY"
@@ -5,6 +5,14 @@
 # This catches hooks that break end-to-end (a syntax error, a missing tool, a
 # formatter that errors on the repo's own files) before they reach a session
 # and silently block every tool call. Run by `.github/workflows/hook-lifecycle.yaml`.
+#
+# Each phase is timed and checked against .github/hook-lifecycle-budgets.json
+# by check-hook-budgets.sh: an over-budget or regressed phase fails or warns
+# (per phase) after all phases have run, and the timings go to the step summary.
+#
+# Inputs (env):
+#   HOOK_LIFECYCLE_BASELINE  Timings JSON from a previous run to compare against
+#   HOOK_LIFECYCLE_RESULTS   Where to write this run's timings JSON
 
 set -euo pipefail
 
@@ -22,11 +30,26 @@ git config user.name "CI"
 CLAUDE_ENV_FILE=$(mktemp "${RUNNER_TEMP:-/tmp}/claude_env_XXXXXX")
 export CLAUDE_ENV_FILE
 setup_log=$(mktemp "${RUNNER_TEMP:-/tmp}/session-setup_XXXXXX.log")
-trap 'rm -f "$CLAUDE_ENV_FILE" "$setup_log"' EXIT
+timings=$(mktemp "${RUNNER_TEMP:-/tmp}/hook-timings_XXXXXX.tsv")
+trap 'rm -f "$CLAUDE_ENV_FILE" "$setup_log" "$timings"' EXIT
+
+# timed PHASE CMD... — run CMD inside a log group and append
+# "PHASE<TAB>milliseconds" to $timings. A failing CMD still fails the run.
+timed() {
+  local phase="$1" start
+  shift
+  echo "::group::$phase"
+  start="${EPOCHREALTIME/[.,]/}"
+  "$@"
+  printf '%s\t%d\n' "$phase" $(((${EPOCHREALTIME/[.,]/} - start) / 1000)) >>"$timings"
+  echo "::endgroup::"
+}
 
-echo "::group::session-setup.sh"
-.claude/hooks/session-setup.sh 2>&1 | tee "$setup_log"
-echo "::endgroup::"
+run_session_setup() {
+  .claude/hooks/session-setup.sh 2>&1 | tee "$setup_log"
+}
+
+timed session-setup run_session_setup
 # shellcheck disable=SC1090
 source "$CLAUDE_ENV_FILE"
 
@@ -43,14 +66,16 @@ fi
 #    (repo-wide formatting is covered by the pre-commit and format-check
 #    workflows) — this leg verifies the hook script itself runs without error.
 git add -A
-echo "::group::pre-commit"
-.hooks/pre-commit
-echo "::endgroup::"
+timed pre-commit .hooks/pre-commit
 
 # 3. Pre-push checks (build/lint/test/ruff — whichever are configured).
 export CLAUDE_PROJECT_DIR="$repo_root"
-echo "::group::pre-push-check.sh"
-.claude/hooks/pre-push-check.sh
-echo "::endgroup::"
+timed pre-push .claude/hooks/pre-push-check.sh
+
+# 4. Timing budgets.
+TIMINGS_FILE="$timings" \
+  BASELINE_FILE="${HOOK_LIFECYCLE_BASELINE:-}" \
+  RESULTS_FILE="${HOOK_LIFECYCLE_RESULTS:-}" \
+  bash .github/scripts/check-hook-budgets.sh
 
 echo "Hook lifecycle completed successfully."
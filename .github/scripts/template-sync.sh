@@ -15,8 +15,8 @@
 #
 # Side effects:
 #   - Creates/updates files inside the current repo to match the template
-#   - Writes /tmp/conflict_files.txt, /tmp/conflict_report.md,
-#     /tmp/deleted_files.txt, /tmp/auto_merged_files.txt
+#   - Keeps its scratch files (conflict lists, merge bases) in
+#     $TEMPLATE_SYNC_WORK_DIR, or a private temp dir removed on exit
 #   - Writes .template-sync-conflicts if there are unresolved conflicts
 #   - Appends key=value lines to $GITHUB_OUTPUT
 
@@ -35,8 +35,14 @@ main() {
   EXCLUDE_PATHS="${EXCLUDE_PATHS:-}"
   : "${GITHUB_OUTPUT:?GITHUB_OUTPUT must be set}"
 
-  # Allow tests to point at alternative temp dirs.
-  WORK_DIR="${TEMPLATE_SYNC_WORK_DIR:-/tmp}"
+  # Scratch space. A fresh dir by default, so concurrent runs on one host
+  # (e.g. parallel tests) never share files; tests may pass their own.
+  if [[ -n "${TEMPLATE_SYNC_WORK_DIR:-}" ]]; then
+    WORK_DIR="$TEMPLATE_SYNC_WORK_DIR"
+  else
+    WORK_DIR=$(mktemp -d)
+    trap 'rm -rf "$WORK_DIR"' EXIT
+  fi
   CONFLICT_FILES="$WORK_DIR/conflict_files.txt"
   CONFLICT_REPORT="$WORK_DIR/conflict_report.md"
   DELETED_FILES="$WORK_DIR/deleted_files.txt"
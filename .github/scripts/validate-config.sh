@@ -11,12 +11,37 @@ error() {
 echo "Validating configuration consistency..."
 echo ""
 
+# Parse .claude/settings.json once. Each output line is tagged with the check
+# that consumes it: C = any hook command (check 1), P = a PreToolUse command
+# (check 3). Multi-line commands are split so every line keeps its tag.
+settings_state=missing
+commands=""
+pretooluse_cmds=""
+if [[ -f .claude/settings.json ]]; then
+  if settings_lines=$(jq -r '
+    (.. | objects | select(.command?) | .command | tostring | split("\n")[] | "C\t" + .),
+    (.hooks.PreToolUse // [] | .[] | .hooks[] | select(.type == "command")
+      | .command | tostring | split("\n")[] | "P\t" + .)
+  ' .claude/settings.json 2>/dev/null); then
+    settings_state=ok
+    while IFS= read -r line; do
+      case "$line" in
+      C$'\t'*) commands+="${line#C$'\t'}"$'\n' ;;
+      P$'\t'*) pretooluse_cmds+="${line#P$'\t'}"$'\n' ;;
+      esac
+    done <<<"$settings_lines"
+  else
+    settings_state=invalid
+  fi
+fi
+
 # 1. All hook scripts referenced in .claude/settings.json exist on disk
 echo "Checking Claude hook script paths..."
-if [[ -f .claude/settings.json ]]; then
-  if ! commands=$(jq -r '.. | objects | select(.command?) | .command' .claude/settings.json 2>/dev/null); then
+if [[ "$settings_state" == "missing" ]]; then
+  error ".claude/settings.json not found"
+else
+  if [[ "$settings_state" == "invalid" ]]; then
     error ".claude/settings.json could not be parsed (invalid JSON?)"
-    commands=""
   fi
   while IFS= read -r cmd; do
     [[ -z "$cmd" ]] && continue
@@ -33,14 +58,20 @@ if [[ -f .claude/settings.json ]]; then
       esac
     done
   done <<<"$commands"
-else
-  error ".claude/settings.json not found"
 fi
 
 # 2. Hook scripts are syntactically valid. Files with a shebang must be
 # executable (they're invoked directly); language-helper files without a
 # shebang are loaded by another hook and don't need +x.
+#
+# Syntax checks are batched: every Python hook is compiled in one python3
+# process, and shell hooks are parsed with `bash -n` in parallel batches
+# (SHELL_CHECKER). Files that passed before are skipped via a cache of blob
+# OIDs in the git dir, keyed by checker (python3's path and `-VV` build line,
+# bash version) so an upgrade re-checks, even one in place.
 echo "Checking hook script permissions and syntax..."
+py_files=()
+sh_files=()
 for f in .hooks/* .claude/hooks/*; do
   [[ -f "$f" ]] || continue
   has_shebang=0
@@ -53,38 +84,130 @@ for f in .hooks/* .claude/hooks/*; do
     error "$f has a shebang but is not executable"
   fi
   case "$f" in
-  *.py)
-    if ! py_err=$(python3 -m py_compile "$f" 2>&1); then
-      error "$f has a python syntax error: $py_err"
-    fi
-    ;;
-  *)
-    if ! bash_err=$(bash -n "$f" 2>&1); then
-      error "$f has a bash syntax error: $bash_err"
-    fi
-    ;;
+  *.py) py_files+=("$f") ;;
+  *) sh_files+=("$f") ;;
   esac
 done
 
+py_key="py:$(command -v python3 || echo python3) $(python3 -VV 2>/dev/null || true)"
+sh_key="sh:$BASH_VERSION"
+declare -A oid_of=() cached=()
+cache_file=""
+if [[ $((${#py_files[@]} + ${#sh_files[@]})) -gt 0 ]] &&
+  git_dir=$(git rev-parse --git-dir 2>/dev/null); then
+  cache_file="$git_dir/validate-config/syntax-ok"
+  mapfile -t oids < <(git hash-object -- "${py_files[@]}" "${sh_files[@]}")
+  i=0
+  for f in "${py_files[@]}" "${sh_files[@]}"; do
+    oid_of["$f"]="${oids[i]:-}"
+    i=$((i + 1))
+  done
+  if [[ -f "$cache_file" ]]; then
+    while IFS= read -r entry; do
+      cached["$entry"]=1
+    done <"$cache_file"
+  fi
+fi
+new_ok=()
+
+# is_cached KEY FILE — true if FILE's current blob already passed under KEY.
+is_cached() {
+  [[ -n "${oid_of[$2]:-}" && -n "${cached["$1 ${oid_of[$2]}"]:-}" ]]
+}
+
+# mark_ok KEY FILE — remember that FILE's current blob passed under KEY.
+mark_ok() {
+  [[ -n "${oid_of[$2]:-}" ]] && new_ok+=("$1 ${oid_of[$2]}")
+  return 0
+}
+
+py_todo=()
+for f in "${py_files[@]}"; do
+  is_cached "$py_key" "$f" || py_todo+=("$f")
+done
+if [[ ${#py_todo[@]} -gt 0 ]]; then
+  # One interpreter for all files; prints "ok<TAB>path" or "err<TAB>path<TAB>message".
+  py_results=$(python3 -c '
+import sys
+for path in sys.argv[1:]:
+    try:
+        with open(path, "rb") as f:
+            compile(f.read(), path, "exec", dont_inherit=True)
+    except SyntaxError as e:
+        print(f"err\t{path}\tline {e.lineno}: {e.msg}")
+    except ValueError as e:  # e.g. NUL bytes in the source
+        print(f"err\t{path}\t{e}")
+    else:
+        print(f"ok\t{path}")
+' "${py_todo[@]}" 2>&1) || error "python3 could not check hook syntax: $py_results"
+  while IFS=$'\t' read -r status f msg; do
+    case "$status" in
+    ok) mark_ok "$py_key" "$f" ;;
+    err) error "$f has a python syntax error: $msg" ;;
+    esac
+  done <<<"$py_results"
+fi
+
+# Shell hooks are parsed with `bash -n`, which never runs them. (Defining each
+# file as a function body and eval-ing it is not equivalent: a stray `}` closes
+# the function early and everything after it runs.) Files are spread over
+# parallel batches with xargs; each result is one short printf, so lines from
+# concurrent batches don't interleave. Prints "ok<TAB>path" or
+# "err<TAB>path<TAB>message" per file.
+# shellcheck disable=SC2016  # expanded by the child bash, not here
+SHELL_CHECKER='
+for f; do
+  if msg=$(bash -n "$f" 2>&1); then
+    printf "ok\t%s\n" "$f"
+  else
+    printf "err\t%s\t%s\n" "$f" "$(printf "%s" "$msg" | tr "\n" " ")"
+  fi
+done
+'
+
+sh_todo=()
+for f in "${sh_files[@]}"; do
+  is_cached "$sh_key" "$f" || sh_todo+=("$f")
+done
+if [[ ${#sh_todo[@]} -gt 0 ]]; then
+  jobs=$(getconf _NPROCESSORS_ONLN 2>/dev/null || echo 4)
+  sh_results=$(printf '%s\0' "${sh_todo[@]}" |
+    xargs -0 -n 16 -P "$jobs" bash -c "$SHELL_CHECKER" validate-config) ||
+    error "bash could not check hook syntax: $sh_results"
+  while IFS=$'\t' read -r status f msg; do
+    case "$status" in
+    ok) mark_ok "$sh_key" "$f" ;;
+    err) error "$f has a bash syntax error: $msg" ;;
+    esac
+  done <<<"$sh_results"
+fi
+
+if [[ -n "$cache_file" && ${#new_ok[@]} -gt 0 ]]; then
+  mkdir -p "${cache_file%/*}"
+  # Keep the newest entries so the cache can't grow without bound.
+  {
+    [[ -f "$cache_file" ]] && cat "$cache_file"
+    printf '%s\n' "${new_ok[@]}"
+  } |
+    tail -n 2000 >"$cache_file.tmp.$$" && mv "$cache_file.tmp.$$" "$cache_file"
+fi
+
 # 3. Every PreToolUse hook must be invoked *through* safe-launch.sh so a syntax
 # error in the underlying hook can never lock the session. We check the first
 # token (the program actually executed), not a substring, so a command that
 # merely mentions "safe-launch.sh" in an argument can't pass by accident.
 echo "Checking PreToolUse hooks use safe-launch.sh..."
-if [[ -f .claude/settings.json ]]; then
-  if ! pretooluse_cmds=$(jq -r '.hooks.PreToolUse // [] | .[] | .hooks[] | select(.type == "command") | .command' .claude/settings.json 2>/dev/null); then
-    error ".claude/settings.json could not be parsed (invalid JSON?)"
-    pretooluse_cmds=""
-  fi
-  while IFS= read -r cmd; do
-    [[ -z "$cmd" ]] && continue
-    read -ra tokens <<<"$cmd"
-    case "${tokens[0]}" in
-    */safe-launch.sh | safe-launch.sh) ;;
-    *) error "PreToolUse hook is not invoked through safe-launch.sh (risks session lockout on parse error): $cmd" ;;
-    esac
-  done <<<"$pretooluse_cmds"
+if [[ "$settings_state" == "invalid" ]]; then
+  error ".claude/settings.json could not be parsed (invalid JSON?)"
 fi
+while IFS= read -r cmd; do
+  [[ -z "$cmd" ]] && continue
+  read -ra tokens <<<"$cmd"
+  case "${tokens[0]}" in
+  */safe-launch.sh | safe-launch.sh) ;;
+  *) error "PreToolUse hook is not invoked through safe-launch.sh (risks session lockout on parse error): $cmd" ;;
+  esac
+done <<<"$pretooluse_cmds"
 
 # Summary
 echo ""
@@ -20,6 +20,19 @@ source "$SCRIPT_DIR/lib/retry.bash"
 
 log() { echo "$@" >&2; }
 
+# git push failures that another attempt cannot fix: the remote moved on, the
+# token lacks access, or branch protection refused the update. Retrying these
+# only burns the backoff; anything else (network, 5xx) is retried.
+PUSH_PERMANENT_ERRORS='\[rejected\]|non-fast-forward|fetch first|Authentication failed|Permission to .* denied|permission denied|The requested URL returned error: 403|protected branch|GH006|GH013'
+
+# push_with_retry REFSPEC — push to origin with jittered backoff inside a
+# two-minute budget, failing fast on PUSH_PERMANENT_ERRORS.
+push_with_retry() {
+  retry_run --max-attempts 4 --base 2 --cap 30 --deadline 120 \
+    --permanent-on-stderr "$PUSH_PERMANENT_ERRORS" --label "git push $1" -- \
+    git push origin "$1"
+}
+
 # Self-publish guard. `private: true` marks a package that must never reach the
 # registry (npm itself refuses to publish it); for this flow it also means "this
 # repo is not a versioned npm app", so skip the whole release. This is the sole
@@ -305,7 +318,7 @@ else
   git commit -m "docs: release $NEW_VERSION [skip ci]"
   # Push to the default branch explicitly so this works whether actions/checkout
   # left us on a branch or in detached HEAD state.
-  if ! retry_cmd 4 2 git push origin "HEAD:$DEFAULT_BRANCH"; then
+  if ! push_with_retry "HEAD:$DEFAULT_BRANCH"; then
     log "⚠️ Failed to push release-docs update. Release was published; docs can be updated manually."
     RELEASE_DOCS_PUSH_FAILED=1
   fi
@@ -326,7 +339,7 @@ git tag "v$NEW_VERSION"
 # Fail loudly if the tag never lands: the tag is what stops the next run from
 # re-analyzing these commits (re-drafting the changelog, re-pushing release
 # docs), so a silent failure here would quietly corrupt the next release.
-if ! retry_cmd 4 2 git push origin "v$NEW_VERSION"; then
+if ! push_with_retry "v$NEW_VERSION"; then
   log "Error: failed to push tag v$NEW_VERSION after retries. The release is published;"
   log "       push the tag manually so the next run does not re-analyze these commits."
   exit 1
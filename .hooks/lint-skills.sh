@@ -12,75 +12,182 @@
 # Skills must use directory format: .claude/skills/<name>/SKILL.md
 # Flat files (.claude/skills/<name>.md) are rejected.
 #
+# With --manifest, every skill under .claude/skills/ is linted (file arguments
+# are ignored) and .claude/skills-manifest.json is regenerated from the same
+# parse: one entry per skill with name, description, path, git blob hash and
+# whether it has an Examples section. Session tooling reads that index instead
+# of walking and parsing each SKILL.md. The file is only rewritten when its
+# content changes; inside a git hook (GIT_INDEX_FILE set) it is also staged,
+# and in CI `pre-commit run --all-files` fails on a stale copy.
+#
 # Usage: lint-skills.sh [files...]
+#        lint-skills.sh --manifest
 
 set -euo pipefail
 
-errors=0
+# Opt-in timing telemetry (HOOK_TELEMETRY=1); see .hooks/telemetry.bash.
+if [[ "${HOOK_TELEMETRY:-0}" == "1" && "${HOOK_TELEMETRY_ACTIVE:-}" != "$0" ]]; then
+  # shellcheck source=.hooks/telemetry.bash disable=SC1091
+  source "$(dirname "${BASH_SOURCE[0]}")/telemetry.bash"
+  telemetry_wrap lint-skills pre-commit "$@"
+fi
 
-for file in "$@"; do
-  # Skip if not under .claude/skills/
-  [[ "$file" != *".claude/skills/"* ]] && continue
+MANIFEST=".claude/skills-manifest.json"
+records=""
+if [[ "${1:-}" == "--manifest" ]]; then
+  shopt -s nullglob
+  set -- .claude/skills/*.md .claude/skills/*/SKILL.md
+  shopt -u nullglob
+  records=$(mktemp)
+  trap 'rm -f "$records"' EXIT
+fi
 
-  basename_file=$(basename "$file")
-  grandparent=$(basename "$(dirname "$(dirname "$file")")")
+# All files are linted by one awk process: paths are classified and every
+# SKILL.md is read in a single pass (getline), so cost scales with the total
+# bytes of the skill files rather than a fixed fan-out of processes per file.
+# Diagnostics are emitted in argument order. When RECORDS is set, each skill
+# with closed frontmatter also gets a "path<TAB>name<TAB>description<TAB>
+# has_examples" line there for the manifest.
+status=0
+# shellcheck disable=SC2016  # awk program, not shell
+awk -v records="$records" '
+# One ERROR line per problem; any error fails the run.
+function report_error(file, msg) {
+  print "ERROR: " file " " msg
+  errors++
+}
 
-  # Reject flat files directly in .claude/skills/
-  dirname_file=$(basename "$(dirname "$file")")
-  if [[ "$dirname_file" == "skills" && "$basename_file" == *.md ]]; then
-    echo "ERROR: $file uses flat file format — convert to .claude/skills/$(basename "$file" .md)/SKILL.md" >&2
-    errors=$((errors + 1))
-    continue
-  fi
+# Frontmatter value of a "key:" line: whitespace trimmed, one layer of
+# matching quotes removed, YAML block-scalar indicators (> | >- ...) dropped.
+function yaml_value(line, v) {
+  v = line
+  sub(/^[^:]*:[ \t]*/, "", v)
+  sub(/[ \t]+$/, "", v)
+  if (v ~ /^[>|][-+]?$/) return ""
+  if (v ~ /^".*"$/ || v ~ /^\047.*\047$/) v = substr(v, 2, length(v) - 2)
+  return v
+}
 
-  # Only validate SKILL.md entrypoints; skip supporting files
-  [[ "$grandparent" != "skills" || "$basename_file" != "SKILL.md" ]] && continue
+# Frontmatter is the lines between the first two "---" lines; the body is
+# everything after the second. Extra parameters are awk locals.
+function lint_skill(file, line, n, has_name, has_desc, in_desc, periods, has_examples, t, name, desc, in_value) {
+  if ((getline line <file) <= 0 || line != "---") {
+    close(file)
+    report_error(file, "missing YAML frontmatter (must start with ---)")
+    return
+  }
+  n = 1
+  while ((getline line <file) > 0) {
+    if (line == "---") {
+      n++
+      continue
+    }
+    if (n == 1) {
+      if (line ~ /^name:/) {
+        has_name = 1
+        name = yaml_value(line)
+      }
+      # The manifest description is the first description: value plus any
+      # indented continuation lines, folded onto one line.
+      if (in_value && line ~ /^[ \t]/) {
+        t = line
+        sub(/^[ \t]+/, "", t)
+        desc = desc (desc == "" ? "" : " ") t
+      } else {
+        in_value = 0
+      }
+      if (line ~ /^description:/ && !has_desc) {
+        has_desc = 1
+        desc = yaml_value(line)
+        in_value = 1
+      }
+      # Same span as `sed -n "/^description:/,/^[a-z]/p"`: starts at a
+      # description: line and runs through the next line starting with a
+      # lowercase letter (inclusive), then may start again.
+      if (in_desc) {
+        t = line
+        periods += gsub(/\./, "", t)
+        if (line ~ /^[a-z]/) in_desc = 0
+      } else if (line ~ /^description:/) {
+        t = line
+        periods += gsub(/\./, "", t)
+        in_desc = 1
+      }
+    } else if (line ~ /^## Examples/) {
+      has_examples = 1
+    }
+  }
+  close(file)
 
-  # Check for YAML frontmatter opening delimiter
-  if ! head -1 "$file" | grep -q '^---$'; then
-    echo "ERROR: $file missing YAML frontmatter (must start with ---)" >&2
-    errors=$((errors + 1))
-    continue
-  fi
+  if (n < 2) {
+    report_error(file, "missing closing '\''---'\'' YAML frontmatter delimiter")
+    return
+  }
+  if (records != "") {
+    gsub(/\t/, " ", name)
+    gsub(/\t/, " ", desc)
+    print file "\t" name "\t" desc "\t" (has_examples ? 1 : 0) >records
+  }
+  if (!has_name) report_error(file, "missing '\''name:'\'' in frontmatter")
+  if (!has_desc) report_error(file, "missing '\''description:'\'' in frontmatter")
+  if (periods < 2) {
+    report_error(file, "description too short — use 2-3 sentences with specific activation triggers")
+  }
+  # Warn (but do not fail) if the Examples section is missing.
+  if (!has_examples) {
+    print "WARN: " file " missing '\''## Examples'\'' section — consider adding 2-3 real input/output examples"
+  }
+}
 
-  # Check for YAML frontmatter closing delimiter
-  if ! awk '/^---$/{n++} END{exit (n<2)}' "$file"; then
-    echo "ERROR: $file missing closing '---' YAML frontmatter delimiter" >&2
-    errors=$((errors + 1))
-    continue
-  fi
+BEGIN {
+  errors = 0
+  for (i = 1; i < ARGC; i++) {
+    file = ARGV[i]
+    # Skip if not under .claude/skills/
+    if (index(file, ".claude/skills/") == 0) continue
 
-  # Extract frontmatter (between first and second ---), filtering YAML comments
-  frontmatter=$(awk '/^---$/{n++; next} n==1' "$file" | grep -v '^#')
+    k = split(file, parts, "/")
+    base = parts[k]
+    parent = k > 1 ? parts[k - 1] : "."
+    grandparent = k > 2 ? parts[k - 2] : "."
 
-  # Check frontmatter has name field
-  if ! echo "$frontmatter" | grep -q '^name:'; then
-    echo "ERROR: $file missing 'name:' in frontmatter" >&2
-    errors=$((errors + 1))
-  fi
+    # Reject flat files directly in .claude/skills/
+    if (parent == "skills" && base ~ /\.md$/) {
+      name = base
+      if (name != ".md") sub(/\.md$/, "", name)
+      report_error(file, "uses flat file format — convert to .claude/skills/" name "/SKILL.md")
+      continue
+    }
 
-  # Check frontmatter has description field
-  if ! echo "$frontmatter" | grep -q '^description:'; then
-    echo "ERROR: $file missing 'description:' in frontmatter" >&2
-    errors=$((errors + 1))
-  fi
+    # Only validate SKILL.md entrypoints; skip supporting files
+    if (grandparent != "skills" || base != "SKILL.md") continue
 
-  # Check description is multi-sentence (at least 2 periods).
-  # Extract description from frontmatter only (not body content).
-  # `tr -dc` strips everything except '.', so a description with zero periods
-  # still produces an empty (not failing) result — required under `pipefail`.
-  desc_block=$(awk '/^---$/{n++; next} n==1' "$file" | sed -n '/^description:/,/^[a-z]/p')
-  periods=$(printf '%s' "$desc_block" | tr -dc '.')
-  if [[ "${#periods}" -lt 2 ]]; then
-    echo "ERROR: $file description too short — use 2-3 sentences with specific activation triggers" >&2
-    errors=$((errors + 1))
-  fi
+    lint_skill(file)
+  }
+  exit errors > 0
+}
+' "$@" >&2 || status=$?
 
-  # Warn (but don't fail) if Examples section is missing
-  body=$(awk '/^---$/{n++; next} n>=2' "$file")
-  if ! echo "$body" | grep -q '^## Examples'; then
-    echo "WARN: $file missing '## Examples' section — consider adding 2-3 real input/output examples" >&2
+if [[ -n "$records" ]]; then
+  # One hash-object call covers every skill; its OIDs line up with RECORDS.
+  mapfile -t paths < <(cut -f1 "$records")
+  new_manifest=$(
+    if [[ ${#paths[@]} -gt 0 ]]; then
+      paste "$records" <(git hash-object -- "${paths[@]}")
+    fi | jq -R -s '
+      split("\n") | map(select(length > 0) | split("\t")
+        | {name: .[1], description: .[2], path: .[0], hash: .[4], has_examples: (.[3] == "1")})
+      | {version: 1, skills: sort_by(.path)}'
+  )
+  if [[ ! -f "$MANIFEST" ]] || [[ "$(<"$MANIFEST")" != "$new_manifest" ]]; then
+    mkdir -p "${MANIFEST%/*}"
+    printf '%s\n' "$new_manifest" >"$MANIFEST.tmp.$$"
+    mv "$MANIFEST.tmp.$$" "$MANIFEST"
+    echo "lint-skills: updated $MANIFEST" >&2
+  fi
+  if [[ -n "${GIT_INDEX_FILE:-}" ]]; then
+    git add -- "$MANIFEST"
   fi
-done
+fi
 
-[[ "$errors" -gt 0 ]] && exit 1 || exit 0
+exit "$status"
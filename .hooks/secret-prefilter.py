@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Block commits whose staged content contains a likely secret.
+
+A local, fast subset of the gitleaks rules CI runs (see
+.github/workflows/gitleaks.yaml), so a leaked key is caught before it is
+pushed rather than after.
+
+Like gitleaks, each rule carries keywords, and only rules with a keyword in
+the (lower-cased) blob run their regexes, which are compiled on first use.
+Staged blob sizes come from one `git cat-file --batch-check`, and only blobs
+within SECRET_PREFILTER_MAX_BYTES (default 1 MiB) are then read, through one
+`git cat-file --batch`, so a large staged file is never loaded. Symlinks,
+submodules and binaries (a NUL byte in the first 8000 bytes, git's own test)
+are skipped too. A line containing `gitleaks:allow` is ignored,
+as gitleaks does.
+
+Usage: secret-prefilter.py            (scans the index; run from the hook)
+Exit status: 1 if anything matched, else 0.
+"""
+
+import functools
+import os
+import re
+import subprocess
+import sys
+from typing import NamedTuple
+
+
+class Rule(NamedTuple):
+    id: str
+    keywords: tuple[str, ...]
+    pattern: str
+    flags: int = 0
+
+
+@functools.cache
+def compiled(r: Rule) -> re.Pattern[bytes]:
+    return re.compile(r.pattern.encode(), r.flags)
+
+
+# Ported from gitleaks' default config (ids and keywords kept) for the
+# providers most likely to show up in this template's projects. Rules that
+# depend on entropy scoring (generic-api-key) stay CI-only.
+RULES = [
+    Rule(
+        "aws-access-token",
+        ("a3t", "akia", "asia", "abia", "acca"),
+        r"\b(?:A3T[A-Z0-9]|AKIA|ASIA|ABIA|ACCA)[A-Z2-7]{16}\b",
+    ),
+    Rule("github-pat", ("ghp_",), r"ghp_[0-9a-zA-Z]{36}"),
+    Rule("github-fine-grained-pat", ("github_pat_",), r"github_pat_\w{82}"),
+    Rule("github-oauth", ("gho_",), r"gho_[0-9a-zA-Z]{36}"),
+    Rule("github-app-token", ("ghu_", "ghs_"), r"(?:ghu|ghs)_[0-9a-zA-Z]{36}"),
+    Rule("github-refresh-token", ("ghr_",), r"ghr_[0-9a-zA-Z]{36}"),
+    Rule("gitlab-pat", ("glpat-",), r"glpat-[\w-]{20}"),
+    Rule("slack-bot-token", ("xoxb",), r"xoxb-[0-9]{10,13}-[0-9]{10,13}[a-zA-Z0-9-]*"),
+    Rule(
+        "slack-user-token",
+        ("xoxp-", "xoxe-"),
+        r"xox[pe](?:-[0-9]{10,13}){3}-[a-zA-Z0-9-]{28,34}",
+    ),
+    Rule(
+        "slack-webhook-url",
+        ("hooks.slack.com",),
+        r"hooks\.slack\.com/(?:services|workflows|triggers)/[A-Za-z0-9+/]{43,56}",
+    ),
+    Rule(
+        "private-key",
+        ("-----begin",),
+        r"-----BEGIN[ A-Z0-9_-]{0,100}PRIVATE KEY(?: BLOCK)?-----[\s\S-]{64,}?KEY(?: BLOCK)?-----",
+        re.IGNORECASE,
+    ),
+    Rule(
+        "anthropic-api-key",
+        ("sk-ant-api03",),
+        r"\bsk-ant-api03-[a-zA-Z0-9_\-]{93}AA\b",
+    ),
+    Rule(
+        "anthropic-admin-api-key",
+        ("sk-ant-admin01",),
+        r"\bsk-ant-admin01-[a-zA-Z0-9_\-]{93}AA\b",
+    ),
+    Rule(
+        "openai-api-key",
+        ("t3blbkfj",),
+        r"\bsk-(?:proj|svcacct|admin)-[A-Za-z0-9_-]{20,}T3BlbkFJ[A-Za-z0-9_-]{20,}"
+        r"|\bsk-[a-zA-Z0-9]{20}T3BlbkFJ[a-zA-Z0-9]{20}",
+    ),
+    Rule(
+        "stripe-access-token",
+        ("sk_test", "sk_live", "sk_prod", "rk_test", "rk_live", "rk_prod"),
+        r"\b(?:sk|rk)_(?:test|live|prod)_[a-zA-Z0-9]{10,99}\b",
+    ),
+    Rule("npm-access-token", ("npm_",), r"\bnpm_[a-z0-9]{36}\b", re.IGNORECASE),
+    Rule(
+        "pypi-upload-token",
+        ("pypi-ageichlwas5vcmc",),
+        r"pypi-AgEIcHlwaS5vcmc[\w-]{50,1000}",
+    ),
+    Rule("gcp-api-key", ("aiza",), r"\bAIza[\w-]{35}\b"),
+    Rule("sendgrid-api-token", ("sg.",), r"\bSG\.[a-zA-Z0-9=_\-.]{66}\b"),
+    Rule(
+        "jwt",
+        ("ey",),
+        r"\bey[a-zA-Z0-9]{17,}\.ey[a-zA-Z0-9/\\_-]{17,}\.(?:[a-zA-Z0-9/\\_-]{10,}={0,2})?",
+    ),
+]
+
+KEYWORDS: dict[bytes, list[Rule]] = {}
+for _rule in RULES:
+    for _keyword in _rule.keywords:
+        KEYWORDS.setdefault(_keyword.encode(), []).append(_rule)
+
+ALLOW_MARKER = b"gitleaks:allow"
+BINARY_SNIFF = 8000
+SKIP_MODES = {"120000", "160000"}  # symlink target, submodule commit
+
+
+def git(*args: str, stdin: bytes | None = None) -> bytes:
+    return subprocess.run(
+        ["git", *args], input=stdin, capture_output=True, check=True
+    ).stdout
+
+
+def staged_blobs() -> list[tuple[str, str]]:
+    """(path, blob id) for every added or modified file in the index."""
+    try:
+        base = git("rev-parse", "--verify", "--quiet", "HEAD").strip().decode()
+    except subprocess.CalledProcessError:
+        base = git("hash-object", "-t", "tree", "/dev/null").strip().decode()
+    raw = git(
+        "diff-index", "--cached", "-z", "--no-renames", "--diff-filter=ACMT", base
+    )
+    fields = raw.split(b"\0")
+    blobs = []
+    for meta, path in zip(fields[0::2], fields[1::2], strict=False):
+        _, new_mode, _, new_id, _ = meta.decode().split(" ")
+        # An all-zero id is an intent-to-add entry with no content yet.
+        if new_mode not in SKIP_MODES and new_id.strip("0"):
+            blobs.append((path.decode(errors="replace"), new_id))
+    return blobs
+
+
+def blob_sizes(ids: list[str]) -> list[int]:
+    """Sizes of *ids*, in order, from one `git cat-file --batch-check`."""
+    stdin = "".join(f"{i}\n" for i in ids).encode()
+    out = git("cat-file", "--batch-check=%(objectsize)", stdin=stdin)
+    return [int(size) for size in out.split()]
+
+
+def read_blobs(ids: list[str]) -> list[bytes]:
+    """Contents of *ids*, in order, from one `git cat-file --batch`."""
+    out = git("cat-file", "--batch", stdin="".join(f"{i}\n" for i in ids).encode())
+    contents, pos = [], 0
+    for _ in ids:
+        header_end = out.index(b"\n", pos)
+        size = int(out[pos:header_end].rsplit(b" ", 1)[1])
+        contents.append(out[header_end + 1 : header_end + 1 + size])
+        pos = header_end + 1 + size + 1
+    return contents
+
+
+def scan(data: bytes) -> list[tuple[int, str, bytes]]:
+    """(line number, rule id, match) for every finding in *data*."""
+    # One C-level substring search per keyword beats a regex alternation (and
+    # a pure-Python multi-pattern automaton) at this keyword count.
+    lowered = data.lower()
+    rules = {r for k, rs in KEYWORDS.items() if k in lowered for r in rs}
+    findings = []
+    for r in sorted(rules, key=RULES.index):
+        for match in compiled(r).finditer(data):
+            line_start = data.rfind(b"\n", 0, match.start()) + 1
+            line_end = data.find(b"\n", match.end())
+            if ALLOW_MARKER in data[line_start : None if line_end < 0 else line_end]:
+                continue
+            line = data.count(b"\n", 0, match.start()) + 1
+            findings.append((line, r.id, match.group()))
+    return findings
+
+
+def redact(secret: bytes) -> str:
+    text = secret.decode(errors="replace").splitlines()[0]
+    return text[:4] + "…" if len(text) > 8 else "…"
+
+
+def main() -> int:
+    max_bytes = int(os.environ.get("SECRET_PREFILTER_MAX_BYTES", str(1 << 20)))
+    blobs = staged_blobs()
+    if not blobs:
+        return 0
+    sizes = blob_sizes([b for _, b in blobs])
+    blobs = [blob for blob, size in zip(blobs, sizes, strict=True) if size <= max_bytes]
+    found = False
+    for (path, _), data in zip(blobs, read_blobs([b for _, b in blobs]), strict=True):
+        if b"\0" in data[:BINARY_SNIFF]:
+            continue
+        for line, rule_id, secret in scan(data):
+            print(f"{path}:{line}: {rule_id} ({redact(secret)})", file=sys.stderr)
+            found = True
+    if found:
+        print(
+            "secret-prefilter: possible secrets staged (see above). Remove them, or\n"
+            "add a `gitleaks:allow` comment on the line if it is a false positive.",
+            file=sys.stderr,
+        )
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
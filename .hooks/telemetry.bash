@@ -0,0 +1,64 @@
+# shellcheck shell=bash
+# Opt-in timing telemetry for hooks; sourced into strict-mode (set -euo
+# pipefail) callers; do not re-set shell options.
+#
+# A hook wraps itself by re-running its own script under a timer, so its exit
+# paths and traps stay untouched. Enabled only when HOOK_TELEMETRY=1, and
+# guarded at the call site so a disabled hook pays nothing:
+#
+#   if [[ "${HOOK_TELEMETRY:-0}" == "1" && "${HOOK_TELEMETRY_ACTIVE:-}" != "$0" ]]; then
+#     # shellcheck source=.hooks/telemetry.bash disable=SC1091
+#     source "$(dirname "${BASH_SOURCE[0]}")/telemetry.bash"
+#     telemetry_wrap NAME PHASE "$@"
+#   fi
+#
+# PHASE is the git hook or Claude Code hook event the run belongs to (e.g.
+# lint-skills runs in "pre-commit", a tool guard in "PreToolUse"). Each run
+# appends one JSON line:
+#   {"ts":"2026-01-02T03:04:05Z","hook":"pre-commit","phase":"pre-commit",
+#    "wall_ms":812,"exit":0,"staged_files":3}
+# Summarize with .github/scripts/hook-telemetry-report.sh.
+#
+# Inputs (env):
+#   HOOK_TELEMETRY        1 to record runs (default: off)
+#   HOOK_TELEMETRY_FILE   Log path (default: $GIT_DIR/hook-telemetry.jsonl)
+
+# _telemetry_now — set _telemetry_us to the current time in microseconds.
+# Bash 5 has EPOCHREALTIME; older shells (macOS /bin/bash) fall back to date.
+_telemetry_now() {
+  if [[ -n "${EPOCHREALTIME:-}" ]]; then
+    _telemetry_us="${EPOCHREALTIME/[.,]/}"
+  else
+    _telemetry_us="$(date +%s)000000"
+  fi
+}
+
+# _telemetry_json_string VALUE — VALUE with JSON string escapes for \ and ".
+_telemetry_json_string() {
+  local value="${1//\\/\\\\}"
+  printf '%s' "${value//\"/\\\"}"
+}
+
+# telemetry_wrap NAME PHASE ARGS... — run the calling script again with ARGS,
+# append a timing record, and exit with the script's status. Never returns
+# unless there is nowhere to write the log, in which case the caller simply
+# continues untimed.
+telemetry_wrap() {
+  local name="$1" phase="$2" log start rc=0 staged
+  shift 2
+  log="${HOOK_TELEMETRY_FILE:-$(git rev-parse --git-path hook-telemetry.jsonl 2>/dev/null || true)}"
+  [[ -n "$log" ]] || return 0
+
+  _telemetry_now
+  start="$_telemetry_us"
+  HOOK_TELEMETRY_ACTIVE="$0" "$BASH" "$0" "$@" || rc=$?
+  _telemetry_now
+
+  staged=$(git diff --cached --name-only 2>/dev/null | wc -l || true)
+  printf '{"ts":"%s","hook":"%s","phase":"%s","wall_ms":%d,"exit":%d,"staged_files":%d}\n' \
+    "$(date -u +%Y-%m-%dT%H:%M:%SZ)" \
+    "$(_telemetry_json_string "$name")" "$(_telemetry_json_string "$phase")" \
+    $(((_telemetry_us - start) / 1000)) "$rc" $((staged)) \
+    >>"$log" 2>/dev/null || true
+  exit "$rc"
+}
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the scripts that run on every commit or push.
+
+Each benchmark builds a synthetic fixture once per scale (hooks and a
+settings.json, a skills tree, a large git index, a long commit range, a
+multi-MB changelog), then runs the real script against it: WARMUP untimed
+runs, then REPEAT timed ones. Anything a run mutates is reset between runs,
+outside the timer. Results are written as JSON and compared with a stored
+baseline; a benchmark regresses when its median is more than THRESHOLD
+percent over the baseline median AND at least MIN_DELTA_MS slower, so noise on
+millisecond-scale runs doesn't trip it. Everything runs offline.
+
+Baselines are only comparable on the machine that recorded them. Re-record
+with --update-baseline after an intended change, or on new hardware.
+
+Usage: benchmarks/run.py [--scale small|medium|large]... [--only NAME]...
+         [--warmup N] [--repeat N] [--output FILE] [--baseline FILE]
+         [--threshold PERCENT] [--min-delta-ms MS] [--update-baseline]
+Exit status: 1 if any benchmark regressed, else 0.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS = REPO_ROOT / ".github" / "scripts"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+SCALES = ("small", "medium", "large")
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # Fixture size per scale, in `unit`s.
+    sizes: dict[str, int]
+    unit: str
+    # build(dir, size) creates the fixture in an empty dir.
+    build: Callable[[Path, int], None]
+    command: list[str]
+    # reset(dir) runs before every run, untimed.
+    reset: Callable[[Path], None] | None = None
+    env: dict[str, str] = {}
+
+
+def git(cwd: Path, *args: str, stdin: bytes | None = None) -> None:
+    subprocess.run(
+        ["git", *args], cwd=cwd, input=stdin, check=True, capture_output=True
+    )
+
+
+def git_init(path: Path) -> None:
+    git(path, "-c", "init.defaultBranch=main", "init", "-q")
+
+
+# --- validate-config.sh: N hooks, half bash, half python, all in settings.json
+
+
+HOOK_SH = """\
+#!/usr/bin/env bash
+set -euo pipefail
+input=$(cat)
+tool=$(jq -r '.tool_name // empty' <<<"$input")
+case "$tool" in
+Bash | Edit | Write)
+  for arg in "$@"; do
+    if [[ "$arg" == --strict ]]; then
+      echo "hook {n}: strict mode" >&2
+    fi
+  done
+  ;;
+*) exit 0 ;;
+esac
+"""
+
+HOOK_PY = """\
+#!/usr/bin/env python3
+import json
+import sys
+
+
+def main() -> int:
+    event = json.load(sys.stdin)
+    if event.get("tool_name") not in ("Bash", "Edit", "Write"):
+        return 0
+    print("hook {n}:", event.get("tool_input", {{}}), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+"""
+
+
+def build_hooks(root: Path, count: int) -> None:
+    git_init(root)
+    hooks = root / ".claude" / "hooks"
+    hooks.mkdir(parents=True)
+    (root / ".hooks").mkdir()
+    safe_launch = hooks / "safe-launch.sh"
+    safe_launch.write_text(HOOK_SH.format(n="safe-launch"))
+    safe_launch.chmod(0o755)
+    pre, post = [], []
+    for n in range(count):
+        directory = hooks if n % 4 else root / ".hooks"
+        name = f"hook-{n}.py" if n % 2 else f"hook-{n}.sh"
+        hook = directory / name
+        hook.write_text((HOOK_PY if n % 2 else HOOK_SH).format(n=n))
+        hook.chmod(0o755)
+        rel = hook.relative_to(root)
+        if n % 3 == 0:
+            command = f'"$CLAUDE_PROJECT_DIR"/.claude/hooks/safe-launch.sh "$CLAUDE_PROJECT_DIR"/{rel}'
+            pre.append({"type": "command", "command": command})
+        else:
+            post.append(
+                {"type": "command", "command": f"$CLAUDE_PROJECT_DIR/{rel} --strict"}
+            )
+    settings = {
+        "hooks": {
+            "PreToolUse": [{"matcher": "Bash", "hooks": pre}],
+            "PostToolUse": [{"matcher": "Edit|Write", "hooks": post}],
+        }
+    }
+    (root / ".claude" / "settings.json").write_text(json.dumps(settings, indent=2))
+
+
+def clear_syntax_cache(root: Path) -> None:
+    shutil.rmtree(root / ".git" / "validate-config", ignore_errors=True)
+
+
+# --- lint-skills.sh --manifest: N skill directories
+
+
+def build_skills(root: Path, count: int) -> None:
+    git_init(root)
+    for n in range(count):
+        skill = root / ".claude" / "skills" / f"skill-{n:04d}"
+        skill.mkdir(parents=True)
+        steps = "\n".join(f"{i}. Step {i} of workflow {n}." for i in range(1, 21))
+        (skill / "SKILL.md").write_text(
+            f"---\nname: skill-{n:04d}\n"
+            f"description: Handles workflow {n} end to end. Use when the user "
+            f"asks about workflow {n} or its outputs.\n---\n\n"
+            f"# Skill {n}\n\n{steps}\n\n## Examples\n\n"
+            f"Input: run workflow {n}\nOutput: workflow {n} finished.\n"
+        )
+        (skill / "reference.md").write_text(f"Notes for workflow {n}.\n" * 20)
+
+
+# --- check-symlinks.sh: an index of N entries, 1% of them relative symlinks
+
+
+def hash_blob(root: Path, content: bytes) -> str:
+    return (
+        subprocess.run(
+            ["git", "hash-object", "-w", "--stdin"],
+            cwd=root,
+            input=content,
+            check=True,
+            capture_output=True,
+        )
+        .stdout.decode()
+        .strip()
+    )
+
+
+def build_index(root: Path, count: int) -> None:
+    git_init(root)
+    blob = hash_blob(root, b"content\n")
+    links: dict[str, str] = {}
+    entries = []
+    for n in range(count):
+        path = f"src/pkg{n // 500:03d}/mod{n:05d}.txt"
+        if n % 100 == 99:
+            target = f"../pkg000/mod{n % 500:05d}.txt"
+            if target not in links:
+                links[target] = hash_blob(root, target.encode())
+            entries.append(f"120000 {links[target]}\t{path}.link")
+        else:
+            entries.append(f"100644 {blob}\t{path}")
+    git(root, "update-index", "--index-info", stdin="\n".join(entries).encode() + b"\n")
+
+
+# --- script-configured.sh: a package.json with N scripts
+
+
+def build_package_json(root: Path, count: int) -> None:
+    scripts = {
+        f"task:{n}": f"node scripts/task-{n}.js --flag {n}" for n in range(count)
+    }
+    scripts["test"] = "vitest run"
+    (root / "package.json").write_text(
+        json.dumps({"name": "bench", "scripts": scripts}, indent=2)
+    )
+
+
+# --- determine_bump (version-bump.sh): a tag..HEAD range of N commits
+
+# Sources determine_bump itself out of version-bump.sh, so the benchmark tracks
+# the real function, and feeds it the same git log output the script does.
+DETERMINE_BUMP = r"""
+set -euo pipefail
+log() { echo "$@" >&2; }
+source <(sed -n '/^determine_bump() {/,/^}/p' "$1")
+subjects=$(git log v0.0.0..HEAD --pretty=format:%s --no-merges)
+messages=$(git log v0.0.0..HEAD --pretty=format:%B --no-merges)
+determine_bump "$subjects" "$messages"
+"""
+
+
+def build_commits(root: Path, count: int) -> None:
+    git_init(root)
+    kinds = ("fix", "chore(deps)", "docs", "refactor(core)", "test")
+    stream = []
+    for n in range(count + 1):
+        # The first commit is the tag; none of the range is feat or breaking,
+        # so determine_bump scans every pattern to the end.
+        message = (
+            f"{kinds[n % len(kinds)]}: change number {n}\n\n"
+            f"Body line one for change {n}.\nBody line two for change {n}.\n"
+        ).encode()
+        stream.append(b"commit refs/heads/main\n")
+        stream.append(
+            f"committer Bench <bench@example.com> {1700000000 + n} +0000\n".encode()
+        )
+        stream.append(b"data %d\n%s\n" % (len(message), message))
+        if n == 0:
+            stream.append(b"reset refs/tags/v0.0.0\nfrom refs/heads/main\n\n")
+    git(root, "fast-import", "--quiet", stdin=b"".join(stream))
+
+
+# --- promote-changelog.mjs: a CHANGELOG.md of N KiB
+
+
+def build_changelog(root: Path, kib: int) -> None:
+    parts = ["# Changelog\n\n## Unreleased\n\n### Added\n\n- Pending entry.\n"]
+    size, version = 0, 0
+    while size < kib * 1024:
+        section = f"\n## [1.{version}.0] - 2025-01-01\n\n### Fixed\n\n" + "".join(
+            f"- Fix number {i} in release 1.{version}.0, with a line of detail.\n"
+            for i in range(30)
+        )
+        parts.append(section)
+        size += len(section)
+        version += 1
+    (root / "CHANGELOG.md.orig").write_text("".join(parts))
+
+
+def restore_changelog(root: Path) -> None:
+    shutil.copyfile(root / "CHANGELOG.md.orig", root / "CHANGELOG.md")
+
+
+BENCHMARKS = [
+    Benchmark(
+        "validate-config-cold",
+        {"small": 20, "medium": 100, "large": 400},
+        "hooks",
+        build_hooks,
+        ["bash", str(SCRIPTS / "validate-config.sh")],
+        reset=clear_syntax_cache,
+    ),
+    Benchmark(
+        "validate-config-warm",
+        {"small": 20, "medium": 100, "large": 400},
+        "hooks",
+        build_hooks,
+        ["bash", str(SCRIPTS / "validate-config.sh")],
+    ),
+    Benchmark(
+        "lint-skills",
+        {"small": 20, "medium": 200, "large": 800},
+        "skills",
+        build_skills,
+        ["bash", str(REPO_ROOT / ".hooks" / "lint-skills.sh"), "--manifest"],
+    ),
+    Benchmark(
+        "check-symlinks",
+        {"small": 1000, "medium": 10000, "large": 50000},
+        "index entries",
+        build_index,
+        ["bash", str(SCRIPTS / "check-symlinks.sh")],
+    ),
+    Benchmark(
+        "script-configured",
+        {"small": 10, "medium": 1000, "large": 10000},
+        "scripts",
+        build_package_json,
+        ["bash", str(SCRIPTS / "script-configured.sh"), "test"],
+    ),
+    Benchmark(
+        "determine-bump",
+        {"small": 100, "medium": 1000, "large": 10000},
+        "commits",
+        build_commits,
+        [
+            "bash",
+            "-c",
+            DETERMINE_BUMP,
+            "determine-bump",
+            str(SCRIPTS / "version-bump.sh"),
+        ],
+    ),
+    Benchmark(
+        "promote-changelog",
+        {"small": 64, "medium": 1024, "large": 4096},
+        "KiB",
+        build_changelog,
+        ["node", str(SCRIPTS / "promote-changelog.mjs")],
+        reset=restore_changelog,
+        env={
+            "NEW_VERSION": "2.0.0",
+            "RELEASE_DATE": "2026-01-01",
+            "CHANGELOG_SECTION": "### Added\n\n- Benchmarked entry.",
+        },
+    ),
+]
+
+
+def run_env(extra: dict[str, str]) -> dict[str, str]:
+    """The caller's environment minus anything that would change what the
+    scripts do or time (git hook state, BASH_ENV tracing, hook telemetry)."""
+    env = {
+        k: v
+        for k, v in os.environ.items()
+        if not k.startswith("GIT_")
+        and k not in ("BASH_ENV", "BASH_PROFILE", "HOOK_TELEMETRY")
+    }
+    return {**env, **extra}
+
+
+def measure(bench: Benchmark, root: Path, warmup: int, repeat: int) -> list[float]:
+    """Milliseconds for each timed run. A failing run aborts the suite: a
+    fast error is not a meaningful timing."""
+    env = run_env(bench.env)
+    samples = []
+    for i in range(warmup + repeat):
+        if bench.reset:
+            bench.reset(root)
+        start = time.perf_counter()
+        result = subprocess.run(
+            bench.command,
+            cwd=root,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            sys.exit(
+                f"{bench.name}: exited {result.returncode}\n{result.stderr.decode(errors='replace')}"
+            )
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def compare(
+    results: dict[str, dict],
+    baseline: dict[str, dict],
+    threshold: float,
+    min_delta: float,
+) -> list[str]:
+    """Print a results table against the baseline; return the regressed keys."""
+    regressed = []
+    row = "{:<34} {:>8} {:>10} {:>10} {:>8}"
+    print(row.format("benchmark", "size", "median_ms", "base_ms", "change"))
+    for key, result in results.items():
+        median = result["median_ms"]
+        base = baseline.get(key, {}).get("median_ms")
+        if base is None:
+            change = "new"
+        else:
+            change = f"{(median / base - 1) * 100:+.0f}%" if base > 0 else "n/a"
+            if median > base * (1 + threshold / 100) and median - base >= min_delta:
+                regressed.append(key)
+                change += " !"
+        base_text = "-" if base is None else f"{base:.1f}"
+        print(row.format(key, result["size"], f"{median:.1f}", base_text, change))
+    return regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", action="append", choices=SCALES, help="default: all")
+    parser.add_argument("--only", action="append", metavar="NAME", help="default: all")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write this run's results here")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=25, metavar="PERCENT")
+    parser.add_argument("--min-delta-ms", type=float, default=5, metavar="MS")
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="merge this run into the baseline instead of comparing",
+    )
+    args = parser.parse_args()
+
+    names = {b.name for b in BENCHMARKS}
+    unknown = set(args.only or ()) - names
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    selected = [b for b in BENCHMARKS if not args.only or b.name in args.only]
+    scales = [s for s in SCALES if not args.scale or s in args.scale]
+
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="benchmarks-") as work:
+        for bench in selected:
+            for scale in scales:
+                root = Path(work) / f"{bench.name}-{scale}"
+                root.mkdir()
+                size = bench.sizes[scale]
+                bench.build(root, size)
+                samples = measure(bench, root, args.warmup, args.repeat)
+                results[f"{bench.name}/{scale}"] = {
+                    "size": size,
+                    "unit": bench.unit,
+                    "runs": len(samples),
+                    "median_ms": round(statistics.median(samples), 2),
+                    "min_ms": round(min(samples), 2),
+                    "max_ms": round(max(samples), 2),
+                }
+                shutil.rmtree(root)
+
+    document = {
+        "version": 1,
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+
+    baseline: dict[str, dict] = {}
+    if args.baseline.is_file():
+        try:
+            baseline = json.loads(args.baseline.read_text())["results"]
+        except (ValueError, KeyError) as e:
+            print(f"Ignoring unreadable baseline {args.baseline}: {e}", file=sys.stderr)
+
+    if args.update_baseline:
+        document["results"] = {**baseline, **results}
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"Updated {args.baseline} ({len(results)} result(s))")
+        return 0
+
+    regressed = compare(results, baseline, args.threshold, args.min_delta_ms)
+    if regressed:
+        print(
+            f"\n{len(regressed)} benchmark(s) regressed more than {args.threshold:g}% "
+            f"(and {args.min_delta_ms:g} ms) vs {args.baseline}: {', '.join(regressed)}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
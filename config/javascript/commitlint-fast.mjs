@@ -0,0 +1,179 @@
+// Fast path for the commit-msg hook: checks a commit message against the
+// @commitlint/config-conventional rules without loading commitlint itself.
+//
+//   node commitlint-fast.mjs MESSAGE_FILE CONFIG_FILE
+//
+// Exit codes:
+//   0  the message passes every rule — nothing else needs to run
+//   1  a rule is definitely violated; problems are printed commitlint-style
+//   3  undecided — the caller must run the real commitlint. Returned when the
+//      config is anything but a bare `extends: ["@commitlint/config-conventional"]`,
+//      for headers commitlint may ignore (merges, reverts, fixup!, ...), and
+//      for the rules whose edge cases live in the parser (body/footer layout,
+//      long body lines), so this script never accepts what commitlint rejects
+//      and never rejects what it accepts.
+//
+// Self-contained on purpose (node builtins only): it runs before
+// node_modules exists and must start in tens of milliseconds.
+
+import { readFileSync } from "node:fs";
+import { pathToFileURL } from "node:url";
+
+export const DEFER = 3;
+
+const TYPES = [
+  "build",
+  "chore",
+  "ci",
+  "docs",
+  "feat",
+  "fix",
+  "perf",
+  "refactor",
+  "revert",
+  "style",
+  "test",
+];
+const MAX_LENGTH = 100;
+// conventional-changelog-conventionalcommits headerPattern.
+const HEADER_PATTERN = /^(\w*)(?:\((.*)\))?!?: (.*)$/;
+// Headers that @commitlint/is-ignored's default wildcards may skip entirely.
+const MAYBE_IGNORED =
+  /^(Merge|Merged|Revert|revert|Auto|Automatic|Initial commit|amend!|fixup!|squash!|v?\d)/;
+// Footer-ish lines (notes, issue references, trailers): their leading-blank
+// and placement rules depend on the parser, so their presence defers.
+const FOOTER_LIKE =
+  /^(BREAKING[ -]CHANGE|[\w-]+(: | #))|#\d|\b(close[sd]?|fix(e[sd])?|resolve[sd]?)\b/i;
+const SCISSORS = "# ------------------------ >8 ------------------------";
+const CONVENTIONAL_CONFIGS = new Set([
+  'exportdefault{extends:["@commitlint/config-conventional"]};',
+  "exportdefault{extends:['@commitlint/config-conventional']};",
+  'module.exports={extends:["@commitlint/config-conventional"]};',
+  "module.exports={extends:['@commitlint/config-conventional']};",
+]);
+
+/**
+ * True when the config file is exactly the rule set this script implements.
+ * @param {string} source
+ * @returns {boolean}
+ */
+export function isConventionalConfig(source) {
+  const compact = source
+    .replace(/^\s*\/\/.*$/gm, "")
+    .replace(/\s+/g, "")
+    .replace(/,(?=[\]}])/g, "");
+  return CONVENTIONAL_CONFIGS.has(compact.endsWith(";") ? compact : `${compact};`);
+}
+
+/**
+ * Message as commitlint --edit sees it: everything from the scissors line on
+ * is dropped, as are `#` comment lines and trailing blank lines.
+ * @param {string} raw
+ * @returns {string[]}
+ */
+function messageLines(raw) {
+  const lines = [];
+  for (const line of raw.split(/\r?\n/)) {
+    if (line === SCISSORS) break;
+    if (!line.startsWith("#")) lines.push(line);
+  }
+  while (lines.length > 0 && lines[lines.length - 1].trim() === "") lines.pop();
+  return lines;
+}
+
+/**
+ * @commitlint/ensure's case check for "sentence-case". With subject-case set
+ * to never [sentence, start, pascal, upper], sentence-case subsumes the other
+ * three: each of them also leaves the first character upper-cased.
+ * @param {string} subject
+ * @returns {boolean}
+ */
+function isSentenceCase(subject) {
+  const input = subject.replace(/`.*?`|".*?"|'.*?'/g, "").trim();
+  const transformed = input.charAt(0).toUpperCase() + input.slice(1);
+  return transformed === "" || /^\d/.test(transformed) || transformed === input;
+}
+
+/**
+ * Check a raw commit message.
+ * @param {string} raw
+ * @returns {{ verdict: "pass" } | { verdict: "defer" } | { verdict: "fail", header: string, problems: string[] }}
+ */
+export function lintMessage(raw) {
+  const lines = messageLines(raw);
+  const header = lines[0] ?? "";
+  if (header.trim() === "" || MAYBE_IGNORED.test(header)) return { verdict: "defer" };
+
+  const rest = lines.slice(1);
+  if (rest.length > 0 && rest[0] !== "") return { verdict: "defer" }; // body-leading-blank warns
+  if (rest.some((line) => line.length > MAX_LENGTH || FOOTER_LIKE.test(line))) {
+    return { verdict: "defer" };
+  }
+
+  /** @type {string[]} */
+  const problems = [];
+  if (header !== header.trim()) {
+    problems.push("header must not be surrounded by whitespace [header-trim]");
+  }
+  if (header.length > MAX_LENGTH) {
+    problems.push(
+      `header must not be longer than ${MAX_LENGTH} characters, current length is ${header.length} [header-max-length]`,
+    );
+  }
+  const match = HEADER_PATTERN.exec(header);
+  const type = match?.[1] || "";
+  const subject = match?.[3] || "";
+  if (!subject) {
+    problems.push("subject may not be empty [subject-empty]");
+  } else {
+    // Only a cased letter can be "sentence-case"; commitlint accepts subjects
+    // opening with an uncased one (CJK, etc.).
+    if (/^[\p{Lu}\p{Ll}\p{Lt}]/u.test(subject) && isSentenceCase(subject)) {
+      problems.push(
+        "subject must not be sentence-case, start-case, pascal-case, upper-case [subject-case]",
+      );
+    }
+    if (subject.endsWith(".")) {
+      problems.push("subject may not end with full stop [subject-full-stop]");
+    }
+  }
+  if (!type) {
+    problems.push("type may not be empty [type-empty]");
+  } else {
+    if (type !== type.toLowerCase()) problems.push("type must be lower-case [type-case]");
+    if (!TYPES.includes(type)) {
+      problems.push(`type must be one of [${TYPES.join(", ")}] [type-enum]`);
+    }
+  }
+  return problems.length > 0 ? { verdict: "fail", header, problems } : { verdict: "pass" };
+}
+
+function main() {
+  const [messageFile, configFile] = process.argv.slice(2);
+  if (!messageFile || !configFile) {
+    process.stderr.write("usage: commitlint-fast.mjs MESSAGE_FILE CONFIG_FILE\n");
+    return DEFER;
+  }
+  let config;
+  let raw;
+  try {
+    config = readFileSync(configFile, "utf8");
+    raw = readFileSync(messageFile, "utf8");
+  } catch {
+    return DEFER;
+  }
+  if (!isConventionalConfig(config)) return DEFER;
+
+  const result = lintMessage(raw);
+  if (result.verdict === "pass") return 0;
+  if (result.verdict === "defer") return DEFER;
+  const out = [`⧗   input: ${result.header}`, ...result.problems.map((p) => `✖   ${p}`)];
+  out.push("", `✖   found ${result.problems.length} problems, 0 warnings`);
+  out.push("ⓘ   Get help: https://github.com/conventional-changelog/commitlint/#what-is-commitlint");
+  process.stdout.write(`${out.join("\n")}\n\n`);
+  return 1;
+}
+
+if (process.argv[1] && import.meta.url === pathToFileURL(process.argv[1]).href) {
+  process.exitCode = main();
+}
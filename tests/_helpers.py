@@ -4,10 +4,14 @@ Lives in a regular module (not `conftest.py`) so it can be imported directly
 without manipulating `sys.path` or relying on the conftest plugin loader.
 """
 
+import atexit
+import functools
 import os
 import shutil
 import subprocess
+import tempfile
 from pathlib import Path
+from typing import Callable
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
@@ -24,11 +28,13 @@ def git_env() -> dict[str, str]:
     return {**os.environ, **GIT_IDENTITY_ENV}
 
 
-def init_test_repo(path: Path) -> None:
-    """Init a throwaway repo with signing/hooks disabled so fixtures can commit
-    in any environment (including CI runners with enforced commit signing)."""
-    path.mkdir(parents=True, exist_ok=True)
-    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=path, check=True)
+@functools.cache
+def _prototype_repo() -> Path:
+    """An empty, configured repo built once per process (so once per xdist
+    worker); init_test_repo copies its .git instead of re-running git."""
+    root = Path(tempfile.mkdtemp(prefix="test-repo-prototype-"))
+    atexit.register(shutil.rmtree, root, ignore_errors=True)
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=root, check=True)
     for k, v in [
         ("commit.gpgsign", "false"),
         ("tag.gpgsign", "false"),
@@ -36,7 +42,22 @@ def init_test_repo(path: Path) -> None:
         ("user.email", "t@t"),
         ("core.hooksPath", "/dev/null"),
     ]:
-        subprocess.run(["git", "config", "--local", k, v], cwd=path, check=True)
+        subprocess.run(["git", "config", "--local", k, v], cwd=root, check=True)
+    return root
+
+
+def copy_tree(src: Path, dest: Path) -> Path:
+    """Copy a fixture tree into DEST (which may already exist), keeping
+    symlinks as symlinks."""
+    shutil.copytree(src, dest, symlinks=True, dirs_exist_ok=True)
+    return dest
+
+
+def init_test_repo(path: Path) -> None:
+    """Init a throwaway repo with signing/hooks disabled so fixtures can commit
+    in any environment (including CI runners with enforced commit signing)."""
+    path.mkdir(parents=True, exist_ok=True)
+    copy_tree(_prototype_repo() / ".git", path / ".git")
 
 
 def commit_all(repo: Path, message: str = "fixture") -> str:
@@ -59,6 +80,26 @@ def commit_all(repo: Path, message: str = "fixture") -> str:
     return sha.stdout.strip()
 
 
+class RepoCache:
+    """Fixture repos built once per session and copied into each test that
+    needs one. Backed by a session tmp dir, which pytest-xdist gives each
+    worker separately, so no cross-process locking is needed."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def clone(self, name: str, build: Callable[[Path], None], dest: Path) -> Path:
+        """Copy the repo NAME into DEST, running BUILD(path) first if this
+        session hasn't built it yet."""
+        src = self.root / name
+        if not src.exists():
+            staging = self.root / f".{name}.partial"
+            shutil.rmtree(staging, ignore_errors=True)
+            build(staging)
+            staging.rename(src)
+        return copy_tree(src, dest)
+
+
 _SCRIPT_DIRS = [
     REPO_ROOT / ".github" / "scripts",
     REPO_ROOT / ".claude" / "hooks",
@@ -1,28 +1,87 @@
 """Shared pytest fixtures for shell-script tests."""
 
+import os
+import re
 import subprocess
+import sys
 from pathlib import Path
 from typing import Callable, Iterator
 
 import pytest
 
-from tests._helpers import copy_script_to, git_env, init_test_repo
+from tests._helpers import REPO_ROOT, RepoCache, copy_script_to, git_env, init_test_repo
+from tests.fake_github import FakeGitHub
 
 
-@pytest.fixture
-def empty_git_repo(tmp_path: Path) -> Iterator[Path]:
-    """Throwaway git repo with an initial empty commit (so HEAD exists)."""
-    init_test_repo(tmp_path)
+PROFILE_LIB = REPO_ROOT / ".github" / "scripts" / "lib" / "profile.bash"
+
+
+@pytest.fixture(autouse=True)
+def bash_profile(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """With BASH_PROFILE_DIR set, trace every bash script a test starts with
+    an inherited environment into DIR/<test id>.trace (see
+    .github/scripts/lib/profile.bash), for bash-profile-report.sh."""
+    out_dir = os.environ.get("BASH_PROFILE_DIR")
+    if not out_dir:
+        return
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    name = re.sub(r"[^\w.-]+", "_", request.node.nodeid)
+    monkeypatch.setenv("BASH_ENV", str(PROFILE_LIB))
+    monkeypatch.setenv("BASH_PROFILE", str(Path(out_dir) / f"{name}.trace"))
+
+
+@pytest.fixture(scope="session")
+def repo_cache(tmp_path_factory: pytest.TempPathFactory) -> RepoCache:
+    """Session-wide cache of pre-built fixture repos (see RepoCache)."""
+    return RepoCache(tmp_path_factory.mktemp("repo-cache"))
+
+
+def _build_empty_repo(path: Path) -> None:
+    init_test_repo(path)
     subprocess.run(
         ["git", "commit", "--allow-empty", "-q", "-m", "init"],
-        cwd=tmp_path,
+        cwd=path,
         env=git_env(),
         check=True,
     )
-    yield tmp_path
+
+
+@pytest.fixture
+def empty_git_repo(tmp_path: Path, repo_cache: RepoCache) -> Iterator[Path]:
+    """Throwaway git repo with an initial empty commit (so HEAD exists)."""
+    yield repo_cache.clone("empty", _build_empty_repo, tmp_path)
 
 
 @pytest.fixture
 def copy_script() -> Callable[[str, Path], Path]:
     """Return a helper that copies a repo script into a sandbox dir."""
     return copy_script_to
+
+
+@pytest.fixture
+def fake_github() -> Iterator[FakeGitHub]:
+    """A running FakeGitHub server (see tests/fake_github.py)."""
+    with FakeGitHub() as github:
+        yield github
+
+
+@pytest.fixture
+def fake_gh_env(tmp_path: Path, fake_github: FakeGitHub) -> dict[str, str]:
+    """Environment whose `gh` is tests/fake_gh.py, pointed at `fake_github`."""
+    bin_dir = tmp_path / "fake-gh-bin"
+    bin_dir.mkdir()
+    gh = bin_dir / "gh"
+    gh.write_text(
+        f'#!/usr/bin/env bash\nexec "{sys.executable}" "{REPO_ROOT / "tests" / "fake_gh.py"}" "$@"\n'
+    )
+    gh.chmod(0o755)
+    return {
+        **os.environ,
+        "PATH": f"{bin_dir}:{os.environ['PATH']}",
+        "FAKE_GITHUB_URL": fake_github.url,
+        "GH_REPO": "owner/repo",
+        "GH_TOKEN": "fake-token",
+        "GH_API_STATS_FILE": str(tmp_path / "gh-api-stats.tsv"),
+    }
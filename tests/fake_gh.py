@@ -0,0 +1,250 @@
+"""`gh` CLI shim that talks to tests/fake_github.py instead of api.github.com.
+
+Implements the subset of gh the repo's scripts use:
+
+    gh api ENDPOINT [--include] [--paginate] [--jq EXPR] [-X METHOD]
+           [-f key=value] [-F key=value]
+    gh pr list [--state S] [--label L] [--search Q] [--limit N] [--json F] [--jq EXPR]
+    gh pr comment NUMBER --body BODY
+
+Output and exit codes follow gh: the response body on stdout (headers first
+with --include), `gh: <message> (HTTP <status>)` on stderr and exit 1 for
+HTTP errors. `pr list` is served from the REST pulls endpoint rather than
+GraphQL, one request per page. Tests install it as `gh` via a wrapper script
+on PATH (see the `fake_gh_env` fixture).
+
+Environment:
+    FAKE_GITHUB_URL  Base URL of the running FakeGitHub (required)
+    GH_REPO          owner/repo for {owner}/{repo} placeholders and `pr`
+                     subcommands (default: owner/repo)
+"""
+
+import json
+import os
+import subprocess
+import sys
+import urllib.error
+import urllib.request
+from typing import Any
+from urllib.parse import urlencode
+
+PR_FIELDS = {
+    "number": lambda pr: pr["number"],
+    "title": lambda pr: pr.get("title", ""),
+    "url": lambda pr: pr.get("html_url", ""),
+    "state": lambda pr: pr.get("state", "open").upper(),
+    "headRefName": lambda pr: pr.get("head", {}).get("ref", ""),
+    "headRefOid": lambda pr: pr.get("head", {}).get("sha", ""),
+    "author": lambda pr: {"login": pr.get("user", {}).get("login", "")},
+    "labels": lambda pr: [{"name": lbl["name"]} for lbl in pr.get("labels", [])],
+}
+
+
+def base_url() -> str:
+    return os.environ["FAKE_GITHUB_URL"].rstrip("/")
+
+
+def repo() -> str:
+    return os.environ.get("GH_REPO", "owner/repo")
+
+
+def request(
+    method: str, url: str, body: Any = None
+) -> tuple[int, str, list[tuple[str, str]], bytes]:
+    """Return (status, reason, headers, body); HTTP errors are not raised."""
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method)
+    if data is not None:
+        req.add_header("Content-Type", "application/json")
+    try:
+        with urllib.request.urlopen(req) as resp:
+            return resp.status, resp.reason, list(resp.headers.items()), resp.read()
+    except urllib.error.HTTPError as err:
+        return err.code, err.reason, list(err.headers.items()), err.read()
+
+
+def next_link(headers: list[tuple[str, str]]) -> str | None:
+    for name, value in headers:
+        if name.lower() != "link":
+            continue
+        for part in value.split(","):
+            target, _, rel = part.partition(";")
+            if 'rel="next"' in rel:
+                return target.strip().strip("<>")
+    return None
+
+
+def resolve(endpoint: str) -> str:
+    if "://" in endpoint:
+        return endpoint
+    owner, name = repo().split("/", 1)
+    path = endpoint.replace("{owner}", owner).replace("{repo}", name)
+    return f"{base_url()}/{path.lstrip('/')}"
+
+
+def typed(value: str) -> Any:
+    if value in ("true", "false"):
+        return value == "true"
+    if value.isdigit():
+        return int(value)
+    return value
+
+
+def run_jq(expr: str, document: bytes) -> int:
+    out = subprocess.run(["jq", "-r", expr], input=document, capture_output=True)
+    sys.stdout.buffer.write(out.stdout)
+    sys.stderr.buffer.write(out.stderr)
+    return out.returncode
+
+
+def fail(status: int, payload: bytes) -> int:
+    try:
+        message = json.loads(payload).get("message", "error")
+    except (ValueError, AttributeError):
+        message = "error"
+    print(f"gh: {message} (HTTP {status})", file=sys.stderr)
+    return 1
+
+
+def cmd_api(args: list[str]) -> int:
+    endpoint = None
+    method = None
+    include = paginate = False
+    jq_expr = None
+    fields: dict[str, Any] = {}
+    it = iter(args)
+    for arg in it:
+        if arg in ("-i", "--include"):
+            include = True
+        elif arg == "--paginate":
+            paginate = True
+        elif arg in ("-q", "--jq"):
+            jq_expr = next(it)
+        elif arg in ("-X", "--method"):
+            method = next(it)
+        elif arg in ("-f", "--raw-field", "-F", "--field"):
+            key, _, value = next(it).partition("=")
+            fields[key] = value if arg in ("-f", "--raw-field") else typed(value)
+        elif endpoint is None:
+            endpoint = arg
+        else:
+            print(f"fake gh: unsupported argument {arg!r}", file=sys.stderr)
+            return 2
+    assert endpoint is not None, "gh api: endpoint required"
+
+    url = resolve(endpoint)
+    body = None
+    if endpoint == "graphql":
+        query = fields.pop("query", "")
+        body = {"query": query, "variables": fields}
+        method = method or "POST"
+    elif fields and (method or "POST") != "GET":
+        body = fields
+        method = method or "POST"
+    elif fields:
+        url += ("&" if "?" in url else "?") + urlencode(fields)
+    method = method or "GET"
+
+    while url:
+        status, reason, headers, payload = request(method, url, body)
+        if include:
+            head = [f"HTTP/1.1 {status} {reason}"] + [f"{k}: {v}" for k, v in headers]
+            sys.stdout.write("\r\n".join(head) + "\r\n\r\n")
+            sys.stdout.flush()
+        if status >= 400:
+            sys.stdout.buffer.write(payload)
+            return fail(status, payload)
+        if jq_expr is not None:
+            rc = run_jq(jq_expr, payload)
+            if rc:
+                return rc
+        else:
+            sys.stdout.buffer.write(payload)
+            sys.stdout.flush()
+        url = next_link(headers) if paginate else None
+    return 0
+
+
+def cmd_pr_list(args: list[str]) -> int:
+    state, labels, search, limit = "open", [], "", 30
+    fields: list[str] = []
+    jq_expr = None
+    it = iter(args)
+    for arg in it:
+        if arg in ("-s", "--state"):
+            state = next(it)
+        elif arg in ("-l", "--label"):
+            labels.append(next(it))
+        elif arg in ("-S", "--search"):
+            search = next(it)
+        elif arg in ("-L", "--limit"):
+            limit = int(next(it))
+        elif arg == "--json":
+            fields = next(it).split(",")
+        elif arg in ("-q", "--jq"):
+            jq_expr = next(it)
+        else:
+            print(f"fake gh: unsupported argument {arg!r}", file=sys.stderr)
+            return 2
+    author = None
+    for term in search.split():
+        if term.startswith("author:"):
+            author = term.removeprefix("author:").replace("app/", "") + "[bot]"
+
+    url: str | None = f"{base_url()}/repos/{repo()}/pulls?" + urlencode(
+        {"state": state, "per_page": 100}
+    )
+    prs: list[dict] = []
+    while url and len(prs) < limit:
+        status, _, headers, payload = request("GET", url)
+        if status >= 400:
+            return fail(status, payload)
+        for pr in json.loads(payload):
+            names = {lbl["name"] for lbl in pr.get("labels", [])}
+            if any(lbl not in names for lbl in labels):
+                continue
+            if author and pr.get("user", {}).get("login") != author:
+                continue
+            prs.append(pr)
+        url = next_link(headers)
+    rows = [{f: PR_FIELDS[f](pr) for f in fields} for pr in prs[:limit]]
+    document = json.dumps(rows).encode()
+    if jq_expr is not None:
+        return run_jq(jq_expr, document)
+    sys.stdout.buffer.write(document + b"\n")
+    return 0
+
+
+def cmd_pr_comment(args: list[str]) -> int:
+    number, body = None, None
+    it = iter(args)
+    for arg in it:
+        if arg in ("-b", "--body"):
+            body = next(it)
+        elif number is None:
+            number = arg
+    assert number is not None and body is not None, (
+        "gh pr comment: NUMBER and --body required"
+    )
+    status, _, _, payload = request(
+        "POST", f"{base_url()}/repos/{repo()}/issues/{number}/comments", {"body": body}
+    )
+    if status >= 400:
+        return fail(status, payload)
+    print(json.loads(payload).get("html_url", ""))
+    return 0
+
+
+def main(argv: list[str]) -> int:
+    if argv[:1] == ["api"]:
+        return cmd_api(argv[1:])
+    if argv[:2] == ["pr", "list"]:
+        return cmd_pr_list(argv[2:])
+    if argv[:2] == ["pr", "comment"]:
+        return cmd_pr_comment(argv[2:])
+    print(f"fake gh: unsupported command {' '.join(argv[:2])!r}", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
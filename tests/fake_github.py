@@ -0,0 +1,242 @@
+"""Local stand-in for the GitHub REST and GraphQL APIs.
+
+Serves fixture data over HTTP on 127.0.0.1 with GitHub's pagination (page /
+per_page plus Link headers), x-ratelimit-* headers, optional per-request
+latency, and injectable faults, and records every request so tests can assert
+round-trip counts. Pair it with tests/fake_gh.py (a `gh` shim) for the shell
+scripts, or point fetch()-based clients at `FakeGitHub.url` directly.
+
+    with FakeGitHub() as github:
+        github.add_collection("/repos/o/r/pulls", [{"number": 1, ...}])
+        ...run the script with FAKE_GITHUB_URL=github.url...
+        assert github.count("GET", "/repos/o/r/pulls") == 1
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE = 100
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: dict[str, str]
+    body: Any = None
+
+
+@dataclass
+class Fault:
+    status: int
+    headers: dict[str, str] = field(default_factory=dict)
+    body: Any = None
+
+
+class FakeGitHub:
+    """Threaded fake GitHub API server; use as a context manager."""
+
+    def __init__(self, *, latency: float = 0.0, rate_limit: int = 5000) -> None:
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.reset = int(time.time()) + 3600
+        self.collections: dict[str, list[dict]] = {}
+        self.objects: dict[str, Any] = {}
+        # owner/name -> pull request nodes served by GraphQL pullRequests.
+        self.graphql_pull_requests: dict[str, list[dict]] = {}
+        self.requests: list[Request] = []
+        self._faults: dict[str, list[Fault]] = {}
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    # -- fixture setup -----------------------------------------------------
+
+    def add_collection(self, path: str, items: list[dict]) -> None:
+        """Serve ITEMS as a paginated list at PATH; POSTs append to it."""
+        self.collections[path] = list(items)
+
+    def set_object(self, path: str, document: Any) -> None:
+        """Serve DOCUMENT verbatim (no pagination) at PATH."""
+        self.objects[path] = document
+
+    def fail_next(
+        self,
+        path: str,
+        status: int,
+        headers: dict[str, str] | None = None,
+        body: Any = None,
+        times: int = 1,
+    ) -> None:
+        """Answer the next TIMES requests to PATH with STATUS instead."""
+        fault = Fault(
+            status, headers or {}, body if body is not None else {"message": "fault"}
+        )
+        self._faults.setdefault(path, []).extend([fault] * times)
+
+    # -- assertions --------------------------------------------------------
+
+    def count(self, method: str | None = None, path: str | None = None) -> int:
+        """Requests seen, optionally filtered by METHOD and exact PATH."""
+        return sum(
+            1
+            for r in self.requests
+            if (method is None or r.method == method)
+            and (path is None or r.path == path)
+        )
+
+    # -- lifecycle ---------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None, "server not started"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeGitHub":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _handler_for(self))
+        self._server.daemon_threads = True
+        # serve_forever polls for shutdown every 0.5s by default, which every
+        # test would otherwise spend in teardown.
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.01},
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        assert self._server is not None
+        self._server.shutdown()
+        self._server.server_close()
+
+    # -- request handling --------------------------------------------------
+
+    def handle(
+        self, method: str, path: str, query: dict[str, str], body: Any
+    ) -> tuple[int, dict[str, str], Any]:
+        with self._lock:
+            self.requests.append(Request(method, path, query, body))
+            if self.remaining <= 0:
+                return 403, {}, {"message": "API rate limit exceeded"}
+            self.remaining -= 1
+            faults = self._faults.get(path)
+            if faults:
+                fault = faults.pop(0)
+                return fault.status, dict(fault.headers), fault.body
+
+        if path == "/graphql" and method == "POST":
+            return self._graphql(body or {})
+        if path in self.objects and method == "GET":
+            return 200, {}, self.objects[path]
+        if path in self.collections:
+            if method == "GET":
+                return self._page(path, query)
+            if method == "POST":
+                return self._append(path, body or {})
+        # Sub-resources of a known item (e.g. POST .../issues/1/labels) are
+        # accepted and recorded without modelling their effect.
+        if method == "POST" and any(path.startswith(p + "/") for p in self.collections):
+            return 200, {}, body
+        return 404, {}, {"message": "Not Found"}
+
+    def _page(
+        self, path: str, query: dict[str, str]
+    ) -> tuple[int, dict[str, str], Any]:
+        items = self.collections[path]
+        state = query.get("state")
+        if state and state != "all":
+            items = [i for i in items if i.get("state", "open") == state]
+        per_page = min(int(query.get("per_page", DEFAULT_PER_PAGE)), MAX_PER_PAGE)
+        page = int(query.get("page", 1))
+        last = max(1, -(-len(items) // per_page))
+        headers = {}
+        links = []
+        if page < last:
+            links.append(f'<{self._page_url(path, query, page + 1)}>; rel="next"')
+            links.append(f'<{self._page_url(path, query, last)}>; rel="last"')
+        if links:
+            headers["Link"] = ", ".join(links)
+        return 200, headers, items[(page - 1) * per_page : page * per_page]
+
+    def _page_url(self, path: str, query: dict[str, str], page: int) -> str:
+        return f"{self.url}{path}?{urlencode({**query, 'page': page})}"
+
+    def _append(self, path: str, body: dict) -> tuple[int, dict[str, str], Any]:
+        with self._lock:
+            items = self.collections[path]
+            number = max((i.get("number", 0) for i in items), default=0) + 1
+            item = {
+                **body,
+                "id": number,
+                "number": number,
+                "html_url": f"https://github.com{path.removeprefix('/repos')}/{number}",
+            }
+            items.append(item)
+        return 201, {}, item
+
+    def _graphql(self, body: dict) -> tuple[int, dict[str, str], Any]:
+        query = body.get("query", "")
+        variables = body.get("variables") or {}
+        if "pullRequests" not in query:
+            return 200, {}, {"errors": [{"message": "unsupported query"}]}
+        key = f"{variables.get('owner')}/{variables.get('name')}"
+        nodes = self.graphql_pull_requests.get(key, [])
+        first = min(int(variables.get("first", DEFAULT_PER_PAGE)), MAX_PER_PAGE)
+        start = int(variables["after"]) if variables.get("after") else 0
+        page = nodes[start : start + first]
+        end = start + len(page)
+        connection = {
+            "totalCount": len(nodes),
+            "pageInfo": {
+                "hasNextPage": end < len(nodes),
+                "endCursor": str(end) if page else None,
+            },
+            "nodes": page,
+        }
+        return 200, {}, {"data": {"repository": {"pullRequests": connection}}}
+
+
+def _handler_for(github: FakeGitHub) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _serve(self) -> None:
+            if github.latency:
+                time.sleep(github.latency)
+            parts = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            body = json.loads(raw) if raw else None
+            status, headers, payload = github.handle(
+                self.command, parts.path, dict(parse_qsl(parts.query)), body
+            )
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            merged = {
+                "X-RateLimit-Limit": str(github.rate_limit),
+                "X-RateLimit-Remaining": str(max(github.remaining, 0)),
+                "X-RateLimit-Reset": str(github.reset),
+                **headers,
+            }
+            for name, value in merged.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _serve
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    return Handler
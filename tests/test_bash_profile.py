@@ -0,0 +1,130 @@
+"""Tests for .github/scripts/lib/profile.bash and bash-profile-report.sh."""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT
+
+PROFILE_LIB = REPO_ROOT / ".github" / "scripts" / "lib" / "profile.bash"
+REPORT = REPO_ROOT / ".github" / "scripts" / "bash-profile-report.sh"
+
+SCRIPT = """\
+#!/usr/bin/env bash
+set -euo pipefail
+inner() { local x; x=$(echo hi | tr a-z A-Z); true "$x"; }
+outer() { for _ in 1 2 3; do inner; done; }
+outer
+sleep 0.2
+bash "$(dirname "$0")/child.sh"
+"""
+CHILD = """\
+#!/usr/bin/env bash
+set -euo pipefail
+date >/dev/null
+echo "done"
+"""
+
+
+@pytest.fixture
+def traced(tmp_path: Path) -> Path:
+    """Run a sample script (which starts a child script) under the profiler;
+    return the trace file."""
+    (tmp_path / "sample.sh").write_text(SCRIPT)
+    (tmp_path / "child.sh").write_text(CHILD)
+    trace = tmp_path / "run.trace"
+    result = subprocess.run(
+        ["bash", str(tmp_path / "sample.sh")],
+        env={**os.environ, "BASH_ENV": str(PROFILE_LIB), "BASH_PROFILE": str(trace)},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    # Tracing goes to the trace file, never the script's own output.
+    assert result.stdout == "done\n"
+    assert result.stderr == ""
+    return trace
+
+
+def report(*args: str | Path) -> str:
+    result = subprocess.run(
+        ["bash", str(REPORT), *map(str, args)], capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def rows(text: str) -> dict[str, list[str]]:
+    return {
+        line.split()[0]: line.split()[1:] for line in text.splitlines() if line.strip()
+    }
+
+
+def test_lines_and_functions_are_timed_with_fork_counts(traced: Path) -> None:
+    table = rows(report(traced))
+
+    # The sleep dominates and is one external command.
+    slowest = report("--top", "1", traced).splitlines()[3]
+    assert slowest.split()[0] == "sample.sh:6"
+    assert float(table["sample.sh:6"][1]) >= 150
+    assert table["sample.sh:6"][2:] == ["1", "1"]
+    # inner runs 3 times; each $(echo | tr) forks two pipeline subshells and
+    # tr is exec'd in place.
+    fn, ms, hits, forks = table["sample.sh:3"]
+    assert (fn, hits, forks) == ("inner", "15", "6")
+    # Line 7 starts the child script and forks a $(dirname ...) subshell;
+    # dirname is exec'd in place.
+    assert table["sample.sh:7"][2:] == ["2", "2"]
+    # The child script is traced too; starting it was counted on line 7.
+    assert table["child.sh:3"][2:] == ["1", "1"]
+    assert table["child.sh:4"][2:] == ["1", "0"]
+    assert table["outer"][1] == "6"
+    assert float(table["outer"][0]) >= float(table["inner"][0])
+    assert table["total"][6] == "~10"
+
+
+def test_folded_output_is_flamegraph_stacks(traced: Path) -> None:
+    folded = dict(
+        line.rsplit(" ", 1) for line in report("--folded", traced).splitlines()
+    )
+    assert set(folded) >= {
+        "sample.sh;outer;inner;sample.sh:3",
+        "sample.sh;outer;sample.sh:4",
+        "sample.sh;sample.sh:6",
+        "child.sh;child.sh:3",
+    }
+    assert all(value.isdigit() for value in folded.values())
+    assert int(folded["sample.sh;sample.sh:6"]) >= 150_000
+
+
+def test_disabled_without_trace_path(tmp_path: Path) -> None:
+    (tmp_path / "sample.sh").write_text(SCRIPT)
+    (tmp_path / "child.sh").write_text(CHILD)
+    result = subprocess.run(
+        ["bash", str(tmp_path / "sample.sh")],
+        env={**os.environ, "BASH_ENV": str(PROFILE_LIB)},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0
+    assert (result.stdout, result.stderr) == ("done\n", "")
+    assert {p.name for p in tmp_path.iterdir()} == {"child.sh", "sample.sh"}
+
+
+def test_multiline_commands_and_several_traces(tmp_path: Path, traced: Path) -> None:
+    script = tmp_path / "multi.sh"
+    script.write_text('msg="two\nlines"\nprintf "%s" "$msg" >/dev/null\n/bin/true\n')
+    second = tmp_path / "second.trace"
+    subprocess.run(
+        ["bash", str(script)],
+        env={**os.environ, "BASH_ENV": str(PROFILE_LIB), "BASH_PROFILE": str(second)},
+        check=True,
+    )
+    table = rows(report(traced, second))
+    # Bash numbers a multi-line command by its last line.
+    assert table["multi.sh:2"][2:] == ["1", "0"]
+    assert table["multi.sh:3"][2:] == ["1", "0"]
+    assert table["multi.sh:4"][2:] == ["1", "1"]
+    assert "sample.sh:6" in table
@@ -0,0 +1,91 @@
+"""Tests for benchmarks/run.py, at the small scale with a single run each."""
+
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("jq") is None or shutil.which("node") is None,
+    reason="jq and node are required",
+)
+
+RUNNER = REPO_ROOT / "benchmarks" / "run.py"
+QUICK = ["--scale", "small", "--warmup", "0", "--repeat", "1"]
+
+
+def run(*args: str | Path) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(RUNNER), *QUICK, *map(str, args)],
+        capture_output=True,
+        text=True,
+    )
+
+
+def write_baseline(path: Path, medians: dict[str, float]) -> None:
+    results = {key: {"median_ms": ms} for key, ms in medians.items()}
+    path.write_text(json.dumps({"version": 1, "results": results}))
+
+
+def test_every_benchmark_runs_and_records_json(tmp_path: Path) -> None:
+    out = tmp_path / "results.json"
+    result = run("--output", out, "--baseline", tmp_path / "none.json")
+
+    assert result.returncode == 0, result.stderr
+    results = json.loads(out.read_text())["results"]
+    committed = json.loads((REPO_ROOT / "benchmarks" / "baseline.json").read_text())
+    # The committed baseline covers every benchmark at every scale.
+    assert {key for key in committed["results"] if key.endswith("/small")} == set(
+        results
+    )
+    for entry in results.values():
+        assert entry["runs"] == 1
+        assert 0 < entry["min_ms"] <= entry["median_ms"] <= entry["max_ms"]
+    assert results["check-symlinks/small"]["size"] == 1000
+    assert "new" in result.stdout
+
+
+def test_regression_past_threshold_fails(tmp_path: Path) -> None:
+    baseline = tmp_path / "baseline.json"
+    write_baseline(
+        baseline, {"script-configured/small": 0.01, "determine-bump/small": 1e6}
+    )
+
+    result = run(
+        *("--only", "script-configured", "--only", "determine-bump"),
+        *("--baseline", baseline, "--min-delta-ms", "0"),
+    )
+
+    assert result.returncode == 1
+    assert "script-configured/small" in result.stderr
+    assert "determine-bump" not in result.stderr
+    # Noise floor: the same slowdown under --min-delta-ms is not a regression.
+    lenient = run(
+        "--only", "script-configured", "--baseline", baseline, "--min-delta-ms", "1e6"
+    )
+    assert lenient.returncode == 0, lenient.stderr
+
+
+def test_update_baseline_merges(tmp_path: Path) -> None:
+    baseline = tmp_path / "baseline.json"
+    write_baseline(baseline, {"lint-skills/large": 123.0})
+
+    result = run(
+        "--only", "script-configured", "--baseline", baseline, "--update-baseline"
+    )
+
+    assert result.returncode == 0, result.stderr
+    results = json.loads(baseline.read_text())["results"]
+    assert results["lint-skills/large"] == {"median_ms": 123.0}
+    assert results["script-configured/small"]["size"] == 10
+
+
+def test_unknown_benchmark_is_rejected() -> None:
+    result = run("--only", "nope")
+    assert result.returncode == 2
+    assert "unknown benchmark" in result.stderr
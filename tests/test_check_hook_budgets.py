@@ -0,0 +1,148 @@
+"""Tests for .github/scripts/check-hook-budgets.sh."""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT
+
+pytestmark = pytest.mark.skipif(shutil.which("jq") is None, reason="jq not available")
+
+SCRIPT = REPO_ROOT / ".github" / "scripts" / "check-hook-budgets.sh"
+
+BUDGETS = {
+    "regression": {"ratio": 1.5, "min_delta_seconds": 2},
+    "phases": {
+        "session-setup": {
+            "budget_seconds": 60,
+            "over_budget": "fail",
+            "regression": "warn",
+        },
+        "pre-commit": {
+            "budget_seconds": 10,
+            "over_budget": "warn",
+            "regression": "fail",
+        },
+    },
+}
+
+
+def run(
+    tmp_path: Path, timings: dict[str, int], baseline: dict[str, int] | None = None
+) -> subprocess.CompletedProcess:
+    timings_file = tmp_path / "timings.tsv"
+    timings_file.write_text("".join(f"{k}\t{v}\n" for k, v in timings.items()))
+    budgets_file = tmp_path / "budgets.json"
+    budgets_file.write_text(json.dumps(BUDGETS))
+    env = {
+        "PATH": "/usr/bin:/bin:/usr/local/bin",
+        "TIMINGS_FILE": str(timings_file),
+        "BUDGETS_FILE": str(budgets_file),
+        "RESULTS_FILE": str(tmp_path / "results.json"),
+        "GITHUB_STEP_SUMMARY": str(tmp_path / "summary.md"),
+    }
+    if baseline is not None:
+        (tmp_path / "baseline.json").write_text(json.dumps({"phases": baseline}))
+        env["BASELINE_FILE"] = str(tmp_path / "baseline.json")
+    return subprocess.run(
+        ["bash", str(SCRIPT)], env=env, capture_output=True, text=True
+    )
+
+
+def test_within_budget_passes_and_records_results(tmp_path: Path) -> None:
+    result = run(
+        tmp_path, {"session-setup": 30_000, "pre-commit": 1_200, "pre-push": 99_000}
+    )
+
+    assert result.returncode == 0, result.stdout
+    assert "::" not in result.stdout
+    assert json.loads((tmp_path / "results.json").read_text()) == {
+        "phases": {"session-setup": 30000, "pre-commit": 1200, "pre-push": 99000}
+    }
+    summary = (tmp_path / "summary.md").read_text()
+    assert "| session-setup | 30 | 60 | - | ok |" in summary
+    # Phases without a budget are reported but never gated.
+    assert "| pre-push | 99 | - | - | ok |" in summary
+
+
+def test_over_budget_fails_or_warns_per_phase(tmp_path: Path) -> None:
+    result = run(tmp_path, {"session-setup": 61_000, "pre-commit": 11_000})
+
+    assert result.returncode == 1
+    assert "::error::Hook phase session-setup took 61s: over budget" in result.stdout
+    assert "::warning::Hook phase pre-commit took 11s: over budget" in result.stdout
+
+
+def test_regression_against_baseline(tmp_path: Path) -> None:
+    result = run(
+        tmp_path,
+        {"session-setup": 40_000, "pre-commit": 6_000},
+        baseline={"session-setup": 20_000, "pre-commit": 3_000},
+    )
+
+    assert result.returncode == 1
+    assert (
+        "::warning::Hook phase session-setup took 40s: regressed 100% vs baseline"
+        in result.stdout
+    )
+    assert (
+        "::error::Hook phase pre-commit took 6s: regressed 100% vs baseline"
+        in result.stdout
+    )
+    assert (
+        "| pre-commit | 6 | 10 | 3 | regressed 100% vs baseline (fail) |"
+        in (tmp_path / "summary.md").read_text()
+    )
+
+
+def test_small_absolute_slowdowns_are_noise(tmp_path: Path) -> None:
+    """3x slower but only 1s longer stays under min_delta_seconds."""
+    result = run(tmp_path, {"pre-commit": 1_500}, baseline={"pre-commit": 500})
+
+    assert result.returncode == 0, result.stdout
+
+
+def test_unreadable_baseline_is_ignored(tmp_path: Path) -> None:
+    (tmp_path / "baseline.json").write_text("not json")
+    timings = tmp_path / "timings.tsv"
+    timings.write_text("pre-commit\t1000\n")
+    budgets = tmp_path / "budgets.json"
+    budgets.write_text(json.dumps(BUDGETS))
+
+    result = subprocess.run(
+        ["bash", str(SCRIPT)],
+        env={
+            "PATH": "/usr/bin:/bin:/usr/local/bin",
+            "TIMINGS_FILE": str(timings),
+            "BUDGETS_FILE": str(budgets),
+            "BASELINE_FILE": str(tmp_path / "baseline.json"),
+        },
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "Ignoring unreadable hook timing baseline" in result.stdout
+
+
+def test_missing_budget_file_reports_only(tmp_path: Path) -> None:
+    timings = tmp_path / "timings.tsv"
+    timings.write_text("session-setup\t999000\n")
+
+    result = subprocess.run(
+        ["bash", str(SCRIPT)],
+        env={
+            "PATH": "/usr/bin:/bin:/usr/local/bin",
+            "TIMINGS_FILE": str(timings),
+            "BUDGETS_FILE": str(tmp_path / "missing.json"),
+        },
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "Hook phase session-setup took 999s" in result.stdout
+    assert "(budget" not in result.stdout
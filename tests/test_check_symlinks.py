@@ -53,3 +53,57 @@ def test_ignores_untracked_absolute_symlink(empty_git_repo: Path, copy_script) -
     # Don't commit — link stays untracked.
     result = run_script(empty_git_repo, copy_script)
     assert result.returncode == 0, result.stderr
+
+
+def test_reports_every_absolute_symlink_with_awkward_names(
+    empty_git_repo: Path, copy_script
+) -> None:
+    """Paths are NUL-delimited end to end, so spaces and tabs survive."""
+    (empty_git_repo / "target.txt").write_text("hi")
+    (empty_git_repo / "ok link").symlink_to("target.txt")
+    (empty_git_repo / "bad link").symlink_to("/etc/passwd")
+    (empty_git_repo / "tab\tlink").symlink_to("/tmp/some where")
+    commit_all(empty_git_repo)
+
+    result = run_script(empty_git_repo, copy_script)
+
+    assert result.returncode == 1
+    assert "bad link -> /etc/passwd" in result.stdout
+    assert "tab\tlink -> /tmp/some where" in result.stdout
+    assert "ok link" not in result.stdout
+
+
+def run_incremental(repo: Path, copy_script, base: str) -> subprocess.CompletedProcess:
+    script = copy_script("check-symlinks.sh", repo)
+    return subprocess.run(
+        ["bash", str(script), "--base", base], cwd=repo, capture_output=True, text=True
+    )
+
+
+def test_incremental_checks_only_changes_since_base(
+    empty_git_repo: Path, copy_script
+) -> None:
+    (empty_git_repo / "old").symlink_to("/etc/hosts")
+    base = commit_all(empty_git_repo, "pre-existing violation")
+    (empty_git_repo / "new").symlink_to("/etc/passwd")
+    commit_all(empty_git_repo, "new violation")
+
+    result = run_incremental(empty_git_repo, copy_script, base)
+
+    assert result.returncode == 1
+    assert "new -> /etc/passwd" in result.stdout
+    assert "old ->" not in result.stdout
+    assert run_incremental(empty_git_repo, copy_script, "HEAD").returncode == 0
+
+
+def test_incremental_falls_back_to_full_scan_without_base(
+    empty_git_repo: Path, copy_script
+) -> None:
+    (empty_git_repo / "link").symlink_to("/etc/passwd")
+    commit_all(empty_git_repo)
+
+    result = run_incremental(empty_git_repo, copy_script, "origin/does-not-exist")
+
+    assert result.returncode == 1
+    assert "not found; checking every symlink" in result.stdout
+    assert "link -> /etc/passwd" in result.stdout
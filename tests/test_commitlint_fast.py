@@ -0,0 +1,126 @@
+"""Tests for config/javascript/commitlint-fast.mjs and its use in .hooks/commit-msg.
+
+The fast path must agree with @commitlint/config-conventional whenever it
+gives a verdict (exit 0 or 1), and defer (exit 3) whenever the answer depends
+on parser details it doesn't model.
+"""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT, git_env, init_test_repo
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("node") is None, reason="node not available"
+)
+
+SCRIPT = REPO_ROOT / "config" / "javascript" / "commitlint-fast.mjs"
+CONFIG = REPO_ROOT / "config" / "javascript" / "commitlint.config.js"
+PASS, FAIL, DEFER = 0, 1, 3
+
+
+def lint(
+    tmp_path: Path, message: str, config: Path = CONFIG
+) -> subprocess.CompletedProcess:
+    msg = tmp_path / "COMMIT_EDITMSG"
+    msg.write_text(message)
+    return subprocess.run(
+        ["node", str(SCRIPT), str(msg), str(config)], capture_output=True, text=True
+    )
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "feat: add a thing\n",
+        "fix(hooks)!: handle empty input\n",
+        "docs: `README` tweaks\n",
+        "feat: 修复登录问题\n",
+        "chore: bump deps\n\nLonger explanation of the change.\n",
+        "feat: add x\n# Please enter the commit message\n#\n",
+        "feat: add x\n# ------------------------ >8 ------------------------\ndiff --git a b\n",
+    ],
+)
+def test_accepts_conventional_messages(tmp_path: Path, message: str) -> None:
+    result = lint(tmp_path, message)
+    assert result.returncode == PASS, result.stdout + result.stderr
+
+
+@pytest.mark.parametrize(
+    "message, rule",
+    [
+        ("feat: Add a thing\n", "subject-case"),
+        ("feat: ADD\n", "subject-case"),
+        ("feat: add a thing.\n", "subject-full-stop"),
+        ("Feat: add\n", "type-case"),
+        ("feature: add\n", "type-enum"),
+        ("add stuff\n", "type-empty"),
+        ("feat: \n", "subject-empty"),
+        ("feat: add a thing \n", "header-trim"),
+        (f"feat: {'x' * 100}\n", "header-max-length"),
+    ],
+)
+def test_rejects_with_rule_name(tmp_path: Path, message: str, rule: str) -> None:
+    result = lint(tmp_path, message)
+    assert result.returncode == FAIL
+    assert f"[{rule}]" in result.stdout
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "Merge branch 'main' into feature\n",
+        'Revert "feat: add x"\n',
+        "fixup! feat: add x\n",
+        "feat: add x\nbody without blank line\n",
+        "feat: add x\n\nBREAKING CHANGE: drops y\n",
+        "fix: add x\n\nCloses #12\n",
+        f"feat: add x\n\n{'y' * 101}\n",
+    ],
+)
+def test_defers_when_parser_details_matter(tmp_path: Path, message: str) -> None:
+    assert lint(tmp_path, message).returncode == DEFER
+
+
+def test_defers_on_custom_config(tmp_path: Path) -> None:
+    config = tmp_path / "commitlint.config.js"
+    config.write_text(
+        'export default { extends: ["@commitlint/config-conventional"], '
+        'rules: { "scope-empty": [2, "never"] } };\n'
+    )
+    assert lint(tmp_path, "feat: add x\n", config).returncode == DEFER
+
+
+def run_hook(repo: Path, message: str) -> subprocess.CompletedProcess:
+    msg = repo / ".git" / "COMMIT_EDITMSG"
+    msg.write_text(message)
+    return subprocess.run(
+        ["bash", str(repo / ".hooks" / "commit-msg"), str(msg)],
+        cwd=repo,
+        # An unwritable cache root proves no install was attempted.
+        env={**git_env(), "COMMITLINT_CACHE_DIR": "/nonexistent/commitlint"},
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_hook_decides_on_the_fast_path_without_node_modules(tmp_path: Path) -> None:
+    init_test_repo(tmp_path)
+    (tmp_path / ".hooks").mkdir()
+    shutil.copy2(
+        REPO_ROOT / ".hooks" / "commit-msg", tmp_path / ".hooks" / "commit-msg"
+    )
+    shutil.copytree(REPO_ROOT / "config", tmp_path / "config")
+    assert not (tmp_path / "node_modules").exists()
+
+    ok = run_hook(tmp_path, "feat: add a thing\n")
+    bad = run_hook(tmp_path, "Feat: Add a thing.\n")
+
+    assert ok.returncode == 0, ok.stdout + ok.stderr
+    assert bad.returncode == 1
+    assert "[type-case]" in bad.stdout
+    assert not os.path.exists("/nonexistent/commitlint")
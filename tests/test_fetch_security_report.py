@@ -0,0 +1,271 @@
+"""Tests for .github/scripts/fetch-security-report.sh.
+
+A fake `gh` on PATH serves canned alert payloads from a fixture directory, so
+these cover the normalization, the snapshot diff, and the byte-budgeted
+SECURITY_REPORT payload without touching the GitHub API.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.skipif(shutil.which("jq") is None, reason="jq not available")
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = REPO_ROOT / ".github" / "scripts" / "fetch-security-report.sh"
+
+FAKE_GH = r"""#!/usr/bin/env bash
+# Minimal `gh api` stand-in: serves $FAKE_GH_DIR/<endpoint path with / -> _>.json.
+shift
+endpoint="" jq_expr="" include=false
+while (($#)); do
+  case "$1" in
+  --paginate) ;;
+  --include) include=true ;;
+  --jq) jq_expr="$2"; shift ;;
+  *) endpoint="$1" ;;
+  esac
+  shift
+done
+path="${endpoint%%\?*}"
+file="$FAKE_GH_DIR/${path//\//_}.json"
+if [[ ! -f "$file" ]]; then
+  [[ "$include" == true ]] && printf 'HTTP/2.0 404 Not Found\r\n\r\n{"message":"Not Found"}'
+  echo "gh: Not Found (HTTP 404)" >&2
+  exit 1
+fi
+[[ "$include" == true ]] && printf 'HTTP/2.0 200 OK\r\nX-Ratelimit-Remaining: 4999\r\n\r\n'
+if [[ -n "$jq_expr" ]]; then jq -r "$jq_expr" "$file"; else cat "$file"; fi
+"""
+
+
+def dependabot(number: int, severity: str, package: str = "lodash") -> dict:
+    return {
+        "number": number,
+        "security_advisory": {"severity": severity, "summary": f"Advisory {number}"},
+        "dependency": {
+            "package": {"name": package, "ecosystem": "npm"},
+            "manifest_path": "package.json",
+        },
+    }
+
+
+def code_scanning(number: int, level: str) -> dict:
+    return {
+        "number": number,
+        "rule": {
+            "id": "js/xss",
+            "severity": "error",
+            "security_severity_level": level,
+            "description": f"Rule {number}",
+        },
+        "most_recent_instance": {"location": {"path": "src/app.js", "start_line": 7}},
+    }
+
+
+@pytest.fixture
+def sandbox(tmp_path: Path) -> Path:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    gh = bin_dir / "gh"
+    gh.write_text(FAKE_GH)
+    gh.chmod(0o755)
+    (tmp_path / "fixtures").mkdir()
+    (tmp_path / "cwd").mkdir()
+    return tmp_path
+
+
+def serve(sandbox: Path, endpoint: str, payload: object) -> None:
+    name = endpoint.replace("/", "_")
+    (sandbox / "fixtures" / f"{name}.json").write_text(json.dumps(payload))
+
+
+def run_report(
+    sandbox: Path, previous: Path | None = None, **env_overrides: str
+) -> tuple[str, dict, subprocess.CompletedProcess]:
+    """Run the script; return (SECURITY_REPORT payload, snapshot, result)."""
+    github_env = sandbox / "github_env"
+    github_env.write_text("")
+    alerts = sandbox / "alerts.json"
+    env = {
+        **os.environ,
+        "PATH": f"{sandbox / 'bin'}:{os.environ['PATH']}",
+        "FAKE_GH_DIR": str(sandbox / "fixtures"),
+        "GH_TOKEN": "fake",
+        "REPO": "o/r",
+        "GITHUB_ENV": str(github_env),
+        "REPORT_PATH": str(sandbox / "report.md"),
+        "ALERTS_PATH": str(alerts),
+        "PREVIOUS_ALERTS_PATH": str(previous) if previous else "",
+        **env_overrides,
+    }
+    result = subprocess.run(
+        ["bash", str(SCRIPT)],
+        cwd=sandbox / "cwd",
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    lines = github_env.read_text().splitlines()
+    sentinel = lines[0].split("<<", 1)[1]
+    payload = "\n".join(lines[1 : lines.index(sentinel)])
+    return payload, json.loads(alerts.read_text()), result
+
+
+def test_first_run_lists_everything_as_new_most_severe_first(sandbox: Path) -> None:
+    serve(
+        sandbox,
+        "repos/o/r/dependabot/alerts",
+        [dependabot(1, "low"), dependabot(2, "critical")],
+    )
+    serve(sandbox, "repos/o/r/code-scanning/alerts", [code_scanning(5, "high")])
+    serve(sandbox, "repos/o/r/secret-scanning/alerts", [])
+
+    payload, snapshot, _ = run_report(sandbox)
+
+    assert "No previous snapshot; all 3 open alerts are listed as new." in payload
+    assert (
+        payload.index("Advisory 2")
+        < payload.index("Rule 5")
+        < payload.index("Advisory 1")
+    )
+    assert snapshot["failed_sources"] == []
+    assert {a["source"] for a in snapshot["alerts"]} == {"dependabot", "code-scanning"}
+    alert = next(a for a in snapshot["alerts"] if a["id"] == "5")
+    assert alert == {
+        "source": "code-scanning",
+        "id": "5",
+        "severity": "high",
+        "package": None,
+        "location": "src/app.js:7",
+        "title": "Rule 5",
+        "url": "https://github.com/o/r/security/code-scanning/5",
+    }
+
+
+def test_second_run_reports_only_new_and_changed(sandbox: Path) -> None:
+    serve(
+        sandbox,
+        "repos/o/r/dependabot/alerts",
+        [dependabot(1, "low"), dependabot(2, "high")],
+    )
+    serve(sandbox, "repos/o/r/code-scanning/alerts", [code_scanning(5, "medium")])
+    serve(sandbox, "repos/o/r/secret-scanning/alerts", [])
+    _, first, _ = run_report(sandbox)
+    previous = sandbox / "previous.json"
+    previous.write_text(json.dumps(first))
+
+    # #1 unchanged, #2 escalated, #5 fixed, #3 appeared.
+    serve(
+        sandbox,
+        "repos/o/r/dependabot/alerts",
+        [dependabot(1, "low"), dependabot(2, "critical"), dependabot(3, "medium")],
+    )
+    serve(sandbox, "repos/o/r/code-scanning/alerts", [])
+    payload, _, _ = run_report(sandbox, previous)
+
+    assert "1 new, 1 changed, 1 unchanged (omitted), 1 resolved." in payload
+    assert "(changed, was high, dependabot): [Advisory 2]" in payload
+    assert "(new, dependabot): [Advisory 3]" in payload
+    assert "Advisory 1" not in payload
+
+
+def test_previous_snapshot_may_share_the_output_path(sandbox: Path) -> None:
+    serve(sandbox, "repos/o/r/dependabot/alerts", [dependabot(1, "low")])
+    serve(sandbox, "repos/o/r/code-scanning/alerts", [])
+    serve(sandbox, "repos/o/r/secret-scanning/alerts", [])
+    run_report(sandbox)
+
+    payload, _, _ = run_report(sandbox, sandbox / "alerts.json")
+    assert "0 new, 0 changed, 1 unchanged (omitted), 0 resolved." in payload
+    assert "_No new or changed alerts._" in payload
+
+
+def test_failed_source_is_flagged_and_not_counted_as_resolved(sandbox: Path) -> None:
+    serve(sandbox, "repos/o/r/dependabot/alerts", [])
+    serve(sandbox, "repos/o/r/code-scanning/alerts", [code_scanning(5, "high")])
+    serve(sandbox, "repos/o/r/secret-scanning/alerts", [])
+    _, first, _ = run_report(sandbox)
+    previous = sandbox / "previous.json"
+    previous.write_text(json.dumps(first))
+
+    (sandbox / "fixtures" / "repos_o_r_code-scanning_alerts.json").unlink()
+    payload, snapshot, _ = run_report(sandbox, previous)
+
+    assert snapshot["failed_sources"] == ["code-scanning"]
+    assert "0 resolved." in payload
+    assert "0 new, 0 changed, 0 unchanged (omitted)" in payload
+    assert "**Incomplete data** — could not fetch: code-scanning." in payload
+    report = (sandbox / "report.md").read_text()
+    assert "_No code scanning alerts or code scanning not enabled._" in report
+
+    # The failed source's alerts are carried over, so they aren't "new" once
+    # it recovers.
+    assert [a["id"] for a in snapshot["alerts"]] == ["5"]
+    previous.write_text(json.dumps(snapshot))
+    serve(sandbox, "repos/o/r/code-scanning/alerts", [code_scanning(5, "high")])
+    payload, snapshot, _ = run_report(sandbox, previous)
+
+    assert snapshot["failed_sources"] == []
+    assert "0 new, 0 changed, 1 unchanged (omitted), 0 resolved." in payload
+
+
+def test_byte_budget_keeps_the_most_severe_alerts(sandbox: Path) -> None:
+    alerts = [dependabot(n, "low", package=f"pkg-{n}") for n in range(1, 80)]
+    alerts.append(dependabot(999, "critical"))
+    serve(sandbox, "repos/o/r/dependabot/alerts", alerts)
+    serve(sandbox, "repos/o/r/code-scanning/alerts", [])
+    serve(sandbox, "repos/o/r/secret-scanning/alerts", [])
+
+    payload, snapshot, _ = run_report(sandbox, REPORT_BYTE_BUDGET="2000")
+
+    assert len(payload.encode()) <= 2000
+    assert "Advisory 999" in payload
+    assert "omitted to fit the 2000-byte budget" in payload
+    # The snapshot and the full report are never truncated.
+    assert len(snapshot["alerts"]) == 80
+    assert (sandbox / "report.md").read_text().count("- **LOW**") == 79
+
+
+def test_pnpm_audit_is_normalized(sandbox: Path) -> None:
+    for endpoint in ("dependabot", "code-scanning", "secret-scanning"):
+        serve(sandbox, f"repos/o/r/{endpoint}/alerts", [])
+    (sandbox / "cwd" / "package.json").write_text("{}")
+    audit = {
+        "advisories": {
+            "1096": {
+                "id": 1096,
+                "github_advisory_id": "GHSA-xxxx",
+                "module_name": "minimist",
+                "severity": "moderate",
+                "title": "Prototype Pollution",
+                "url": "https://github.com/advisories/GHSA-xxxx",
+                "findings": [{"version": "1.2.0", "paths": ["mkdirp>minimist"]}],
+            }
+        }
+    }
+    pnpm = sandbox / "bin" / "pnpm"
+    pnpm.write_text(
+        f"#!/usr/bin/env bash\necho {json.dumps(json.dumps(audit))}\nexit 1\n"
+    )
+    pnpm.chmod(0o755)
+
+    payload, snapshot, _ = run_report(sandbox)
+
+    assert snapshot["alerts"] == [
+        {
+            "source": "pnpm-audit",
+            "id": "GHSA-xxxx",
+            "severity": "moderate",
+            "package": "minimist",
+            "location": "mkdirp>minimist",
+            "title": "Prototype Pollution",
+            "url": "https://github.com/advisories/GHSA-xxxx",
+        }
+    ]
+    assert "(new, pnpm-audit): [Prototype Pollution]" in payload
@@ -0,0 +1,314 @@
+"""Tests for .github/scripts/lib/gh-api.bash.
+
+A fake `gh` replays canned `gh api --include` responses in order (one file per
+request), so these cover pagination, retry classification, the request
+budget, adaptive concurrency, and the per-script summary without a network.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB = REPO_ROOT / ".github" / "scripts" / "lib" / "gh-api.bash"
+
+FAKE_GH = """#!/usr/bin/env bash
+# Replays $FAKE_GH_DIR/resp.N (exit status in resp.N.rc) for the Nth call.
+n=$(( $(cat "$FAKE_GH_DIR/count" 2>/dev/null || echo 0) + 1 ))
+echo "$n" >"$FAKE_GH_DIR/count"
+printf '%s\\n' "$*" >>"$FAKE_GH_DIR/calls"
+cat "$FAKE_GH_DIR/resp.$n"
+[[ -f "$FAKE_GH_DIR/resp.$n.err" ]] && cat "$FAKE_GH_DIR/resp.$n.err" >&2
+exit "$(cat "$FAKE_GH_DIR/resp.$n.rc" 2>/dev/null || echo 0)"
+"""
+
+
+class FakeGh:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.dir = root / "gh"
+        self.dir.mkdir()
+        bin_dir = root / "bin"
+        bin_dir.mkdir()
+        gh = bin_dir / "gh"
+        gh.write_text(FAKE_GH)
+        gh.chmod(0o755)
+        self.responses = 0
+
+    def respond(
+        self,
+        status: int,
+        body: str = "[]",
+        headers: dict[str, str] | None = None,
+        rc: int | None = None,
+        stderr: str = "",
+    ) -> None:
+        self.responses += 1
+        head = [
+            f"HTTP/2.0 {status} X",
+            *(f"{k}: {v}" for k, v in (headers or {}).items()),
+        ]
+        path = self.dir / f"resp.{self.responses}"
+        path.write_text("\r\n".join(head) + "\r\n\r\n" + body)
+        (self.dir / f"resp.{self.responses}.rc").write_text(
+            str(rc if rc is not None else (0 if status < 400 else 1))
+        )
+        if stderr:
+            (self.dir / f"resp.{self.responses}.err").write_text(stderr)
+
+    def calls(self) -> list[str]:
+        calls = self.dir / "calls"
+        return calls.read_text().splitlines() if calls.exists() else []
+
+    def run(self, snippet: str, **env_overrides: str) -> subprocess.CompletedProcess:
+        env = {
+            **{k: v for k, v in os.environ.items() if k != "GITHUB_STEP_SUMMARY"},
+            "PATH": f"{self.root / 'bin'}:{os.environ['PATH']}",
+            "FAKE_GH_DIR": str(self.dir),
+            "GH_API_STATS_FILE": str(self.root / "ledger.tsv"),
+            "GH_API_BACKOFF": "0",
+            "GH_API_SECONDARY_WAIT": "0",
+            **env_overrides,
+        }
+        script = f'set -euo pipefail\nsource "{LIB}"\n{snippet}\n'
+        return subprocess.run(
+            ["bash", "-c", script, "test-script"],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+
+    def ledger(self) -> list[list[str]]:
+        return [
+            line.split("\t")
+            for line in (self.root / "ledger.tsv").read_text().splitlines()
+        ]
+
+
+@pytest.fixture
+def fake_gh(tmp_path: Path) -> FakeGh:
+    return FakeGh(tmp_path)
+
+
+def test_paginate_follows_link_header_and_applies_jq_per_page(fake_gh: FakeGh) -> None:
+    fake_gh.respond(
+        200,
+        '[{"n": 1}, {"n": 2}]',
+        {
+            "Link": '<https://api.github.com/repositories/1/things?page=2>; rel="next", '
+            '<https://api.github.com/repositories/1/things?page=2>; rel="last"',
+            "X-RateLimit-Remaining": "4999",
+            "X-RateLimit-Reset": "1700000000",
+        },
+    )
+    fake_gh.respond(200, '[{"n": 3}]', {"X-RateLimit-Remaining": "4998"})
+
+    result = fake_gh.run("gh_api repos/o/r/things --paginate --jq '.[].n'")
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["1", "2", "3"]
+    calls = fake_gh.calls()
+    assert calls[0] == "api --include repos/o/r/things"
+    assert (
+        calls[1] == "api --include https://api.github.com/repositories/1/things?page=2"
+    )
+    ledger = fake_gh.ledger()
+    assert [row[3] for row in ledger] == ["200", "200"]
+    assert [row[5] for row in ledger] == ["4999", "4998"]
+    assert all(row[1] == "test-script" and row[7] == "ok" for row in ledger)
+
+
+def test_without_paginate_only_the_first_page_is_fetched(fake_gh: FakeGh) -> None:
+    fake_gh.respond(
+        200, "[1]", {"Link": '<https://api.github.com/x?page=2>; rel="next"'}
+    )
+
+    result = fake_gh.run("gh_api repos/o/r/things")
+
+    assert result.stdout == "[1]"
+    assert len(fake_gh.calls()) == 1
+
+
+@pytest.mark.parametrize(
+    "status, headers, body",
+    [
+        (429, {"Retry-After": "0"}, "{}"),
+        (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"}, "{}"),
+        (403, {}, '{"message": "You have exceeded a secondary rate limit."}'),
+    ],
+    ids=["429-retry-after", "primary-exhausted", "secondary"],
+)
+def test_rate_limits_are_retried(
+    fake_gh: FakeGh, status: int, headers: dict[str, str], body: str
+) -> None:
+    fake_gh.respond(status, body, headers)
+    fake_gh.respond(200, '{"ok": true}')
+
+    result = fake_gh.run("gh_api repos/o/r")
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == '{"ok": true}'
+    assert "rate limited" in result.stderr
+    assert [row[7] for row in fake_gh.ledger()] == ["ratelimited", "ok"]
+
+
+def test_server_and_network_errors_are_retried(fake_gh: FakeGh) -> None:
+    fake_gh.respond(502)
+    (fake_gh.dir / "resp.2").write_text("")  # no response at all
+    (fake_gh.dir / "resp.2.rc").write_text("1")
+    fake_gh.responses = 2
+    fake_gh.respond(200, "{}")
+
+    result = fake_gh.run("gh_api repos/o/r")
+
+    assert result.returncode == 0, result.stderr
+    assert [row[3] for row in fake_gh.ledger()] == ["502", "exit:1", "200"]
+
+
+def test_client_errors_fail_immediately_with_gh_stderr(fake_gh: FakeGh) -> None:
+    fake_gh.respond(
+        404, '{"message": "Not Found"}', stderr="gh: Not Found (HTTP 404)\n"
+    )
+
+    result = fake_gh.run("gh_api repos/o/r || echo failed")
+
+    assert result.stdout.strip() == "failed"
+    assert "gh: Not Found (HTTP 404)" in result.stderr
+    assert len(fake_gh.calls()) == 1
+
+
+def test_gives_up_after_max_attempts(fake_gh: FakeGh) -> None:
+    for _ in range(3):
+        fake_gh.respond(503)
+
+    result = fake_gh.run("gh_api repos/o/r || echo failed", GH_API_MAX_ATTEMPTS="3")
+
+    assert result.stdout.strip() == "failed"
+    assert len(fake_gh.calls()) == 3
+
+
+def test_rate_limit_wait_beyond_max_wait_fails_fast(fake_gh: FakeGh) -> None:
+    fake_gh.respond(429, "{}", {"Retry-After": "3600"})
+
+    result = fake_gh.run("gh_api repos/o/r || echo failed")
+
+    assert result.stdout.strip() == "failed"
+    assert len(fake_gh.calls()) == 1
+
+
+def test_budget_is_shared_across_calls(fake_gh: FakeGh) -> None:
+    for _ in range(3):
+        fake_gh.respond(200, "{}")
+
+    result = fake_gh.run(
+        "gh_api a >/dev/null; gh_api b >/dev/null; gh_api c || echo over",
+        GH_API_BUDGET="2",
+    )
+
+    assert result.stdout.strip() == "over"
+    assert "budget of 2 requests exhausted" in result.stderr
+    assert len(fake_gh.calls()) == 2
+
+
+def test_run_retries_rate_limited_commands_but_not_mutating_5xx(
+    fake_gh: FakeGh,
+) -> None:
+    flaky = fake_gh.root / "bin" / "flaky"
+    flaky.write_text(
+        "#!/usr/bin/env bash\n"
+        'n=$(( $(cat "$FAKE_GH_DIR/flaky" 2>/dev/null || echo 0) + 1 ))\n'
+        'echo "$n" >"$FAKE_GH_DIR/flaky"\n'
+        '[[ "$n" -ge 2 ]] && { echo done; exit 0; }\n'
+        'echo "$FLAKY_ERROR" >&2; exit 1\n'
+    )
+    flaky.chmod(0o755)
+
+    result = fake_gh.run(
+        "gh_api_run flaky", FLAKY_ERROR="HTTP 403: secondary rate limit"
+    )
+    assert result.stdout == "done\n"
+    assert [row[7] for row in fake_gh.ledger()] == ["ratelimited", "ok"]
+
+    (fake_gh.dir / "flaky").unlink()
+    result = fake_gh.run(
+        "gh_api_run --mutating flaky || echo failed", FLAKY_ERROR="HTTP 502"
+    )
+    assert result.stdout == "failed\n"
+    assert "HTTP 502" in result.stderr
+
+
+@pytest.mark.parametrize(
+    "ledger, expected",
+    [
+        ("", "4"),
+        ("1\ts\te\t200\t5\t4000\t0\tok\n", "4"),
+        ("1\ts\te\t200\t5\t500\t0\tok\n", "2"),
+        ("1\ts\te\t200\t5\t150\t0\tok\n", "1"),
+        ("1\ts\te\t403\t5\t\t\tratelimited\n1\ts\te\t200\t5\t4000\t0\tok\n", "1"),
+    ],
+    ids=["no-data", "healthy", "under-1000", "near-reserve", "rate-limited"],
+)
+def test_concurrency_adapts_to_quota(
+    fake_gh: FakeGh, ledger: str, expected: str
+) -> None:
+    (fake_gh.root / "ledger.tsv").write_text(ledger)
+
+    result = fake_gh.run("gh_api_concurrency")
+
+    assert result.stdout.strip() == expected
+
+
+def test_map_runs_every_item_and_reports_failures(fake_gh: FakeGh) -> None:
+    out = fake_gh.root / "out"
+    out.mkdir()
+    result = fake_gh.run(
+        f'job() {{ touch "{out}/$1"; [[ "$1" != bad ]]; }}\n'
+        "gh_api_map job a b c bad d || echo some-failed"
+    )
+
+    assert result.stdout.strip() == "some-failed"
+    assert sorted(p.name for p in out.iterdir()) == ["a", "b", "bad", "c", "d"]
+
+
+def test_summary_reports_this_scripts_requests(fake_gh: FakeGh) -> None:
+    (fake_gh.root / "ledger.tsv").write_text("1\tother.sh\te\t200\t900\t10\t0\tok\n")
+    fake_gh.respond(429, "{}", {"Retry-After": "0", "X-RateLimit-Remaining": "70"})
+    fake_gh.respond(200, "{}", {"X-RateLimit-Remaining": "69"})
+    step_summary = fake_gh.root / "summary.md"
+
+    result = fake_gh.run(
+        "gh_api repos/o/r >/dev/null; gh_api_summary",
+        GITHUB_STEP_SUMMARY=str(step_summary),
+    )
+
+    assert (
+        "gh-api: test-script made 2 request(s) (1 retried, 0 failed)" in result.stderr
+    )
+    assert "quota remaining: 69" in result.stderr
+    assert "| `test-script` | 2 | 1 | 0 |" in step_summary.read_text()
+
+
+def test_private_ledger_is_removed_by_summary(tmp_path: Path) -> None:
+    env = {
+        k: v
+        for k, v in os.environ.items()
+        if k not in ("RUNNER_TEMP", "GH_API_STATS_FILE")
+    }
+    env["TMPDIR"] = str(tmp_path)
+    result = subprocess.run(
+        [
+            "bash",
+            "-c",
+            f'set -euo pipefail; source "{LIB}"; trap gh_api_summary EXIT; '
+            'echo "$GH_API_STATS_FILE"',
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().startswith(str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,281 @@
+"""Round-trip budgets for the GitHub-facing scripts, run against FakeGitHub.
+
+Each test drives a real script through tests/fake_gh.py (or, for the
+github-script module, a fetch()-based client) and asserts how many requests
+reached the server. Request counts must scale with pages, not items: an N+1
+loop (one request per alert or PR) fails here before it burns real quota.
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT
+from tests.fake_github import FakeGitHub
+
+pytestmark = pytest.mark.skipif(shutil.which("jq") is None, reason="jq not available")
+
+SCRIPTS = REPO_ROOT / ".github" / "scripts"
+REPO = "/repos/owner/repo"
+
+
+def run_script(
+    name: str, env: dict[str, str], cwd: Path, **extra: str
+) -> subprocess.CompletedProcess:
+    result = subprocess.run(
+        ["bash", str(SCRIPTS / name)],
+        cwd=cwd,
+        env={**env, **extra},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return result
+
+
+def ledger(env: dict[str, str]) -> list[list[str]]:
+    lines = Path(env["GH_API_STATS_FILE"]).read_text().splitlines()
+    return [line.split("\t") for line in lines]
+
+
+def seed_security_fixtures(github: FakeGitHub, alerts: int, prs: int) -> None:
+    github.add_collection(
+        f"{REPO}/dependabot/alerts",
+        [
+            {
+                "number": n,
+                "state": "open",
+                "security_advisory": {"severity": "high", "summary": f"Advisory {n}"},
+                "dependency": {
+                    "package": {"name": f"pkg-{n}"},
+                    "manifest_path": "package.json",
+                },
+            }
+            for n in range(1, alerts + 1)
+        ],
+    )
+    github.add_collection(f"{REPO}/code-scanning/alerts", [])
+    github.add_collection(f"{REPO}/secret-scanning/alerts", [])
+    github.add_collection(
+        f"{REPO}/pulls", [{"number": n, "state": "open"} for n in range(1, prs + 1)]
+    )
+    for n in range(1, prs + 1):
+        github.add_collection(
+            f"{REPO}/issues/{n}/comments",
+            [
+                {
+                    "user": {"login": "socket-security[bot]"},
+                    "body": f"Socket report for #{n}",
+                }
+            ],
+        )
+
+
+@pytest.mark.parametrize("alerts", [10, 1000], ids=["10-alerts", "1000-alerts"])
+def test_security_report_requests_scale_with_pages(
+    fake_github: FakeGitHub, fake_gh_env: dict[str, str], tmp_path: Path, alerts: int
+) -> None:
+    seed_security_fixtures(fake_github, alerts=alerts, prs=20)
+
+    run_script(
+        "fetch-security-report.sh",
+        fake_gh_env,
+        tmp_path,
+        REPO="owner/repo",
+        REPORT_PATH=str(tmp_path / "report.md"),
+        ALERTS_PATH=str(tmp_path / "alerts.json"),
+    )
+
+    dependabot_pages = -(-alerts // 100)
+    assert fake_github.count("GET", f"{REPO}/dependabot/alerts") == dependabot_pages
+    assert fake_github.count("GET", f"{REPO}/code-scanning/alerts") == 1
+    assert fake_github.count("GET", f"{REPO}/secret-scanning/alerts") == 1
+    assert fake_github.count("GET", f"{REPO}/pulls") == 1
+    # Only the 5 most recent PRs are checked for Socket comments.
+    comment_fetches = [r for r in fake_github.requests if r.path.endswith("/comments")]
+    assert len(comment_fetches) == 5
+    assert fake_github.count() == dependabot_pages + 3 + 5
+    assert len(json.loads((tmp_path / "alerts.json").read_text())["alerts"]) == alerts
+    assert "Socket report for #1" in (tmp_path / "report.md").read_text()
+
+
+def test_security_report_rides_out_a_rate_limit(
+    fake_github: FakeGitHub, fake_gh_env: dict[str, str], tmp_path: Path
+) -> None:
+    seed_security_fixtures(fake_github, alerts=150, prs=0)
+    fake_github.fail_next(
+        f"{REPO}/dependabot/alerts",
+        403,
+        {"Retry-After": "0"},
+        {"message": "You have exceeded a secondary rate limit."},
+    )
+
+    run_script(
+        "fetch-security-report.sh",
+        fake_gh_env,
+        tmp_path,
+        REPO="owner/repo",
+        REPORT_PATH=str(tmp_path / "report.md"),
+        ALERTS_PATH=str(tmp_path / "alerts.json"),
+    )
+
+    snapshot = json.loads((tmp_path / "alerts.json").read_text())
+    assert snapshot["failed_sources"] == []
+    assert len(snapshot["alerts"]) == 150
+    assert fake_github.count("GET", f"{REPO}/dependabot/alerts") == 3
+    assert [row[7] for row in ledger(fake_gh_env)].count("ratelimited") == 1
+
+
+def test_security_report_overlaps_slow_requests(
+    fake_gh_env: dict[str, str], tmp_path: Path
+) -> None:
+    with FakeGitHub(latency=0.3) as slow:
+        seed_security_fixtures(slow, alerts=10, prs=5)
+        run_script(
+            "fetch-security-report.sh",
+            {**fake_gh_env, "FAKE_GITHUB_URL": slow.url},
+            tmp_path,
+            REPO="owner/repo",
+            REPORT_PATH=str(tmp_path / "report.md"),
+            ALERTS_PATH=str(tmp_path / "alerts.json"),
+        )
+
+    # Ledger rows: start (µs), ..., duration_ms. With latency on every
+    # request, gh_api_map must keep several in flight at once.
+    spans = [(int(r[0]), int(r[0]) + int(r[4]) * 1000) for r in ledger(fake_gh_env)]
+    peak = max(sum(1 for s, e in spans if s <= start < e) for start, _ in spans)
+    assert peak >= 2
+    assert all(int(r[4]) >= 300 for r in ledger(fake_gh_env))
+
+
+def test_list_dependabot_prs_is_one_listing(
+    fake_github: FakeGitHub, fake_gh_env: dict[str, str], tmp_path: Path
+) -> None:
+    fake_github.add_collection(
+        f"{REPO}/pulls",
+        [
+            {
+                "number": n,
+                "state": "open",
+                "title": f"Bump pkg-{n}",
+                "html_url": f"https://github.com/owner/repo/pull/{n}",
+                "head": {"ref": f"dependabot/npm/pkg-{n}", "sha": f"{n:040x}"},
+                "user": {"login": "dependabot[bot]" if n % 4 == 0 else "someone"},
+            }
+            for n in range(1, 81)
+        ],
+    )
+    github_env = tmp_path / "github_env"
+    github_env.write_text("")
+
+    run_script(
+        "list-dependabot-prs.sh", fake_gh_env, tmp_path, GITHUB_ENV=str(github_env)
+    )
+
+    listed = [
+        line for line in github_env.read_text().splitlines() if line.startswith("- #")
+    ]
+    assert len(listed) == 20
+    assert listed[0].startswith("- #4 [dependabot/npm/pkg-4@0000000] Bump pkg-4")
+    assert fake_github.count() == 1
+
+
+def test_check_existing_security_pr_without_match(
+    fake_github: FakeGitHub, fake_gh_env: dict[str, str], tmp_path: Path
+) -> None:
+    fake_github.add_collection(
+        f"{REPO}/pulls", [{"number": 1, "state": "open", "labels": []}]
+    )
+    output = tmp_path / "github_output"
+    output.write_text("")
+
+    run_script(
+        "check-existing-security-pr.sh",
+        fake_gh_env,
+        tmp_path,
+        DEFAULT_BRANCH="main",
+        GITHUB_OUTPUT=str(output),
+    )
+
+    assert output.read_text() == "exists=false\n"
+    assert fake_github.count() == 1
+
+
+def test_request_claude_resolve_posts_one_comment(
+    fake_github: FakeGitHub, fake_gh_env: dict[str, str], tmp_path: Path
+) -> None:
+    fake_github.add_collection(f"{REPO}/issues/7/comments", [])
+
+    run_script(
+        "request-claude-resolve.sh",
+        fake_gh_env,
+        tmp_path,
+        PR_NUM="7",
+        HAS_CONFLICTS="true",
+        CONFLICT_FILES="a.txt b.txt",
+    )
+
+    assert fake_github.count() == 1
+    [comment] = fake_github.collections[f"{REPO}/issues/7/comments"]
+    assert comment["body"].startswith("@claude Resolve this template sync PR")
+    assert "**Resolve conflicts in:** a.txt b.txt" in comment["body"]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node not available")
+def test_phone_home_submit_creates_and_labels_one_issue(
+    fake_github: FakeGitHub, tmp_path: Path
+) -> None:
+    fake_github.add_collection("/repos/tmpl/repo/issues", [])
+    (tmp_path / "lessons.txt").write_text("- Prefer X over Y.\n")
+    wrapper = tmp_path / "run.js"
+    wrapper.write_text(
+        f"""
+const submit = require({json.dumps(str(SCRIPTS / "phone-home-submit.js"))});
+const base = process.env.FAKE_GITHUB_URL;
+async function call(method, path, body) {{
+  const res = await fetch(base + path, {{
+    method,
+    headers: {{ "content-type": "application/json" }},
+    body: JSON.stringify(body),
+  }});
+  if (!res.ok) throw new Error(`HTTP ${{res.status}}`);
+  return {{ data: await res.json() }};
+}}
+const github = {{
+  rest: {{
+    issues: {{
+      create: ({{ owner, repo, ...body }}) => call("POST", `/repos/${{owner}}/${{repo}}/issues`, body),
+      addLabels: ({{ owner, repo, issue_number, labels }}) =>
+        call("POST", `/repos/${{owner}}/${{repo}}/issues/${{issue_number}}/labels`, {{ labels }}),
+    }},
+  }},
+}};
+submit({{ github }}).catch((err) => {{ console.error(err); process.exit(1); }});
+"""
+    )
+    result = subprocess.run(
+        ["node", str(wrapper)],
+        env={
+            "PATH": "/usr/bin:/bin:/usr/local/bin",
+            "FAKE_GITHUB_URL": fake_github.url,
+            "PHONE_HOME_DIR": str(tmp_path),
+            "PR_TITLE": "Fix flaky hook",
+            "PR_URL": "https://github.com/owner/repo/pull/3",
+            "SOURCE_REPO": "owner/repo",
+            "TEMPLATE_REPO": "tmpl/repo",
+        },
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert [(r.method, r.path) for r in fake_github.requests] == [
+        ("POST", "/repos/tmpl/repo/issues"),
+        ("POST", "/repos/tmpl/repo/issues/1/labels"),
+    ]
+    [issue] = fake_github.collections["/repos/tmpl/repo/issues"]
+    assert issue["title"] == "[phone-home] Fix flaky hook"
+    assert fake_github.requests[1].body == {"labels": ["phone-home", "triage"]}
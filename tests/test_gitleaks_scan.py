@@ -0,0 +1,128 @@
+"""Tests for .github/scripts/gitleaks-scan.sh's scan ranges and watermark."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT, commit_all, git_env, init_test_repo
+
+SCRIPT = REPO_ROOT / ".github" / "scripts" / "gitleaks-scan.sh"
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    root = tmp_path / "repo"
+    init_test_repo(root)
+    for name in ("a", "b", "c"):
+        (root / name).write_text(name)
+        commit_all(root, name)
+    return root
+
+
+@pytest.fixture
+def gitleaks(tmp_path: Path) -> Path:
+    """Fake gitleaks: logs its --log-opts and fails when FAKE_LEAK is set."""
+    fake = tmp_path / "gitleaks"
+    fake.write_text(
+        "#!/bin/sh\n"
+        'for a in "$@"; do case "$a" in --log-opts=*) echo "${a#--log-opts=}" >>"$SCAN_LOG";; esac; done\n'
+        '[ -z "$FAKE_LEAK" ]\n'
+    )
+    fake.chmod(0o755)
+    return fake
+
+
+def rev(repo: Path, ref: str) -> str:
+    return subprocess.run(
+        ["git", "rev-parse", ref], cwd=repo, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def scan(
+    repo: Path, gitleaks: Path, **env: str
+) -> tuple[subprocess.CompletedProcess, list[str]]:
+    log = repo.parent / "scan.log"
+    log.unlink(missing_ok=True)
+    result = subprocess.run(
+        ["bash", str(SCRIPT)],
+        cwd=repo,
+        env={**git_env(), "GITLEAKS_BIN": str(gitleaks), "SCAN_LOG": str(log), **env},
+        capture_output=True,
+        text=True,
+    )
+    return result, log.read_text().splitlines() if log.exists() else []
+
+
+def test_pull_request_scans_from_merge_base(repo: Path, gitleaks: Path) -> None:
+    base = rev(repo, "HEAD~2")
+    result, ranges = scan(repo, gitleaks, BASE_SHA=base)
+    assert result.returncode == 0, result.stderr
+    assert ranges == [f"{base}..HEAD"]
+
+
+def test_push_without_watermark_scans_full_history(repo: Path, gitleaks: Path) -> None:
+    watermark = repo.parent / "watermark"
+    result, ranges = scan(repo, gitleaks, GITLEAKS_WATERMARK_FILE=str(watermark))
+    assert result.returncode == 0, result.stderr
+    assert ranges == ["HEAD"]
+    assert watermark.read_text() == rev(repo, "HEAD") + "\n"
+
+
+def test_push_scans_only_new_commits(repo: Path, gitleaks: Path) -> None:
+    watermark = repo.parent / "watermark"
+    old = rev(repo, "HEAD~1")
+    watermark.write_text(old + "\n")
+
+    result, ranges = scan(repo, gitleaks, GITLEAKS_WATERMARK_FILE=str(watermark))
+
+    assert result.returncode == 0, result.stderr
+    assert ranges == [f"{old}..HEAD"]
+    assert "scanning 1 commit(s)" in result.stdout
+    assert watermark.read_text() == rev(repo, "HEAD") + "\n"
+
+
+def test_already_scanned_head_skips_gitleaks(repo: Path, gitleaks: Path) -> None:
+    watermark = repo.parent / "watermark"
+    watermark.write_text(rev(repo, "HEAD") + "\n")
+    result, ranges = scan(repo, gitleaks, GITLEAKS_WATERMARK_FILE=str(watermark))
+    assert result.returncode == 0, result.stderr
+    assert ranges == []
+
+
+@pytest.mark.parametrize("stale", ["0" * 40, "not-a-sha"])
+def test_unusable_watermark_falls_back_to_full_scan(
+    repo: Path, gitleaks: Path, stale: str
+) -> None:
+    watermark = repo.parent / "watermark"
+    watermark.write_text(stale + "\n")
+    result, ranges = scan(repo, gitleaks, GITLEAKS_WATERMARK_FILE=str(watermark))
+    assert result.returncode == 0, result.stderr
+    assert ranges == ["HEAD"]
+    assert "::notice::" in result.stdout
+
+
+def test_full_scan_mode_ignores_watermark(repo: Path, gitleaks: Path) -> None:
+    watermark = repo.parent / "watermark"
+    watermark.write_text(rev(repo, "HEAD~1") + "\n")
+    result, ranges = scan(
+        repo, gitleaks, GITLEAKS_WATERMARK_FILE=str(watermark), GITLEAKS_FULL_SCAN="1"
+    )
+    assert result.returncode == 0, result.stderr
+    assert ranges == ["HEAD"]
+    assert watermark.read_text() == rev(repo, "HEAD") + "\n"
+
+
+def test_findings_do_not_advance_watermark(repo: Path, gitleaks: Path) -> None:
+    watermark = repo.parent / "watermark"
+    old = rev(repo, "HEAD~1")
+    watermark.write_text(old + "\n")
+    (repo / "d").write_text("d")
+    commit_all(repo, "d")
+
+    result, _ = scan(
+        repo, gitleaks, GITLEAKS_WATERMARK_FILE=str(watermark), FAKE_LEAK="1"
+    )
+
+    assert result.returncode != 0
+    assert watermark.read_text() == old + "\n"
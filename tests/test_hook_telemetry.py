@@ -0,0 +1,125 @@
+"""Tests for .hooks/telemetry.bash and .github/scripts/hook-telemetry-report.sh."""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT, git_env, init_test_repo
+
+REPORT = REPO_ROOT / ".github" / "scripts" / "hook-telemetry-report.sh"
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    init_test_repo(tmp_path)
+    shutil.copytree(REPO_ROOT / ".hooks", tmp_path / ".hooks")
+    (tmp_path / "a.txt").write_text("one\n")
+    subprocess.run(["git", "add", "a.txt"], cwd=tmp_path, env=git_env(), check=True)
+    return tmp_path
+
+
+def run(repo: Path, *args: str, **env: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["bash", *args],
+        cwd=repo,
+        env={**git_env(), **env},
+        capture_output=True,
+        text=True,
+    )
+
+
+def records(repo: Path) -> list[dict]:
+    log = repo / ".git" / "hook-telemetry.jsonl"
+    return [json.loads(line) for line in log.read_text().splitlines()]
+
+
+def test_disabled_by_default(repo: Path) -> None:
+    assert run(repo, ".hooks/pre-commit").returncode == 0
+    assert not (repo / ".git" / "hook-telemetry.jsonl").exists()
+
+
+def test_records_one_line_per_run(repo: Path) -> None:
+    result = run(repo, ".hooks/pre-commit", HOOK_TELEMETRY="1", PRE_COMMIT_CACHE="0")
+
+    assert result.returncode == 0, result.stderr
+    [record] = records(repo)
+    assert record["hook"] == "pre-commit"
+    assert record["phase"] == "pre-commit"
+    assert record["exit"] == 0
+    assert record["staged_files"] == 1
+    assert isinstance(record["wall_ms"], int) and record["wall_ms"] >= 0
+
+
+def test_preserves_exit_status_and_arguments(repo: Path) -> None:
+    skill = repo / ".claude" / "skills" / "broken" / "SKILL.md"
+    skill.parent.mkdir(parents=True)
+    skill.write_text("# no frontmatter\n")
+
+    result = run(repo, ".hooks/lint-skills.sh", str(skill), HOOK_TELEMETRY="1")
+
+    assert result.returncode == 1
+    assert "missing YAML frontmatter" in result.stderr
+    assert [(r["hook"], r["exit"]) for r in records(repo)] == [("lint-skills", 1)]
+
+
+def test_nested_hooks_record_separately(repo: Path, tmp_path: Path) -> None:
+    """A hook called from a wrapped hook (lint-skills under pre-commit) still records."""
+    outer = repo / ".hooks" / "outer"
+    outer.write_text(
+        "set -euo pipefail\n"
+        'if [[ "${HOOK_TELEMETRY:-0}" == "1" && "${HOOK_TELEMETRY_ACTIVE:-}" != "$0" ]]; then\n'
+        '  source "$(dirname "${BASH_SOURCE[0]}")/telemetry.bash"\n'
+        '  telemetry_wrap outer pre-commit "$@"\n'
+        "fi\n"
+        "bash .hooks/lint-skills.sh\n"
+    )
+
+    assert run(repo, ".hooks/outer", HOOK_TELEMETRY="1").returncode == 0
+    assert sorted(r["hook"] for r in records(repo)) == ["lint-skills", "outer"]
+
+
+def test_report_prints_percentiles_slowest_first(tmp_path: Path) -> None:
+    log = tmp_path / "telemetry.jsonl"
+    lines = [
+        {"hook": "pre-commit", "phase": "pre-commit", "wall_ms": ms, "exit": 0}
+        for ms in range(10, 110, 10)
+    ]
+    lines += [
+        {"hook": "commit-msg", "phase": "commit-msg", "wall_ms": 5, "exit": 0},
+        {"hook": "commit-msg", "phase": "commit-msg", "wall_ms": 7, "exit": 1},
+    ]
+    log.write_text("\n".join(json.dumps(line) for line in lines) + '\n{"truncated\n')
+
+    result = subprocess.run(
+        ["bash", str(REPORT), str(log)], capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+    header, slow, fast = result.stdout.splitlines()
+    assert (
+        header.split() == "hook phase runs failed p50_ms p90_ms p99_ms max_ms".split()
+    )
+    assert slow.split() == [
+        "pre-commit",
+        "pre-commit",
+        "10",
+        "0",
+        "50",
+        "90",
+        "100",
+        "100",
+    ]
+    assert fast.split() == ["commit-msg", "commit-msg", "2", "1", "5", "7", "7", "7"]
+
+
+def test_report_without_log(tmp_path: Path) -> None:
+    result = subprocess.run(
+        ["bash", str(REPORT), str(tmp_path / "missing.jsonl")],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 1
+    assert "HOOK_TELEMETRY=1" in result.stderr
@@ -1,10 +1,14 @@
 """Tests for .hooks/lint-skills.sh."""
 
+import json
+import os
 import subprocess
 from pathlib import Path
 
 import pytest
 
+from tests._helpers import git_env, init_test_repo
+
 
 def write_skill(sandbox: Path, name: str, body: str) -> Path:
     path = sandbox / ".claude" / "skills" / name / "SKILL.md"
@@ -96,3 +100,111 @@ def test_rejects_unclosed_frontmatter(tmp_path: Path, copy_script) -> None:
     result = run_lint(tmp_path, copy_script, skill)
     assert result.returncode == 1
     assert "closing" in result.stderr
+
+
+def test_reports_every_file_in_argument_order(tmp_path: Path, copy_script) -> None:
+    """One invocation lints all files and keeps per-file diagnostics in order."""
+    good = write_skill(tmp_path, "good", VALID_SKILL)
+    empty = write_skill(tmp_path, "empty", "")
+    no_name = write_skill(
+        tmp_path, "no-name", "---\ndescription: A skill. Two sentences.\n---\n"
+    )
+    flat = tmp_path / ".claude" / "skills" / "flat.md"
+    flat.write_text(VALID_SKILL)
+    support = tmp_path / ".claude" / "skills" / "good" / "reference.md"
+    support.write_text("not a skill\n")
+
+    result = run_lint(tmp_path, copy_script, good, empty, support, no_name, flat)
+
+    assert result.returncode == 1
+    assert result.stderr.splitlines() == [
+        f"ERROR: {empty} missing YAML frontmatter (must start with ---)",
+        f"ERROR: {no_name} missing 'name:' in frontmatter",
+        f"WARN: {no_name} missing '## Examples' section — consider adding 2-3 real"
+        " input/output examples",
+        f"ERROR: {flat} uses flat file format — convert to .claude/skills/flat/SKILL.md",
+    ]
+
+
+def run_manifest(sandbox: Path, copy_script, **env: str) -> subprocess.CompletedProcess:
+    script = copy_script("lint-skills.sh", sandbox)
+    return subprocess.run(
+        ["bash", str(script), "--manifest"],
+        cwd=sandbox,
+        env={**git_env(), **env},
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_manifest_indexes_every_skill(tmp_path: Path, copy_script) -> None:
+    write_skill(tmp_path, "example", VALID_SKILL)
+    write_skill(
+        tmp_path,
+        "folded",
+        "---\nname: folded\ndescription: >\n  Spans lines. Activate on bar.\n---\n# Body\n",
+    )
+
+    result = run_manifest(tmp_path, copy_script)
+
+    assert result.returncode == 0, result.stderr
+    manifest = json.loads((tmp_path / ".claude" / "skills-manifest.json").read_text())
+    assert manifest["version"] == 1
+    example, folded = manifest["skills"]
+    assert example == {
+        "name": "example",
+        "description": "This skill does a thing. Activate when the user says foo.",
+        "path": ".claude/skills/example/SKILL.md",
+        "hash": subprocess.run(
+            ["git", "hash-object", example["path"]],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip(),
+        "has_examples": True,
+    }
+    assert folded["description"] == "Spans lines. Activate on bar."
+    assert folded["has_examples"] is False
+
+
+def test_manifest_rewritten_only_when_stale(tmp_path: Path, copy_script) -> None:
+    skill = write_skill(tmp_path, "example", VALID_SKILL)
+    manifest = tmp_path / ".claude" / "skills-manifest.json"
+    run_manifest(tmp_path, copy_script)
+    before = manifest.read_text()
+
+    unchanged = run_manifest(tmp_path, copy_script)
+    assert "updated" not in unchanged.stderr
+    assert manifest.read_text() == before
+
+    skill.write_text(VALID_SKILL + "\nMore detail.\n")
+    changed = run_manifest(tmp_path, copy_script)
+    assert "updated .claude/skills-manifest.json" in changed.stderr
+    assert manifest.read_text() != before
+
+
+def test_manifest_staged_inside_git_hook(tmp_path: Path, copy_script) -> None:
+    init_test_repo(tmp_path)
+    write_skill(tmp_path, "example", VALID_SKILL)
+    index = subprocess.run(
+        ["git", "rev-parse", "--git-path", "index"],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+
+    result = run_manifest(
+        tmp_path, copy_script, GIT_INDEX_FILE=os.path.join(tmp_path, index)
+    )
+
+    assert result.returncode == 0, result.stderr
+    staged = subprocess.run(
+        ["git", "diff", "--cached", "--name-only"],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    assert staged == [".claude/skills-manifest.json"]
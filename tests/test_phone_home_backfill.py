@@ -0,0 +1,159 @@
+"""Tests for .github/scripts/phone-home-backfill.js, run through the fake
+`gh` against FakeGitHub's GraphQL pullRequests connection."""
+
+import hashlib
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT
+from tests.fake_github import FakeGitHub
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("node") is None, reason="node not available"
+)
+
+SCRIPT = REPO_ROOT / ".github" / "scripts" / "phone-home-backfill.js"
+LESSONS = [
+    "- Cache tool downloads under XDG_CACHE_HOME keyed by version.",
+    "- Retry flaky network calls with exponential backoff and jitter.",
+    "- Quote every shell variable expansion to avoid word splitting.",
+    "- Give each CI job a timeout-minutes so hung runners fail fast.",
+    "- Session-scoped pytest fixtures cut repo setup from tests.",
+    "- Structured JSON logs make hook telemetry easy to aggregate.",
+    "- Trap SIGTERM in daemons so sockets get unlinked on shutdown.",
+]
+
+
+def node(number: int, body: str) -> dict:
+    return {
+        "number": number,
+        "title": f"Change {number}",
+        "url": f"https://github.com/owner/repo/pull/{number}",
+        "mergedAt": "2025-01-01T00:00:00Z",
+        "body": body,
+    }
+
+
+def lessons_body(text: str) -> str:
+    return (
+        f"## Summary\n\nStuff.\n\n## Lessons Learned\n\n{text}\n\n## Notes\n\nnoise\n"
+    )
+
+
+def history(count: int) -> list[dict]:
+    """COUNT merged PRs: every third has no lessons, and the rest cycle
+    through LESSONS, so most are repeats."""
+    nodes = []
+    for n in range(1, count + 1):
+        if n % 3 == 0:
+            nodes.append(node(n, "Routine change."))
+        else:
+            nodes.append(node(n, lessons_body(LESSONS[n % len(LESSONS)])))
+    return nodes
+
+
+def run(env: dict[str, str], out: Path) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["node", str(SCRIPT), "owner/repo", str(out)],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def corpus(out: Path) -> list[dict]:
+    return [
+        json.loads(line) for line in (out / "corpus.jsonl").read_text().splitlines()
+    ]
+
+
+def test_backfill_pages_and_deduplicates(
+    fake_github: FakeGitHub, fake_gh_env: dict[str, str], tmp_path: Path
+) -> None:
+    fake_github.graphql_pull_requests["owner/repo"] = history(250)
+    out = tmp_path / "out"
+
+    result = run(fake_gh_env, out)
+
+    assert result.returncode == 0, result.stderr
+    assert fake_github.count("POST", "/graphql") == 3
+    entries = corpus(out)
+    # One entry per distinct lesson, from the first PR that raised it.
+    assert len(entries) == len(LESSONS)
+    assert [e["number"] for e in entries] == [1, 2, 4, 5, 7, 10, 13]
+    assert entries[0] == {
+        "number": 1,
+        "title": "Change 1",
+        "url": "https://github.com/owner/repo/pull/1",
+        "mergedAt": "2025-01-01T00:00:00Z",
+        "lessons": LESSONS[1],
+    }
+    assert "Scanned 250 merged PR(s): 7 new lesson(s)" in result.stderr
+    assert json.loads((out / "checkpoint.json").read_text()) == {"cursor": "250"}
+
+
+def test_backfill_resumes_from_checkpoint(
+    fake_github: FakeGitHub, fake_gh_env: dict[str, str], tmp_path: Path
+) -> None:
+    fake_github.graphql_pull_requests["owner/repo"] = [
+        node(n, lessons_body(f"- {hashlib.sha256(str(n).encode()).hexdigest()}"))
+        for n in range(1, 251)
+    ]
+    out = tmp_path / "out"
+    fake_github.remaining = 2  # the third page request is rate limited
+
+    failed = run(fake_gh_env, out)
+
+    assert failed.returncode == 1
+    assert json.loads((out / "checkpoint.json").read_text()) == {"cursor": "200"}
+    assert len(corpus(out)) == 200
+
+    fake_github.remaining = 5000
+    fake_github.requests.clear()
+    resumed = run(fake_gh_env, out)
+
+    assert resumed.returncode == 0, resumed.stderr
+    assert "Resuming after cursor 200 (200 lessons so far)" in resumed.stderr
+    [request] = fake_github.requests
+    assert request.body["variables"]["after"] == "200"
+    assert [e["number"] for e in corpus(out)] == list(range(1, 251))
+
+
+def test_backfill_rejects_bad_slug(fake_gh_env: dict[str, str], tmp_path: Path) -> None:
+    result = subprocess.run(
+        ["node", str(SCRIPT), "not-a-slug", str(tmp_path / "out")],
+        env=fake_gh_env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 1
+    assert 'expected OWNER/REPO, got "not-a-slug"' in result.stderr
+
+
+def test_failed_prefetch_after_a_processing_error_is_handled(
+    fake_github: FakeGitHub, fake_gh_env: dict[str, str], tmp_path: Path
+) -> None:
+    """A caller that catches backfill()'s error and carries on doesn't also
+    get an unhandled rejection from the abandoned next-page request."""
+    fake_github.graphql_pull_requests["owner/repo"] = history(150)
+    fake_github.remaining = 1  # the prefetched second page is rate limited
+    out = tmp_path / "out"
+    out.mkdir()
+    # Writing the first page's lessons fails.
+    (out / "corpus.jsonl").symlink_to(tmp_path / "missing" / "corpus.jsonl")
+    caller = (
+        f"require({json.dumps(str(SCRIPT))}).backfill('owner/repo', {json.dumps(str(out))})"
+        ".catch((e) => console.log('caught', e.code))"
+        ".then(() => setTimeout(() => console.log('still running'), 1000));"
+    )
+
+    result = subprocess.run(
+        ["node", "-e", caller], env=fake_gh_env, capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == ["caught ENOENT", "still running"]
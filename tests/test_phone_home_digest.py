@@ -0,0 +1,171 @@
+"""Tests for .github/scripts/phone-home-digest.js, run against FakeGitHub."""
+
+import json
+import shutil
+import subprocess
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT
+from tests.fake_github import FakeGitHub
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("node") is None, reason="node not available"
+)
+
+SCRIPT = REPO_ROOT / ".github" / "scripts" / "phone-home-digest.js"
+PULLS = "/repos/owner/repo/pulls"
+
+
+def ago(hours: float) -> str:
+    moment = datetime.now(timezone.utc) - timedelta(hours=hours)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def pull(number: int, body: str, merged_hours_ago: float | None) -> dict:
+    merged_at = None if merged_hours_ago is None else ago(merged_hours_ago)
+    return {
+        "number": number,
+        "title": f"Change {number}",
+        "state": "closed",
+        "html_url": f"https://github.com/owner/repo/pull/{number}",
+        "body": body,
+        "merged_at": merged_at,
+        "updated_at": merged_at or ago(1),
+    }
+
+
+def lessons(text: str) -> str:
+    return (
+        f"## Summary\n\nStuff.\n\n## Lessons Learned\n\n{text}\n\n## Notes\n\nnoise\n"
+    )
+
+
+def run_digest(
+    github: FakeGitHub, tmp_path: Path, state: Path, repo: str = "owner/repo"
+) -> tuple[dict, subprocess.CompletedProcess]:
+    wrapper = tmp_path / "run.js"
+    out_file = tmp_path / "outputs.json"
+    wrapper.write_text(
+        f"""
+const fs = require("fs");
+const digest = require({json.dumps(str(SCRIPT))});
+const outputs = {{}};
+const core = {{ setOutput: (k, v) => {{ outputs[k] = v; }} }};
+const [owner, repo] = process.env.REPO.split("/");
+const github = {{
+  rest: {{
+    pulls: {{
+      list: async ({{ owner, repo, ...query }}) => {{
+        const res = await fetch(
+          `${{process.env.FAKE_GITHUB_URL}}/repos/${{owner}}/${{repo}}/pulls?` + new URLSearchParams(query),
+        );
+        if (!res.ok) throw new Error(`HTTP ${{res.status}}`);
+        return {{ data: await res.json() }};
+      }},
+    }},
+  }},
+}};
+digest({{ github, context: {{ repo: {{ owner, repo }} }}, core }}).then(() => {{
+  fs.writeFileSync(process.env.OUT_FILE, JSON.stringify(outputs));
+}}).catch((err) => {{
+  process.stderr.write(err.message + "\\n");
+  process.exit(1);
+}});
+"""
+    )
+    result = subprocess.run(
+        ["node", str(wrapper)],
+        env={
+            "PATH": "/usr/bin:/bin:/usr/local/bin",
+            "FAKE_GITHUB_URL": github.url,
+            "REPO": repo,
+            "TEMPLATE_REPO": "tmpl/repo",
+            "PHONE_HOME_DIR": str(tmp_path / "phone-home"),
+            "PHONE_HOME_DIGEST_STATE": str(state),
+            "OUT_FILE": str(out_file),
+        },
+        capture_output=True,
+        text=True,
+    )
+    outputs = json.loads(out_file.read_text()) if out_file.exists() else {}
+    return outputs, result
+
+
+def test_digest_aggregates_lessons_since_last_run(
+    fake_github: FakeGitHub, tmp_path: Path
+) -> None:
+    fake_github.add_collection(
+        PULLS,
+        [
+            pull(4, lessons("- Fourth lesson about caching."), 1),
+            pull(3, "No lessons here.", 2),
+            pull(5, lessons("- Closed without merging."), None),
+            pull(2, lessons("- Second lesson about retries."), 3),
+            pull(1, lessons("- Before the window."), 30),
+        ],
+    )
+    state = tmp_path / "state" / "since"
+    state.parent.mkdir()
+    state.write_text(ago(24) + "\n")
+
+    outputs, result = run_digest(fake_github, tmp_path, state)
+
+    assert result.returncode == 0, result.stderr
+    assert outputs["has_lessons"] == "true"
+    assert outputs["pr_title"].startswith("Lessons digest: 2 merged PR(s), ")
+    assert outputs["source_repo"] == "owner/repo"
+    assert "is%3Amerged" in outputs["pr_url"]
+    content = (tmp_path / "phone-home" / "lessons.txt").read_text()
+    assert content == (
+        "**[#2](https://github.com/owner/repo/pull/2) Change 2**\n\n- Second lesson about retries.\n\n"
+        "**[#4](https://github.com/owner/repo/pull/4) Change 4**\n\n- Fourth lesson about caching."
+    )
+    assert state.read_text().strip() > ago(0.1)
+    # Listing stopped at the first page reaching past the window start.
+    assert fake_github.count("GET", PULLS) == 1
+
+
+def test_digest_pages_until_window_start(
+    fake_github: FakeGitHub, tmp_path: Path
+) -> None:
+    merged = [
+        pull(n, lessons(f"- Lesson number {n} for paging."), n / 100)
+        for n in range(1, 151)
+    ]
+    fake_github.add_collection(
+        PULLS, merged + [pull(999, lessons("- Too old."), 48)] * 100
+    )
+    state = tmp_path / "since"
+    state.write_text(ago(24))
+
+    outputs, result = run_digest(fake_github, tmp_path, state)
+
+    assert result.returncode == 0, result.stderr
+    assert outputs["pr_title"].startswith("Lessons digest: 150 merged PR(s)")
+    assert fake_github.count("GET", PULLS) == 2
+
+
+def test_no_lessons_still_advances_window(
+    fake_github: FakeGitHub, tmp_path: Path
+) -> None:
+    fake_github.add_collection(PULLS, [pull(1, "Nothing to report.", 1)])
+    state = tmp_path / "since"
+
+    outputs, result = run_digest(fake_github, tmp_path, state)
+
+    assert result.returncode == 0, result.stderr
+    assert outputs == {}
+    assert not (tmp_path / "phone-home" / "lessons.txt").exists()
+    assert state.read_text().strip() > ago(0.1)
+
+
+def test_template_repo_is_skipped(fake_github: FakeGitHub, tmp_path: Path) -> None:
+    outputs, result = run_digest(
+        fake_github, tmp_path, tmp_path / "since", repo="tmpl/repo"
+    )
+    assert result.returncode == 0, result.stderr
+    assert outputs == {}
+    assert fake_github.count() == 0
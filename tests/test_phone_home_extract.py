@@ -4,6 +4,7 @@ import json
 import os
 import shutil
 import subprocess
+import time
 from pathlib import Path
 
 import pytest
@@ -21,9 +22,6 @@ REPO_ROOT = Path(
     ).stdout.strip()
 )
 SCRIPT = REPO_ROOT / ".github" / "scripts" / "phone-home-extract.js"
-# The script hardcodes this output dir, so these tests must run serially
-# (no pytest-xdist); the autouse fixture clears it before/after each test.
-PHONE_HOME_DIR = Path("/tmp/phone-home")
 
 
 def run_extract(
@@ -69,6 +67,7 @@ extract({{ context, core }}).then(() => {{
         "REPO": repo,
         "TEMPLATE_REPO": template_repo,
         "OUT_FILE": str(out_file),
+        "PHONE_HOME_DIR": str(tmp_path / "phone-home"),
     }
     result = subprocess.run(
         ["node", str(wrapper)], env=env, capture_output=True, text=True
@@ -84,15 +83,6 @@ extract({{ context, core }}).then(() => {{
     return outputs, result
 
 
-@pytest.fixture(autouse=True)
-def clean_phone_home_dir():
-    """Remove any stale lessons.txt before each test."""
-    lessons = PHONE_HOME_DIR / "lessons.txt"
-    lessons.unlink(missing_ok=True)
-    yield
-    lessons.unlink(missing_ok=True)
-
-
 def test_extracts_lessons_with_double_hash(tmp_path: Path) -> None:
     pr_body = (
         "## Summary\n\nSome changes.\n\n"
@@ -103,7 +93,7 @@ def test_extracts_lessons_with_double_hash(tmp_path: Path) -> None:
     outputs, result = run_extract(tmp_path, pr_body)
     assert result.returncode == 0, result.stderr
     assert outputs.get("has_lessons") == "true"
-    content = (PHONE_HOME_DIR / "lessons.txt").read_text()
+    content = (tmp_path / "phone-home" / "lessons.txt").read_text()
     assert "Use jq instead of node for JSON parsing." in content
     assert "Nothing." not in content  # the following ## section must terminate
 
@@ -120,7 +110,7 @@ def test_extracts_lessons_with_triple_hash(tmp_path: Path) -> None:
     outputs, result = run_extract(tmp_path, pr_body)
     assert result.returncode == 0, result.stderr
     assert outputs.get("has_lessons") == "true"
-    content = (PHONE_HOME_DIR / "lessons.txt").read_text()
+    content = (tmp_path / "phone-home" / "lessons.txt").read_text()
     assert "Always validate input before processing." in content
     assert "noise-after-section." not in content
 
@@ -133,7 +123,7 @@ def test_lessons_not_cut_short_by_internal_blank_line(tmp_path: Path) -> None:
     outputs, result = run_extract(tmp_path, pr_body)
     assert result.returncode == 0, result.stderr
     assert outputs.get("has_lessons") == "true"
-    content = (PHONE_HOME_DIR / "lessons.txt").read_text()
+    content = (tmp_path / "phone-home" / "lessons.txt").read_text()
     assert "First bullet." in content
     assert "Second bullet after blank line." in content
 
@@ -170,5 +160,75 @@ def test_filters_session_links(tmp_path: Path) -> None:
     outputs, result = run_extract(tmp_path, pr_body)
     assert result.returncode == 0, result.stderr
     assert outputs.get("has_lessons") == "true"
-    content = (PHONE_HOME_DIR / "lessons.txt").read_text()
+    content = (tmp_path / "phone-home" / "lessons.txt").read_text()
     assert "claude.ai" not in content
+
+
+def extract_lessons(body_js: str) -> dict | None:
+    """Call the exported extractLessons on a body built by a JS expression, so
+    bodies can exceed the environment-variable size limit."""
+    result = subprocess.run(
+        [
+            "node",
+            "-e",
+            f"const {{ extractLessons }} = require({json.dumps(str(SCRIPT))});"
+            f"process.stdout.write(JSON.stringify(extractLessons({body_js})));",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=30,
+    )
+    return json.loads(result.stdout)
+
+
+def test_multiline_comments_are_stripped_and_joined() -> None:
+    body = "## Lessons Learned\nKeep <!-- a\nplaceholder\n--> this line.\n<!-- unclosed\nstays\n"
+    assert extract_lessons(json.dumps(body)) == {
+        "section": "Keep <!-- a\nplaceholder\n--> this line.\n<!-- unclosed\nstays",
+        "filtered": "Keep  this line.\n<!-- unclosed\nstays",
+    }
+
+
+def test_crlf_body_and_immediate_next_heading() -> None:
+    assert extract_lessons(json.dumps("## Lessons Learned\r\n- CRLF lesson\r\n")) == {
+        "section": "- CRLF lesson",
+        "filtered": "- CRLF lesson",
+    }
+    # A heading straight after the section heading means the section is empty;
+    # it must not swallow the next section.
+    assert extract_lessons(json.dumps("## Lessons Learned\n## Other\ntext\n")) == {
+        "section": "",
+        "filtered": "",
+    }
+
+
+@pytest.mark.parametrize(
+    "body_js",
+    [
+        # Long whitespace runs made the old `\s*$` lookahead quadratic.
+        '"## Lessons Learned\\n" + " \\n".repeat(30000) + "x"',
+        # Unclosed comment openers made `<!--[\s\S]*?-->` rescan to the end.
+        '"## Lessons Learned\\n" + "<!--".repeat(16000)',
+    ],
+    ids=["whitespace-runs", "unclosed-comments"],
+)
+def test_pathological_bodies_are_fast(body_js: str) -> None:
+    start = time.monotonic()
+    assert extract_lessons(body_js) is not None
+    assert time.monotonic() - start < 2
+
+
+def test_oversized_body_is_capped() -> None:
+    start = time.monotonic()
+    lessons = extract_lessons(
+        '"## Lessons Learned\\n" + "- lesson\\n".repeat(1000000) + "## Late\\n"'
+    )
+    assert time.monotonic() - start < 5
+    assert lessons is not None
+    assert len(lessons["section"]) < 65536
+
+    late = extract_lessons(
+        '"x".repeat(70000) + "\\n## Lessons Learned\\n- too late to find\\n"'
+    )
+    assert late is None
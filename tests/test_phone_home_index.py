@@ -0,0 +1,223 @@
+"""Tests for .github/scripts/phone-home-index.js and duplicate handling in
+phone-home-submit.js, run against FakeGitHub."""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT
+from tests.fake_github import FakeGitHub
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("node") is None, reason="node not available"
+)
+
+SCRIPTS = REPO_ROOT / ".github" / "scripts"
+ISSUES = "/repos/tmpl/repo/issues"
+LESSON = "- Use jq instead of node for JSON parsing in hooks; node startup adds 40ms per call."
+
+
+def similarity(a: str, b: str) -> float:
+    result = subprocess.run(
+        [
+            "node",
+            "-e",
+            f"const ix = require({json.dumps(str(SCRIPTS / 'phone-home-index.js'))});"
+            "const [a, b] = JSON.parse(process.argv[1]);"
+            "process.stdout.write(String(ix.similarity(ix.signature(a), ix.signature(b))));",
+            json.dumps([a, b]),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout)
+
+
+def test_formatting_differences_are_ignored() -> None:
+    reformatted = "* use `jq` instead of `node` for JSON parsing in hooks -- Node startup adds 40ms per call"
+    assert similarity(LESSON, reformatted) == 1.0
+
+
+def test_unrelated_lessons_are_dissimilar() -> None:
+    other = "- Always quote shell variables to avoid word splitting in scripts."
+    assert similarity(LESSON, other) < 0.2
+
+
+def issue(number: int, lessons: str, updated_at: str = "2026-01-01T00:00:00Z") -> dict:
+    return {
+        "number": number,
+        "title": f"[phone-home] PR {number}",
+        "state": "open",
+        "updated_at": updated_at,
+        "html_url": f"https://github.com/tmpl/repo/issues/{number}",
+        "body": (
+            "## Improvement Suggestion from `a/b`\n\n## Lessons Learned\n\n"
+            f"{lessons}\n\n---\n*Automatically submitted*"
+        ),
+    }
+
+
+def submit(
+    github: FakeGitHub, tmp_path: Path, lessons: str, index: Path
+) -> subprocess.CompletedProcess:
+    (tmp_path / "lessons.txt").write_text(lessons)
+    wrapper = tmp_path / "run.js"
+    wrapper.write_text(
+        f"""
+const submit = require({json.dumps(str(SCRIPTS / "phone-home-submit.js"))});
+const base = process.env.FAKE_GITHUB_URL;
+async function call(method, path, body, query) {{
+  const qs = query ? "?" + new URLSearchParams(query) : "";
+  const res = await fetch(base + path + qs, {{
+    method,
+    headers: {{ "content-type": "application/json" }},
+    body: body && JSON.stringify(body),
+  }});
+  if (!res.ok) throw new Error(`HTTP ${{res.status}}`);
+  return {{ data: await res.json() }};
+}}
+const github = {{
+  rest: {{
+    issues: {{
+      create: ({{ owner, repo, ...body }}) => call("POST", `/repos/${{owner}}/${{repo}}/issues`, body),
+      addLabels: ({{ owner, repo, issue_number, labels }}) =>
+        call("POST", `/repos/${{owner}}/${{repo}}/issues/${{issue_number}}/labels`, {{ labels }}),
+      createComment: ({{ owner, repo, issue_number, body }}) =>
+        call("POST", `/repos/${{owner}}/${{repo}}/issues/${{issue_number}}/comments`, {{ body }}),
+      listForRepo: ({{ owner, repo, ...query }}) =>
+        call("GET", `/repos/${{owner}}/${{repo}}/issues`, undefined, query),
+    }},
+  }},
+}};
+const core = {{ setOutput: (name, value) => console.log(`output ${{name}}=${{value}}`) }};
+submit({{ github, core }}).catch((err) => {{ console.error(err); process.exit(1); }});
+"""
+    )
+    return subprocess.run(
+        ["node", str(wrapper)],
+        env={
+            "PATH": "/usr/bin:/bin:/usr/local/bin",
+            "FAKE_GITHUB_URL": github.url,
+            "PHONE_HOME_DIR": str(tmp_path),
+            "PR_TITLE": "Fix flaky hook",
+            "PR_URL": "https://github.com/owner/repo/pull/3",
+            "SOURCE_REPO": "owner/repo",
+            "TEMPLATE_REPO": "tmpl/repo",
+            "PHONE_HOME_INDEX": str(index),
+        },
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_duplicate_lesson_becomes_a_comment(
+    fake_github: FakeGitHub, tmp_path: Path
+) -> None:
+    fake_github.add_collection(
+        ISSUES,
+        [issue(1, "- Pin actions by SHA."), issue(2, LESSON, "2026-02-01T00:00:00Z")],
+    )
+    fake_github.add_collection(f"{ISSUES}/2/comments", [])
+    index = tmp_path / "cache" / "index.json"
+
+    result = submit(fake_github, tmp_path, LESSON.replace("jq", "`jq`") + "\n", index)
+
+    assert result.returncode == 0, result.stderr
+    assert "Lessons match #2" in result.stdout
+    assert "output submitted=true" in result.stdout
+    assert [(r.method, r.path) for r in fake_github.requests] == [
+        ("GET", ISSUES),
+        ("POST", f"{ISSUES}/2/comments"),
+    ]
+    [comment] = fake_github.collections[f"{ISSUES}/2/comments"]
+    assert comment["body"].startswith("### Also reported from `owner/repo`")
+    cached = json.loads(index.read_text())
+    assert cached["updatedAt"] == "2026-02-01T00:00:00Z"
+    assert [e["number"] for e in cached["entries"]] == [1, 2]
+
+
+def test_warm_index_lists_only_updated_issues(
+    fake_github: FakeGitHub, tmp_path: Path
+) -> None:
+    fake_github.add_collection(ISSUES, [issue(1, LESSON, "2026-02-01T00:00:00Z")])
+    fake_github.add_collection(f"{ISSUES}/1/comments", [])
+    index = tmp_path / "index.json"
+    submit(fake_github, tmp_path, LESSON, index)
+
+    result = submit(fake_github, tmp_path, LESSON, index)
+
+    assert result.returncode == 0, result.stderr
+    listings = [r for r in fake_github.requests if r.method == "GET"]
+    assert "since" not in listings[0].query
+    assert listings[1].query["since"] == "2026-02-01T00:00:00Z"
+
+
+def test_new_lesson_opens_issue_and_is_indexed(
+    fake_github: FakeGitHub, tmp_path: Path
+) -> None:
+    fake_github.add_collection(
+        ISSUES, [issue(1, "- Pin actions by SHA, never by tag.")]
+    )
+    index = tmp_path / "index.json"
+
+    result = submit(fake_github, tmp_path, LESSON, index)
+
+    assert result.returncode == 0, result.stderr
+    assert [(r.method, r.path) for r in fake_github.requests] == [
+        ("GET", ISSUES),
+        ("POST", ISSUES),
+        ("POST", f"{ISSUES}/2/labels"),
+    ]
+    assert [e["number"] for e in json.loads(index.read_text())["entries"]] == [1, 2]
+
+
+def test_index_failure_falls_back_to_new_issue(
+    fake_github: FakeGitHub, tmp_path: Path
+) -> None:
+    fake_github.add_collection(ISSUES, [issue(1, LESSON)])
+    fake_github.fail_next(ISSUES, 500)
+
+    result = submit(fake_github, tmp_path, LESSON, tmp_path / "index.json")
+
+    assert result.returncode == 0, result.stderr
+    assert "Could not refresh the phone-home index" in result.stdout
+    assert fake_github.count("POST", ISSUES) == 1
+
+
+def test_closed_issues_are_not_commented_on(
+    fake_github: FakeGitHub, tmp_path: Path
+) -> None:
+    fake_github.add_collection(ISSUES, [issue(1, LESSON, "2026-01-01T00:00:00Z")])
+    fake_github.add_collection(f"{ISSUES}/1/comments", [])
+    index = tmp_path / "index.json"
+    assert submit(fake_github, tmp_path, LESSON, index).returncode == 0
+    assert [e["number"] for e in json.loads(index.read_text())["entries"]] == [1]
+
+    # Closing the indexed issue drops it on the next (warm) refresh, so the
+    # same lesson opens a new issue instead.
+    fake_github.collections[ISSUES][0].update(
+        state="closed", updated_at="2026-02-01T00:00:00Z"
+    )
+    result = submit(fake_github, tmp_path, LESSON, index)
+
+    assert result.returncode == 0, result.stderr
+    assert fake_github.count("POST", ISSUES) == 1
+    assert len(fake_github.collections[f"{ISSUES}/1/comments"]) == 1
+    assert [e["number"] for e in json.loads(index.read_text())["entries"]] == [2]
+
+
+def test_failed_submission_is_reported(fake_github: FakeGitHub, tmp_path: Path) -> None:
+    """Submit logs and carries on when it can't file the lessons, but says so
+    in its `submitted` output so the digest doesn't advance its window."""
+    fake_github.add_collection(ISSUES, [])
+    fake_github.fail_next(ISSUES, 403, times=2)  # the index listing, then the create
+
+    result = submit(fake_github, tmp_path, LESSON, tmp_path / "index.json")
+
+    assert result.returncode == 0, result.stderr
+    assert "Could not create issue on tmpl/repo" in result.stdout
+    assert "output submitted=false" in result.stdout
@@ -0,0 +1,166 @@
+"""Tests for .github/scripts/plan-changes.sh and .github/scripts/path-gates.json."""
+
+import json
+import re
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT, commit_all, git_env
+
+SCRIPT = REPO_ROOT / ".github" / "scripts" / "plan-changes.sh"
+GATES = {
+    "hooks": [".hooks/**", "setup.sh"],
+    "docs": ["docs/*.md", "**/README.md"],
+    "odd": ["a[1].txt", "x?y"],
+    "never": [],
+}
+
+
+def write(repo: Path, *paths: str, content: str = "changed") -> None:
+    for path in paths:
+        (repo / path).parent.mkdir(parents=True, exist_ok=True)
+        (repo / path).write_text(content)
+
+
+def parse(stdout: str) -> dict[str, str]:
+    """Gate lines only; workflow commands like ::notice:: are skipped."""
+    return dict(
+        line.split("=", 1) for line in stdout.splitlines() if not line.startswith("::")
+    )
+
+
+def plan(
+    repo: Path, *args: str, **env: str
+) -> tuple[dict[str, str], subprocess.CompletedProcess]:
+    gates = repo / "gates.json"
+    if not gates.exists():
+        gates.write_text(json.dumps(GATES))
+    result = subprocess.run(
+        ["bash", str(SCRIPT), "--gates", str(gates), *args],
+        cwd=repo,
+        env={**git_env(), **env},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return parse(result.stdout), result
+
+
+@pytest.fixture
+def branch(empty_git_repo: Path) -> Path:
+    """A repo whose HEAD is one commit ahead of a `base` branch."""
+    write(
+        empty_git_repo,
+        ".hooks/pre-commit",
+        "docs/guide.md",
+        "src/main.py",
+        content="base",
+    )
+    commit_all(empty_git_repo, "base")
+    subprocess.run(["git", "branch", "base"], cwd=empty_git_repo, check=True)
+    return empty_git_repo
+
+
+@pytest.mark.parametrize(
+    "changed, open_gates",
+    [
+        (["src/main.py"], set()),
+        ([".hooks/pre-commit"], {"hooks"}),
+        ([".hooks/lib/deep/x.bash"], {"hooks"}),
+        (["setup.sh", "docs/guide.md"], {"hooks", "docs"}),
+        # `*` stays within a segment; `**/` also matches zero directories.
+        (["docs/api/ref.md"], set()),
+        (["README.md"], {"docs"}),
+        (["src/pkg/README.md"], {"docs"}),
+        (["setup.shx", "a1.txt", "xy"], set()),
+        (["a[1].txt"], {"odd"}),
+        (["x-y"], {"odd"}),
+    ],
+)
+def test_gates_open_on_matching_changes(
+    branch: Path, changed: list[str], open_gates: set[str]
+) -> None:
+    write(branch, *changed)
+    commit_all(branch, "change")
+
+    gates, _ = plan(branch, "--base", "base")
+
+    assert gates == {name: str(name in open_gates).lower() for name in GATES}
+    # Output follows the config's order.
+    assert list(gates) == list(GATES)
+
+
+def test_diff_is_against_the_merge_base(branch: Path) -> None:
+    write(branch, "src/feature.py")
+    commit_all(branch, "feature")
+    # The base branch moving on (even touching gated paths) doesn't count.
+    subprocess.run(["git", "checkout", "-q", "base"], cwd=branch, check=True)
+    write(branch, ".hooks/other")
+    commit_all(branch, "base moves on")
+    subprocess.run(["git", "checkout", "-q", "-"], cwd=branch, check=True)
+
+    gates, _ = plan(branch, "--base", "base")
+    assert gates["hooks"] == "false"
+
+
+def test_moving_a_file_out_of_a_gated_path_opens_it(branch: Path) -> None:
+    subprocess.run(
+        ["git", "mv", ".hooks/pre-commit", "src/pre-commit"], cwd=branch, check=True
+    )
+    commit_all(branch, "move")
+    gates, _ = plan(branch, "--base", "base")
+    assert gates["hooks"] == "true"
+
+
+def test_every_gate_opens_without_a_usable_base(branch: Path, tmp_path: Path) -> None:
+    output = tmp_path / "github_output"
+
+    gates, result = plan(branch, GITHUB_OUTPUT=str(output))
+    assert set(gates.values()) == {"true"}
+    assert output.read_text() == result.stdout
+    assert result.stderr == ""
+
+    gates, result = plan(branch, PLAN_BASE_REF="no-such-ref")
+    assert set(gates.values()) == {"true"}
+    assert "no merge base with 'no-such-ref'" in result.stdout
+
+
+def test_merge_commit_against_its_first_parent(branch: Path) -> None:
+    """CI's setup: a PR merge commit checked out with its base-branch parent."""
+    write(branch, "docs/new.md")
+    commit_all(branch, "feature")
+    subprocess.run(["git", "checkout", "-q", "base"], cwd=branch, check=True)
+    write(branch, ".hooks/other")
+    commit_all(branch, "base moves on")
+    subprocess.run(
+        ["git", "merge", "-q", "--no-ff", "-m", "merge", "-"],
+        cwd=branch,
+        env=git_env(),
+        check=True,
+    )
+
+    gates, _ = plan(branch, PLAN_BASE_REF="HEAD^1")
+    assert (gates["docs"], gates["hooks"]) == ("true", "false")
+
+
+def test_workflow_gates_are_configured() -> None:
+    """Every `steps.plan.outputs.<gate>` a workflow reads is a gate in
+    .github/scripts/path-gates.json, and every gate there is used."""
+    configured = json.loads(
+        (REPO_ROOT / ".github" / "scripts" / "path-gates.json").read_text()
+    )
+    used = set()
+    for workflow in (REPO_ROOT / ".github" / "workflows").glob("*.yaml"):
+        used |= set(re.findall(r"steps\.plan\.outputs\.([\w-]+)", workflow.read_text()))
+    assert used == set(configured)
+    # The real config parses and plans every gate.
+    result = subprocess.run(
+        ["bash", str(SCRIPT), "--base", "HEAD"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert set(parse(result.stdout)) == set(configured)
@@ -0,0 +1,114 @@
+"""Tests for .hooks/pre-commit's staged-tree result cache."""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT, git_env, init_test_repo
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """Repo with the hook, a stub lint-staged, and a `pnpm` that logs calls."""
+    root = tmp_path / "repo"
+    init_test_repo(root)
+    hooks = root / ".hooks"
+    hooks.mkdir()
+    hook = hooks / "pre-commit"
+    hook.write_text((REPO_ROOT / ".hooks" / "pre-commit").read_text())
+    hook.chmod(0o755)
+    (root / "node_modules" / ".bin").mkdir(parents=True)
+    (root / "node_modules" / ".bin" / "lint-staged").write_text("")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    pnpm = bin_dir / "pnpm"
+    pnpm.write_text(f'#!/bin/sh\necho "$*" >>"{tmp_path / "pnpm.log"}"\n')
+    pnpm.chmod(0o755)
+    (root / "a.txt").write_text("one\n")
+    stage(root)
+    return root
+
+
+def stage(repo: Path) -> None:
+    subprocess.run(["git", "add", "-A"], cwd=repo, env=git_env(), check=True)
+
+
+def run_hook(repo: Path, **env: str) -> subprocess.CompletedProcess:
+    path = f"{repo.parent / 'bin'}:{os.environ['PATH']}"
+    return subprocess.run(
+        ["bash", ".hooks/pre-commit"],
+        cwd=repo,
+        env={**git_env(), "PATH": path, **env},
+        capture_output=True,
+        text=True,
+    )
+
+
+def lint_staged_runs(repo: Path) -> int:
+    log = repo.parent / "pnpm.log"
+    return len(log.read_text().splitlines()) if log.exists() else 0
+
+
+def cache_entries(repo: Path) -> list[str]:
+    return (repo / ".git" / "pre-commit-cache").read_text().splitlines()
+
+
+def test_identical_staged_tree_skips_checks(repo: Path) -> None:
+    first = run_hook(repo)
+    second = run_hook(repo)
+
+    assert first.returncode == 0, first.stderr
+    assert second.returncode == 0, second.stderr
+    assert "already passed" in second.stderr
+    assert lint_staged_runs(repo) == 1
+
+
+def test_changed_tree_or_tool_inputs_rerun(repo: Path) -> None:
+    run_hook(repo)
+    (repo / "a.txt").write_text("two\n")
+    stage(repo)
+    run_hook(repo)
+    # A lockfile change (new tool versions) invalidates the same tree.
+    (repo / "pnpm-lock.yaml").write_text("lockfileVersion: '9.0'\n")
+    run_hook(repo)
+
+    assert lint_staged_runs(repo) == 3
+
+
+def test_failures_are_not_cached(repo: Path) -> None:
+    (repo / "a.txt").write_text("trailing space \n")
+    stage(repo)
+
+    assert run_hook(repo).returncode == 1
+    assert run_hook(repo).returncode == 1
+    assert not (repo / ".git" / "pre-commit-cache").exists()
+
+
+def test_cache_can_be_disabled(repo: Path) -> None:
+    run_hook(repo, PRE_COMMIT_CACHE="0")
+    run_hook(repo, PRE_COMMIT_CACHE="0")
+
+    assert lint_staged_runs(repo) == 2
+
+
+def test_cache_evicts_least_recently_used(repo: Path) -> None:
+    keys = []
+    for content in ("a", "b", "c"):
+        (repo / "a.txt").write_text(f"{content}\n")
+        stage(repo)
+        run_hook(repo, PRE_COMMIT_CACHE_MAX="2")
+        keys.append(cache_entries(repo)[-1])
+    assert cache_entries(repo) == keys[1:]
+
+    # A hit on "b" makes it most recent, so adding "d" evicts "c".
+    (repo / "a.txt").write_text("b\n")
+    stage(repo)
+    assert "already passed" in run_hook(repo, PRE_COMMIT_CACHE_MAX="2").stderr
+    (repo / "a.txt").write_text("d\n")
+    stage(repo)
+    run_hook(repo, PRE_COMMIT_CACHE_MAX="2")
+
+    assert cache_entries(repo)[0] == keys[1]
+    assert keys[2] not in cache_entries(repo)
@@ -0,0 +1,108 @@
+"""Tests for .claude/hooks/pre-push-cache.bash."""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT, commit_all, git_env, init_test_repo
+
+pytestmark = pytest.mark.skipif(shutil.which("jq") is None, reason="jq not available")
+
+LIB = REPO_ROOT / ".claude" / "hooks" / "pre-push-cache.bash"
+
+# A miniature pre-push check: skip on a cached pass, otherwise "run the
+# checks" (log a line) and record the pass.
+CHECK = f"""set -euo pipefail
+source "{LIB}"
+key=$(pre_push_cache_key)
+if pre_push_cache_hit "$key"; then echo cached; exit 0; fi
+echo ran >>checks.log
+pre_push_cache_record "$key"
+"""
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    init_test_repo(tmp_path)
+    (tmp_path / ".gitignore").write_text("checks.log\n")
+    (tmp_path / "package.json").write_text(
+        json.dumps({"scripts": {"test": "vitest run", "dev": "vite"}})
+    )
+    (tmp_path / "pnpm-lock.yaml").write_text("lockfileVersion: '9.0'\n")
+    (tmp_path / "a.txt").write_text("one\n")
+    commit_all(tmp_path)
+    return tmp_path
+
+
+def check(repo: Path, **env: str) -> str:
+    result = subprocess.run(
+        ["bash", "-c", CHECK],
+        cwd=repo,
+        env={**git_env(), **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def runs(repo: Path) -> int:
+    log = repo / "checks.log"
+    return len(log.read_text().splitlines()) if log.exists() else 0
+
+
+def test_same_tree_skips_checks(repo: Path) -> None:
+    assert check(repo) == ""
+    assert check(repo) == "cached"
+    assert runs(repo) == 1
+
+
+def test_new_commit_with_same_tree_is_cached(repo: Path) -> None:
+    """A no-op rebase or amend changes HEAD but not HEAD^{tree}."""
+    check(repo)
+    subprocess.run(
+        ["git", "commit", "-q", "--amend", "-m", "reworded"],
+        cwd=repo,
+        env=git_env(),
+        check=True,
+    )
+    assert check(repo) == "cached"
+
+
+@pytest.mark.parametrize(
+    ("path", "content"),
+    [
+        ("a.txt", "two\n"),
+        ("pnpm-lock.yaml", "lockfileVersion: '9.1'\n"),
+        (
+            "package.json",
+            json.dumps({"scripts": {"test": "vitest run --coverage", "dev": "vite"}}),
+        ),
+    ],
+)
+def test_inputs_invalidate(repo: Path, path: str, content: str) -> None:
+    check(repo)
+    (repo / path).write_text(content)
+    commit_all(repo)
+
+    assert check(repo) == ""
+    assert runs(repo) == 2
+
+
+def test_dirty_working_tree_is_never_cached(repo: Path) -> None:
+    check(repo)
+    (repo / "a.txt").write_text("uncommitted\n")
+    assert check(repo) == ""
+    (repo / "a.txt").write_text("one\n")
+    (repo / "new.txt").write_text("untracked\n")
+    assert check(repo) == ""
+    assert runs(repo) == 3
+
+
+def test_opt_out(repo: Path) -> None:
+    check(repo)
+    assert check(repo, PRE_PUSH_CACHE="0") == ""
+    assert runs(repo) == 2
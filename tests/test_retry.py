@@ -0,0 +1,187 @@
+"""Tests for .github/scripts/lib/retry.bash (retry_cmd and retry_run)."""
+
+import os
+import re
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT
+
+LIB = REPO_ROOT / ".github" / "scripts" / "lib" / "retry.bash"
+
+# `flaky N MESSAGE [EXIT]`: fail with MESSAGE on stderr (exit EXIT, default 1)
+# until called N times, then succeed. Counts calls in $COUNTER.
+FLAKY = r"""
+flaky() {
+  local n=$(( $(cat "$COUNTER" 2>/dev/null || echo 0) + 1 ))
+  echo "$n" >"$COUNTER"
+  if [[ "$n" -ge "$1" ]]; then echo "ok on $n"; return 0; fi
+  echo "$2" >&2
+  return "${3:-1}"
+}
+"""
+
+
+def run(tmp_path: Path, snippet: str) -> subprocess.CompletedProcess:
+    script = f'set -euo pipefail\nsource "{LIB}"\n{FLAKY}\n{snippet}\n'
+    return subprocess.run(
+        ["bash", "-c", script],
+        env={**os.environ, "COUNTER": str(tmp_path / "counter")},
+        capture_output=True,
+        text=True,
+    )
+
+
+def calls(tmp_path: Path) -> int:
+    return int((tmp_path / "counter").read_text())
+
+
+def test_retry_cmd_keeps_its_contract(tmp_path: Path) -> None:
+    result = run(tmp_path, 'retry_cmd 3 0 flaky 3 "boom" && echo "rc=$?"')
+
+    assert result.stdout.splitlines() == ["ok on 3", "rc=0"]
+    assert "attempt 1/3 failed; retrying in 0s..." in result.stderr
+    result = run(tmp_path, 'retry_cmd 2 0 false || echo "rc=$?"')
+    assert result.stdout.strip() == "rc=1"
+
+
+def test_succeeds_after_retries_and_reports_stats(tmp_path: Path) -> None:
+    result = run(
+        tmp_path,
+        'retry_run --base 0 flaky 3 "transient"\n'
+        'echo "attempts=$RETRY_LAST_ATTEMPTS elapsed=$RETRY_LAST_ELAPSED_MS"',
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "attempts=3" in result.stdout
+    assert re.search(r"retry: flaky 3 ok after 3 attempt\(s\) in \d+ms", result.stderr)
+    assert result.stderr.count("transient") == 2
+
+
+def test_returns_last_exit_status_after_max_attempts(tmp_path: Path) -> None:
+    result = run(
+        tmp_path,
+        'retry_run --max-attempts 3 --base 0 flaky 99 "down" 7 || echo "rc=$?"',
+    )
+
+    assert result.stdout.strip() == "rc=7"
+    assert calls(tmp_path) == 3
+    assert "failed after 3 attempt(s)" in result.stderr
+
+
+def test_permanent_stderr_stops_immediately(tmp_path: Path) -> None:
+    result = run(
+        tmp_path,
+        "retry_run --base 0 --permanent-on-stderr 'non-fast-forward' "
+        "flaky 5 '! [rejected] main -> main (non-fast-forward)' || echo \"rc=$?\"",
+    )
+
+    assert result.stdout.strip() == "rc=1"
+    assert calls(tmp_path) == 1
+    assert "failed permanently" in result.stderr
+
+
+@pytest.mark.parametrize(
+    "message, permanent",
+    [
+        (
+            "fatal: unable to access 'https://x/': The requested URL returned error: 403",
+            True,
+        ),
+        (
+            "remote: error: GH006: Protected branch update failed for refs/heads/main.",
+            True,
+        ),
+        # A bare 403 inside a SHA, count or URL is not an access error.
+        (
+            "error: RPC failed; curl 56 Recv failure; 4031 bytes of body are still expected",
+            False,
+        ),
+        ("   403abcd..9f2e1c0  main -> main\nfatal: the remote end hung up", False),
+    ],
+)
+def test_version_bump_push_errors(
+    tmp_path: Path, message: str, permanent: bool
+) -> None:
+    script = (REPO_ROOT / ".github" / "scripts" / "version-bump.sh").read_text()
+    [pattern] = re.findall(r"^PUSH_PERMANENT_ERRORS='(.*)'$", script, re.M)
+
+    run(
+        tmp_path,
+        f"retry_run --max-attempts 2 --base 0 --permanent-on-stderr '{pattern}' "
+        f"flaky 99 $'{message}' || true",
+    )
+
+    assert calls(tmp_path) == (1 if permanent else 2)
+
+
+@pytest.mark.parametrize(
+    "options, expected_calls",
+    [
+        ("--retry-on-exit 75", 1),  # exit 1 isn't listed → permanent
+        ("--retry-on-exit 1,75", 4),
+        ("--retry-on-stderr 'HTTP 5[0-9]{2}'", 4),
+        ("--retry-on-stderr 'timed out'", 1),
+    ],
+)
+def test_retryable_classifiers(
+    tmp_path: Path, options: str, expected_calls: int
+) -> None:
+    run(
+        tmp_path,
+        f"retry_run --max-attempts 4 --base 0 {options} flaky 99 'HTTP 502' || true",
+    )
+
+    assert calls(tmp_path) == expected_calls
+
+
+def test_deadline_bounds_total_time(tmp_path: Path) -> None:
+    result = run(
+        tmp_path,
+        "retry_run --max-attempts 0 --base 0.2 --jitter none --deadline 1 flaky 99 'down' "
+        '|| echo "rc=$? elapsed=$RETRY_LAST_ELAPSED_MS"',
+    )
+
+    match = re.search(r"rc=1 elapsed=(\d+)", result.stdout)
+    assert match, result.stdout + result.stderr
+    assert int(match.group(1)) < 1000
+    assert "deadline" in result.stderr
+    # 0.2s, 0.4s sleeps fit; the 0.8s one would overrun the 1s budget.
+    assert calls(tmp_path) == 3
+
+
+def test_retry_after_hint_overrides_backoff(tmp_path: Path) -> None:
+    result = run(
+        tmp_path,
+        "hinted() { echo 0.05 >\"$RETRY_HINT_FILE\"; flaky 2 'rate limited'; }\n"
+        "retry_run --base 30 --jitter none hinted",
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "retrying in 0.050s" in result.stderr
+
+
+def test_full_jitter_stays_within_the_ceiling(tmp_path: Path) -> None:
+    result = run(
+        tmp_path,
+        "retry_run --max-attempts 6 --base 0.01 --cap 0.02 flaky 99 'down' || true",
+    )
+
+    delays = [float(d) for d in re.findall(r"retrying in ([\d.]+)s", result.stderr)]
+    assert len(delays) == 5
+    assert all(0 <= d <= 0.02 for d in delays)
+
+
+def test_quiet_suppresses_messages_but_not_command_stderr(tmp_path: Path) -> None:
+    result = run(tmp_path, "retry_run --quiet --base 0 flaky 2 'noise'")
+
+    assert result.stderr == "noise\n"
+
+
+def test_rejects_bad_jitter(tmp_path: Path) -> None:
+    result = run(tmp_path, 'retry_run --jitter some true || echo "rc=$?"')
+
+    assert result.stdout.strip() == "rc=2"
+    assert "--jitter must be" in result.stderr
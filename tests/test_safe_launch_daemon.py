@@ -0,0 +1,291 @@
+"""Tests for .claude/hooks/safe-launch-daemon.py and safe-launch-client.bash."""
+
+import os
+import socket
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT
+
+HOOKS = REPO_ROOT / ".claude" / "hooks"
+DAEMON = HOOKS / "safe-launch-daemon.py"
+CLIENT = HOOKS / "safe-launch-client.bash"
+
+# Stand-in for safe-launch-parse.py with the same contract: tool name and
+# file path on stdout, nothing (and exit 0) for malformed JSON.
+PARSER = """import json, sys
+try:
+    payload = json.load(sys.stdin)
+except ValueError:
+    sys.exit(0)
+print(payload.get("tool_name", ""))
+print(payload.get("tool_input", {}).get("file_path", ""))
+"""
+
+EDIT = '{"tool_name": "Edit", "tool_input": {"file_path": "/project/a.sh"}}'
+
+
+@pytest.fixture
+def parser(tmp_path: Path) -> Path:
+    path = tmp_path / "safe-launch-parse.py"
+    path.write_text(PARSER)
+    return path
+
+
+@pytest.fixture
+def daemon(tmp_path: Path) -> Iterator[Path]:
+    sock = tmp_path / "d.sock"
+    proc = subprocess.Popen([sys.executable, str(DAEMON), str(sock)])
+    deadline = time.monotonic() + 10
+    while not sock.exists():
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.02)
+    yield sock
+    proc.terminate()
+    proc.wait()
+
+
+def ask(sock: Path, parser: Path, payload: str, project_dir: str = "/project") -> bytes:
+    with socket.socket(socket.AF_UNIX) as conn:
+        conn.connect(str(sock))
+        conn.sendall(f"{parser}\n{project_dir}\n{payload}".encode())
+        conn.shutdown(socket.SHUT_WR)
+        return b"".join(iter(lambda: conn.recv(4096), b""))
+
+
+def cold(parser: Path, payload: str) -> bytes:
+    return subprocess.run(
+        [sys.executable, str(parser), "/project"],
+        input=payload.encode(),
+        capture_output=True,
+    ).stdout
+
+
+@pytest.mark.parametrize(
+    "payload", [EDIT, '{"tool_name": "Bash"}', "{}", "not json", ""]
+)
+def test_matches_cold_parser(daemon: Path, parser: Path, payload: str) -> None:
+    assert ask(daemon, parser, payload) == b"ok\n" + cold(parser, payload)
+
+
+def test_reloads_edited_parser(daemon: Path, parser: Path) -> None:
+    assert ask(daemon, parser, EDIT) == b"ok\nEdit\n/project/a.sh\n"
+    parser.write_text('print("v2")\n')
+    assert ask(daemon, parser, EDIT) == b"ok\nv2\n"
+
+
+@pytest.mark.parametrize(
+    "source", ["raise RuntimeError('boom')\n", "import sys; sys.exit(3)\n", "(\n"]
+)
+def test_parser_failure_is_reported_not_answered(
+    daemon: Path, parser: Path, source: str
+) -> None:
+    parser.write_text(source)
+    assert ask(daemon, parser, EDIT) == b"err\n"
+    # The daemon keeps serving.
+    parser.write_text(PARSER)
+    assert ask(daemon, parser, EDIT).startswith(b"ok\n")
+
+
+def test_exits_when_idle(tmp_path: Path) -> None:
+    sock = tmp_path / "idle.sock"
+    proc = subprocess.run(
+        [sys.executable, str(DAEMON), str(sock)],
+        env={**os.environ, "SAFE_LAUNCH_DAEMON_IDLE": "0.2"},
+        timeout=10,
+    )
+    assert proc.returncode == 0
+    assert not sock.exists()
+
+
+def test_second_daemon_defers_to_running_one(daemon: Path, parser: Path) -> None:
+    proc = subprocess.run([sys.executable, str(DAEMON), str(daemon)], timeout=10)
+    assert proc.returncode == 0
+    assert ask(daemon, parser, EDIT).startswith(b"ok\n")
+
+
+@pytest.fixture
+def fake_socat(tmp_path: Path) -> Path:
+    """A `socat - UNIX-CONNECT:PATH` stand-in that logs each use."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    socat = bin_dir / "socat"
+    socat.write_text(
+        f"#!{sys.executable}\n"
+        "import os, socket, sys\n"
+        "open(os.environ['SOCAT_LOG'], 'a').write('x\\n')\n"
+        "s = socket.socket(socket.AF_UNIX)\n"
+        "s.connect(sys.argv[-1].split(':', 1)[1])\n"
+        "s.sendall(sys.stdin.buffer.read()); s.shutdown(socket.SHUT_WR)\n"
+        "sys.stdout.buffer.write(b''.join(iter(lambda: s.recv(4096), b'')))\n"
+    )
+    socat.chmod(0o755)
+    return bin_dir
+
+
+def parse(
+    parser: Path, payload: str, bin_dir: Path, **env: str
+) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [
+            "bash",
+            "-c",
+            f'set -euo pipefail; source "{CLIENT}"; safe_launch_parse "{parser}" /project',
+        ],
+        input=payload,
+        env={
+            **os.environ,
+            "PATH": f"{bin_dir}:{os.environ['PATH']}",
+            "SOCAT_LOG": str(bin_dir / "socat.log"),
+            **env,
+        },
+        capture_output=True,
+        text=True,
+    )
+
+
+def uses(bin_dir: Path) -> int:
+    log = bin_dir / "socat.log"
+    return len(log.read_text().splitlines()) if log.exists() else 0
+
+
+def test_client_uses_daemon(daemon: Path, parser: Path, fake_socat: Path) -> None:
+    result = parse(
+        parser, EDIT, fake_socat, SAFE_LAUNCH_DAEMON="1", SAFE_LAUNCH_SOCKET=str(daemon)
+    )
+    assert result.stdout == "Edit\n/project/a.sh\n"
+    assert uses(fake_socat) == 1
+
+
+def test_client_falls_back_on_err_reply(
+    daemon: Path, parser: Path, fake_socat: Path
+) -> None:
+    """The cold path decides when the daemon can't: here the in-daemon run
+    fails (no stdin.fileno), while the real interpreter succeeds."""
+    parser.write_text(
+        "import os, sys\nprint(os.read(sys.stdin.fileno(), 100).decode())\n"
+    )
+    result = parse(
+        parser,
+        "payload",
+        fake_socat,
+        SAFE_LAUNCH_DAEMON="1",
+        SAFE_LAUNCH_SOCKET=str(daemon),
+    )
+    assert result.stdout == "payload\n"
+    assert uses(fake_socat) == 1
+
+
+def test_client_cold_path_starts_daemon(
+    tmp_path: Path, parser: Path, fake_socat: Path
+) -> None:
+    sock = tmp_path / "lazy.sock"
+    env = {
+        "SAFE_LAUNCH_DAEMON": "1",
+        "SAFE_LAUNCH_SOCKET": str(sock),
+        "SAFE_LAUNCH_DAEMON_IDLE": "5",
+    }
+
+    first = parse(parser, EDIT, fake_socat, **env)
+    assert first.stdout == "Edit\n/project/a.sh\n"
+    assert uses(fake_socat) == 0
+
+    deadline = time.monotonic() + 10
+    while not sock.exists():
+        assert time.monotonic() < deadline, "daemon was not started"
+        time.sleep(0.02)
+    second = parse(parser, EDIT, fake_socat, **env)
+    assert second.stdout == "Edit\n/project/a.sh\n"
+    assert uses(fake_socat) == 1
+
+
+def test_client_off_by_default(daemon: Path, parser: Path, fake_socat: Path) -> None:
+    result = parse(parser, EDIT, fake_socat, SAFE_LAUNCH_SOCKET=str(daemon))
+    assert result.stdout == "Edit\n/project/a.sh\n"
+    assert uses(fake_socat) == 0
+
+
+@pytest.mark.parametrize("target", ["dir", "socket"])
+def test_client_refuses_socket_open_to_others(
+    daemon: Path, parser: Path, fake_socat: Path, target: str
+) -> None:
+    """A socket another user could have planted, or could reach, is never
+    asked: its reply would decide what the guard sees."""
+    (daemon.parent if target == "dir" else daemon).chmod(0o777)
+    try:
+        result = parse(
+            parser,
+            EDIT,
+            fake_socat,
+            SAFE_LAUNCH_DAEMON="1",
+            SAFE_LAUNCH_SOCKET=str(daemon),
+        )
+    finally:
+        daemon.parent.chmod(0o700)
+    assert result.stdout == "Edit\n/project/a.sh\n"
+    assert uses(fake_socat) == 0
+
+
+def test_default_socket_lives_in_a_private_dir(parser: Path, fake_socat: Path) -> None:
+    # Not under tmp_path: with xdist that is long enough to push the socket
+    # past the ~108-byte AF_UNIX path limit.
+    runtime = Path(tempfile.mkdtemp(prefix="sl-"))
+    runtime.chmod(0o755)
+    env = {
+        "SAFE_LAUNCH_DAEMON": "1",
+        "XDG_RUNTIME_DIR": str(runtime),
+        "SAFE_LAUNCH_DAEMON_IDLE": "5",
+    }
+    try:
+        assert parse(parser, EDIT, fake_socat, **env).stdout == "Edit\n/project/a.sh\n"
+        sock = runtime / f"claude-safe-launch-{os.getuid()}" / "daemon.sock"
+        deadline = time.monotonic() + 10
+        while not sock.exists():
+            assert time.monotonic() < deadline, "daemon was not started"
+            time.sleep(0.02)
+        assert sock.parent.stat().st_mode & 0o777 == 0o700
+        assert parse(parser, EDIT, fake_socat, **env).stdout == "Edit\n/project/a.sh\n"
+        assert uses(fake_socat) == 1
+    finally:
+        shutil.rmtree(runtime, ignore_errors=True)
+
+
+def test_concurrent_starts_leave_one_daemon(tmp_path: Path, parser: Path) -> None:
+    sock = tmp_path / "race.sock"
+    procs = [
+        subprocess.Popen([sys.executable, str(DAEMON), str(sock)]) for _ in range(5)
+    ]
+    try:
+        deadline = time.monotonic() + 10
+        while sum(p.poll() is None for p in procs) > 1 or not sock.exists():
+            assert time.monotonic() < deadline, "daemons did not settle"
+            time.sleep(0.02)
+        assert ask(sock, parser, EDIT) == b"ok\nEdit\n/project/a.sh\n"
+    finally:
+        for p in procs:
+            p.terminate()
+            p.wait()
+
+
+def test_exit_leaves_a_successors_socket(tmp_path: Path) -> None:
+    """On exit a daemon removes only the socket it bound itself."""
+    sock = tmp_path / "d.sock"
+    proc = subprocess.Popen(
+        [sys.executable, str(DAEMON), str(sock)],
+        env={**os.environ, "SAFE_LAUNCH_DAEMON_IDLE": "0.5"},
+    )
+    deadline = time.monotonic() + 10
+    while not sock.exists():
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.02)
+    sock.rename(tmp_path / "old.sock")
+    sock.write_text("successor")
+    assert proc.wait(timeout=10) == 0
+    assert sock.read_text() == "successor"
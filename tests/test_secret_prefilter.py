@@ -0,0 +1,167 @@
+"""Tests for .hooks/secret-prefilter.py and its use in .hooks/pre-commit.
+
+Fake credentials are assembled at runtime so this file itself never trips a
+secret scanner.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT, commit_all, git_env, init_test_repo
+
+PREFILTER = REPO_ROOT / ".hooks" / "secret-prefilter.py"
+
+GITHUB_PAT = "ghp" + "_" + "A1b2C3d4" * 4 + "E5f6"
+AWS_KEY = "AK" + "IA" + "QWERTYUIOPASDFGH"
+PRIVATE_KEY = (
+    "-----BEGIN "
+    + "RSA PRIVATE KEY-----\n"
+    + "MIIEowIBAAKCAQEA" * 8
+    + "\n-----END RSA PRIVATE KEY-----\n"
+)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    init_test_repo(tmp_path)
+    (tmp_path / "README.md").write_text("hello\n")
+    commit_all(tmp_path)
+    return tmp_path
+
+
+def stage(repo: Path, name: str, content: str | bytes) -> None:
+    path = repo / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content)
+    subprocess.run(["git", "add", name], cwd=repo, env=git_env(), check=True)
+
+
+def run(repo: Path, **env: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(PREFILTER)],
+        cwd=repo,
+        env={**git_env(), **env},
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_clean_changes_pass(repo: Path) -> None:
+    stage(repo, "src/app.py", "api_key = os.environ['KEY']\n")
+    result = run(repo)
+    assert result.returncode == 0, result.stderr
+    assert result.stderr == ""
+
+
+@pytest.mark.parametrize(
+    ("content", "rule"),
+    [
+        (f"token: {GITHUB_PAT}\n", "github-pat"),
+        (f"aws_access_key_id = {AWS_KEY}\n", "aws-access-token"),
+        (PRIVATE_KEY, "private-key"),
+    ],
+)
+def test_reports_staged_secret_redacted(repo: Path, content: str, rule: str) -> None:
+    stage(repo, "config/settings.env", "# settings\n" + content)
+
+    result = run(repo)
+
+    assert result.returncode == 1
+    assert f"config/settings.env:2: {rule}" in result.stderr
+    assert GITHUB_PAT not in result.stderr
+    assert AWS_KEY not in result.stderr
+
+
+def test_keyword_without_match_passes(repo: Path) -> None:
+    """Keywords only select rules; the regex still has to match."""
+    stage(
+        repo, "notes.md", "Use a ghp_ token or an AKIA key id; see -----BEGIN docs.\n"
+    )
+    assert run(repo).returncode == 0
+
+
+def test_allow_comment_suppresses_line(repo: Path) -> None:
+    stage(repo, "fixture.py", f'EXAMPLE = "{GITHUB_PAT}"  # gitleaks:allow\n')
+    assert run(repo).returncode == 0
+
+
+def test_scans_index_not_working_tree(repo: Path) -> None:
+    stage(repo, "a.txt", f"{GITHUB_PAT}\n")
+    (repo / "a.txt").write_text("cleaned up but not re-staged\n")
+    assert run(repo).returncode == 1
+
+    stage(repo, "a.txt", "clean\n")
+    (repo / "a.txt").write_text(f"{GITHUB_PAT}\n")
+    assert run(repo).returncode == 0
+
+
+def test_only_changed_files_are_scanned(repo: Path) -> None:
+    stage(repo, "old.txt", f"{GITHUB_PAT}  # gitleaks:allow\n")
+    commit_all(repo)
+    (repo / "old.txt").write_text(f"{GITHUB_PAT}\n")  # unstaged
+    stage(repo, "new.txt", "fine\n")
+    assert run(repo).returncode == 0
+
+
+def test_skips_binary_and_oversized_blobs(repo: Path) -> None:
+    stage(repo, "image.bin", b"\x89PNG\0\0" + GITHUB_PAT.encode())
+    stage(repo, "big.txt", "x" * 100 + GITHUB_PAT + "\n")
+    assert run(repo, SECRET_PREFILTER_MAX_BYTES="64").returncode == 0
+    assert run(repo).returncode == 1
+
+
+def test_oversized_blobs_are_dropped_before_reading(repo: Path) -> None:
+    """Blobs over the cap never reach `cat-file --batch`; the rest still line
+    up with their paths."""
+    stage(repo, "a-big.txt", "x" * 100 + GITHUB_PAT + "\n")
+    stage(repo, "b-small.txt", f"{GITHUB_PAT}\n")
+    stage(repo, "c-big.txt", "y" * 100 + GITHUB_PAT + "\n")
+    result = run(repo, SECRET_PREFILTER_MAX_BYTES="64")
+    assert result.returncode == 1
+    assert [line.split(":")[0] for line in result.stderr.splitlines()[:-2]] == [
+        "b-small.txt"
+    ]
+
+
+def test_initial_commit(tmp_path: Path) -> None:
+    init_test_repo(tmp_path)
+    stage(tmp_path, "a.txt", f"{GITHUB_PAT}\n")
+    result = run(tmp_path)
+    assert result.returncode == 1
+    assert "a.txt:1: github-pat" in result.stderr
+
+
+def test_nothing_staged(repo: Path) -> None:
+    assert run(repo).returncode == 0
+
+
+@pytest.fixture
+def hooked_repo(repo: Path) -> Path:
+    hooks = repo / ".hooks"
+    hooks.mkdir()
+    for name in ("pre-commit", "secret-prefilter.py"):
+        (hooks / name).write_bytes((REPO_ROOT / ".hooks" / name).read_bytes())
+    return repo
+
+
+def test_pre_commit_hook_blocks_secrets(hooked_repo: Path) -> None:
+    stage(hooked_repo, "a.txt", f"{GITHUB_PAT}\n")
+    hook = ["bash", ".hooks/pre-commit"]
+    env = {**git_env(), "PRE_COMMIT_CACHE": "0"}
+
+    blocked = subprocess.run(
+        hook, cwd=hooked_repo, env=env, capture_output=True, text=True
+    )
+    assert blocked.returncode == 1
+    assert "a.txt:1: github-pat" in blocked.stderr
+
+    skipped = subprocess.run(
+        hook, cwd=hooked_repo, env={**env, "SECRET_PREFILTER": "0"}, capture_output=True
+    )
+    assert skipped.returncode == 0
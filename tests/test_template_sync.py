@@ -6,12 +6,19 @@ resulting file contents + GITHUB_OUTPUT entries.
 """
 
 import os
+import shutil
 import subprocess
 from pathlib import Path
 
 import pytest
 
-from tests._helpers import GIT_IDENTITY_ENV, commit_all, init_test_repo
+from tests._helpers import (
+    GIT_IDENTITY_ENV,
+    RepoCache,
+    commit_all,
+    copy_tree,
+    init_test_repo,
+)
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 SCRIPT = REPO_ROOT / ".github" / "scripts" / "template-sync.sh"
@@ -45,14 +52,17 @@ def parse_outputs(github_output: Path) -> dict[str, str]:
     return result
 
 
+def _build_pair(path: Path) -> None:
+    init_test_repo(path / "child")
+    init_test_repo(path / "template")
+
+
 @pytest.fixture
-def workdir(tmp_path: Path) -> Path:
+def workdir(tmp_path: Path, repo_cache: RepoCache) -> Path:
     """Sandbox with a child repo and a sibling template repo. Tests access
     them as `workdir / "child"` and `workdir / "template"`; run_sync() copies
     the template into `child/_template` so the script's relative paths line up."""
-    init_test_repo(tmp_path / "child")
-    init_test_repo(tmp_path / "template")
-    return tmp_path
+    return repo_cache.clone("template-pair", _build_pair, tmp_path)
 
 
 def run_sync(
@@ -63,9 +73,8 @@ def run_sync(
     exclude_paths: str = "",
 ) -> tuple[subprocess.CompletedProcess, Path]:
     template_copy = child / "_template"
-    if template_copy.exists():
-        subprocess.run(["rm", "-rf", str(template_copy)], check=True)
-    subprocess.run(["cp", "-a", str(template), str(template_copy)], check=True)
+    shutil.rmtree(template_copy, ignore_errors=True)
+    copy_tree(template, template_copy)
 
     output_file = child.parent / f"github_output_{child.name}.txt"
     output_file.write_text("")
@@ -325,7 +334,7 @@ def test_fails_loudly_without_github_output(workdir: Path) -> None:
     write(template / "config" / "a.txt", "x\n")
     commit_all(template)
     template_copy = workdir / "child" / "_template"
-    subprocess.run(["cp", "-a", str(template), str(template_copy)], check=True)
+    copy_tree(template, template_copy)
 
     env = {
         **os.environ,
@@ -343,3 +352,35 @@ def test_fails_loudly_without_github_output(workdir: Path) -> None:
     )
     assert result.returncode != 0
     assert "GITHUB_OUTPUT" in result.stderr
+
+
+def test_default_work_dir_is_private_and_removed(workdir: Path) -> None:
+    """Without TEMPLATE_SYNC_WORK_DIR, scratch files go to a fresh dir under
+    TMPDIR, which is removed when the sync finishes."""
+    template = workdir / "template"
+    write(template / "config" / "a.txt", "x\n")
+    commit_all(template)
+    copy_tree(template, workdir / "child" / "_template")
+    tmpdir = workdir / "tmp"
+    tmpdir.mkdir()
+    output_file = workdir / "github_output.txt"
+
+    env = {
+        **os.environ,
+        **GIT_IDENTITY_ENV,
+        "SYNC_PATHS": "config",
+        "GITHUB_OUTPUT": str(output_file),
+        "TMPDIR": str(tmpdir),
+    }
+    env.pop("TEMPLATE_SYNC_WORK_DIR", None)
+    result = subprocess.run(
+        ["bash", str(SCRIPT)],
+        cwd=workdir / "child",
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert (workdir / "child" / "config" / "a.txt").read_text() == "x\n"
+    assert list(tmpdir.iterdir()) == []
@@ -0,0 +1,217 @@
+"""Tests for .claude/hooks/tool-cache.bash."""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tarfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from tests._helpers import REPO_ROOT
+
+LIB = REPO_ROOT / ".claude" / "hooks" / "tool-cache.bash"
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("curl") is None, reason="curl not available"
+)
+
+
+@pytest.fixture
+def shims(tmp_path: Path) -> Path:
+    """A curl wrapper that logs each download, and a fake uv."""
+    bin_dir = tmp_path / "shims"
+    bin_dir.mkdir()
+    curl = bin_dir / "curl"
+    curl.write_text(
+        "#!/usr/bin/env bash\n"
+        'echo "${@: -1}" >>"$CURL_LOG"\n'
+        'sleep "${CURL_DELAY:-0}"\n'
+        f'exec {shutil.which("curl")} "$@"\n'
+    )
+    uv = bin_dir / "uv"
+    uv.write_text(
+        "#!/usr/bin/env bash\n"
+        'echo "$*" >>"$CURL_LOG"\n'
+        'sleep "${UV_DELAY:-0}"\n'
+        'name="${@: -1}"; name="${name%%=*}"\n'
+        'mkdir -p "$UV_TOOL_BIN_DIR"\n'
+        'printf \'#!/bin/sh\\necho "%s from uv"\\n\' "$name" >"$UV_TOOL_BIN_DIR/$name"\n'
+        'chmod +x "$UV_TOOL_BIN_DIR/$name"\n'
+    )
+    for shim in (curl, uv):
+        shim.chmod(0o755)
+    return bin_dir
+
+
+def binary(tmp_path: Path, name: str, output: str) -> Path:
+    path = tmp_path / "dl" / name
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(f"#!/bin/sh\necho {output}\n")
+    return path
+
+
+def setup(
+    tmp_path: Path, shims: Path, script: str, **env: str
+) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [
+            "bash",
+            "-c",
+            f'set -euo pipefail; source "{LIB}"\n{script}\n'
+            'rc=0; tool_cache_install || rc=$?; echo "BIN=$TOOL_CACHE_BIN"; exit "$rc"',
+        ],
+        env={
+            "PATH": f"{shims}:{os.environ['PATH']}",
+            "HOME": str(tmp_path),
+            "TOOL_CACHE_DIR": str(tmp_path / "cache"),
+            "CURL_LOG": str(tmp_path / "fetches.log"),
+            **env,
+        },
+        capture_output=True,
+        text=True,
+    )
+
+
+def fetches(tmp_path: Path) -> list[str]:
+    log = tmp_path / "fetches.log"
+    return log.read_text().splitlines() if log.exists() else []
+
+
+def bin_dir(result: subprocess.CompletedProcess) -> Path:
+    return Path(result.stdout.strip().rsplit("BIN=", 1)[1])
+
+
+def test_installs_once_and_reuses_across_sessions(tmp_path: Path, shims: Path) -> None:
+    shfmt = binary(tmp_path, "shfmt", "shfmt 3.12.0")
+    script = f"tool_cache_add shfmt 3.12.0 url file://{shfmt}\ntool_cache_add ruff 0.15.0 uv ruff==0.15.0"
+
+    first = setup(tmp_path, shims, script)
+    assert first.returncode == 0, first.stderr
+    tools = bin_dir(first)
+    assert (
+        subprocess.run([tools / "shfmt"], capture_output=True, text=True).stdout
+        == "shfmt 3.12.0\n"
+    )
+    assert (
+        subprocess.run([tools / "ruff"], capture_output=True, text=True).stdout
+        == "ruff from uv\n"
+    )
+    assert len(fetches(tmp_path)) == 2
+
+    shfmt.unlink()
+    second = setup(tmp_path, shims, script)
+    assert second.returncode == 0, second.stderr
+    assert bin_dir(second) == tools
+    assert second.stderr == ""
+    assert len(fetches(tmp_path)) == 2
+
+
+def test_pin_change_reuses_unchanged_tools(tmp_path: Path, shims: Path) -> None:
+    jq = binary(tmp_path, "jq", "jq")
+    shfmt = binary(tmp_path, "shfmt", "shfmt")
+    assert (
+        setup(tmp_path, shims, f"tool_cache_add jq 1.7.1 url file://{jq}").returncode
+        == 0
+    )
+
+    result = setup(
+        tmp_path,
+        shims,
+        f"tool_cache_add jq 1.7.1 url file://{jq}\ntool_cache_add shfmt 3.12.0 url file://{shfmt}",
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert fetches(tmp_path) == [f"file://{jq}", f"file://{shfmt}"]
+    assert sorted(p.name for p in bin_dir(result).iterdir()) == ["jq", "shfmt"]
+
+
+def test_extracts_archive_member(tmp_path: Path, shims: Path) -> None:
+    exe = binary(tmp_path, "shellcheck", "shellcheck 0.11.0")
+    archive = tmp_path / "dl" / "shellcheck.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        tar.add(exe, arcname="shellcheck-v0.11.0/shellcheck")
+
+    result = setup(
+        tmp_path,
+        shims,
+        f'tool_cache_add shellcheck 0.11.0 url file://{archive} "" shellcheck-v0.11.0/shellcheck',
+    )
+
+    assert result.returncode == 0, result.stderr
+    out = subprocess.run(
+        [bin_dir(result) / "shellcheck"], capture_output=True, text=True
+    )
+    assert out.stdout == "shellcheck 0.11.0\n"
+
+
+def test_checksum_mismatch_is_not_cached(tmp_path: Path, shims: Path) -> None:
+    jq = binary(tmp_path, "jq", "jq")
+    good = hashlib.sha256(jq.read_bytes()).hexdigest()
+    shfmt = binary(tmp_path, "shfmt", "shfmt")
+
+    result = setup(
+        tmp_path,
+        shims,
+        f"tool_cache_add jq 1.7.1 url file://{jq} {'0' * 64}\n"
+        f"tool_cache_add shfmt 3.12.0 url file://{shfmt}",
+    )
+
+    assert result.returncode == 1
+    assert "jq checksum mismatch" in result.stderr
+    assert "failed to install jq" in result.stderr
+    # The tools that did install are still linked.
+    assert [p.name for p in bin_dir(result).iterdir()] == ["shfmt"]
+
+    retry = setup(tmp_path, shims, f"tool_cache_add jq 1.7.1 url file://{jq} {good}")
+    assert retry.returncode == 0, retry.stderr
+
+
+def test_missing_tools_download_concurrently(tmp_path: Path, shims: Path) -> None:
+    script = "\n".join(
+        f"tool_cache_add {name} 1.0 url file://{binary(tmp_path, name, name)}"
+        for name in ("a", "b", "c", "d")
+    )
+
+    start = time.monotonic()
+    result = setup(tmp_path, shims, script, CURL_DELAY="1")
+    elapsed = time.monotonic() - start
+
+    assert result.returncode == 0, result.stderr
+    assert elapsed < 3, f"four 1s downloads took {elapsed:.1f}s"
+
+
+def test_deleted_store_entry_is_refetched(tmp_path: Path, shims: Path) -> None:
+    jq = binary(tmp_path, "jq", "jq")
+    script = f"tool_cache_add jq 1.7.1 url file://{jq}"
+    assert setup(tmp_path, shims, script).returncode == 0
+    shutil.rmtree(tmp_path / "cache" / "store")
+
+    result = setup(tmp_path, shims, script)
+
+    assert result.returncode == 0, result.stderr
+    assert len(fetches(tmp_path)) == 2
+
+
+def test_concurrent_sessions_install_a_uv_tool_once(
+    tmp_path: Path, shims: Path
+) -> None:
+    """uv installs in place, so a second session waits rather than wiping it."""
+    script = "tool_cache_add ruff 0.15.0 uv ruff==0.15.0"
+
+    with ThreadPoolExecutor(2) as pool:
+        results = list(
+            pool.map(lambda _: setup(tmp_path, shims, script, UV_DELAY="1"), range(2))
+        )
+
+    for result in results:
+        assert result.returncode == 0, result.stderr
+        tools = bin_dir(result)
+        assert (
+            subprocess.run([tools / "ruff"], capture_output=True, text=True).stdout
+            == "ruff from uv\n"
+        )
+    assert len(fetches(tmp_path)) == 1
@@ -1,6 +1,8 @@
 """Tests for .github/scripts/validate-config.sh."""
 
 import json
+import os
+import shutil
 import subprocess
 from pathlib import Path
 from typing import Callable
@@ -22,7 +24,7 @@ def make_hook(sandbox: Path, rel_path: str, executable: bool = True) -> Path:
 
 
 def run_validator(
-    sandbox: Path, copy_script: Callable[[str, Path], Path]
+    sandbox: Path, copy_script: Callable[[str, Path], Path], **env: str
 ) -> subprocess.CompletedProcess:
     scripts_dir = sandbox / ".github" / "scripts"
     scripts_dir.mkdir(parents=True, exist_ok=True)
@@ -30,6 +32,7 @@ def run_validator(
     return subprocess.run(
         ["bash", ".github/scripts/validate-config.sh"],
         cwd=sandbox,
+        env={**os.environ, **env},
         capture_output=True,
         text=True,
     )
@@ -155,3 +158,129 @@ def test_pretooluse_with_safe_launch_passes(tmp_path: Path, copy_script) -> None
     result = run_validator(tmp_path, copy_script)
     assert result.returncode == 0, result.stdout + result.stderr
     assert "All checks passed" in result.stdout
+
+
+def test_rejects_python_hook_with_syntax_error(tmp_path: Path, copy_script) -> None:
+    write_settings(tmp_path, {"hooks": {}})
+    path = tmp_path / ".hooks" / "bad.py"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("#!/usr/bin/env python3\ndef f(:\n")
+    path.chmod(0o755)
+    make_hook(tmp_path, ".hooks/good.py").write_text("#!/usr/bin/env python3\nx = 1\n")
+    result = run_validator(tmp_path, copy_script)
+    assert result.returncode == 1
+    assert ".hooks/bad.py has a python syntax error: line 2:" in result.stdout
+    assert "good.py" not in result.stdout
+
+
+def test_bash_errors_report_the_hooks_own_line_numbers(
+    tmp_path: Path, copy_script
+) -> None:
+    write_settings(tmp_path, {"hooks": {}})
+    make_hook(tmp_path, ".hooks/bad").write_text("#!/usr/bin/env bash\nx=1\nif then\n")
+    make_hook(tmp_path, ".hooks/helper.bash", executable=False).write_text("")
+    result = run_validator(tmp_path, copy_script)
+    assert result.returncode == 1
+    assert (
+        ".hooks/bad: line 3: syntax error near unexpected token `then'" in result.stdout
+    )
+    assert "helper.bash" not in result.stdout
+
+
+def test_brace_breakout_hook_is_rejected_and_never_run(
+    empty_git_repo: Path, copy_script
+) -> None:
+    """A stray `}` must not close a wrapper around the hook and let the rest of
+    the file run during validation; the file is a syntax error, not cached."""
+    repo = empty_git_repo
+    write_settings(repo, {"hooks": {}})
+    make_hook(repo, ".hooks/evil").write_text("echo hi\n}\ntouch PWNED\n{\n:\n")
+    result = run_validator(repo, copy_script)
+    assert result.returncode == 1
+    assert ".hooks/evil has a bash syntax error" in result.stdout
+    assert "unexpected token `}'" in result.stdout
+    assert not (repo / "PWNED").exists()
+    assert not (repo / ".git" / "validate-config" / "syntax-ok").exists()
+
+
+def test_many_hooks_are_checked_in_parallel_batches(
+    tmp_path: Path, copy_script
+) -> None:
+    write_settings(tmp_path, {"hooks": {}})
+    for n in range(40):
+        make_hook(tmp_path, f".hooks/ok{n:02d}")
+    make_hook(tmp_path, ".hooks/bad").write_text("#!/usr/bin/env bash\nif then\n")
+    result = run_validator(tmp_path, copy_script)
+    assert result.returncode == 1
+    assert result.stdout.count("has a bash syntax error") == 1
+    assert "Validation failed with 1 error(s)" in result.stdout
+
+
+def test_syntax_results_are_cached_by_blob_oid(
+    empty_git_repo: Path, copy_script
+) -> None:
+    """Passing hooks are recorded by OID in the git dir and skipped next run;
+    failing ones are never cached, and an edit re-checks the file."""
+    repo = empty_git_repo
+    write_settings(repo, {"hooks": {}})
+    hook = make_hook(repo, ".hooks/pre-commit")
+    cache = repo / ".git" / "validate-config" / "syntax-ok"
+
+    assert run_validator(repo, copy_script).returncode == 0
+    oid = subprocess.run(
+        ["git", "hash-object", str(hook)], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    assert any(line.endswith(f" {oid}") for line in cache.read_text().splitlines())
+
+    # Swap in a broken hook whose OID we pretend already passed: a cache hit
+    # means it is not parsed at all.
+    hook.write_text("#!/usr/bin/env bash\nif [[\n")
+    bad_oid = subprocess.run(
+        ["git", "hash-object", str(hook)], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    key = cache.read_text().splitlines()[0].rsplit(" ", 1)[0]
+    cache.write_text(f"{key} {bad_oid}\n")
+    assert run_validator(repo, copy_script).returncode == 0
+
+    cache.unlink()
+    result = run_validator(repo, copy_script)
+    assert result.returncode == 1
+    assert "has a bash syntax error" in result.stdout
+    assert not cache.exists()
+
+
+def test_python_upgrade_in_place_rechecks(
+    empty_git_repo: Path, tmp_path: Path, copy_script
+) -> None:
+    """A new python3 build at the same path doesn't reuse the old passes."""
+    repo = empty_git_repo
+    write_settings(repo, {"hooks": {}})
+    hook = repo / ".claude" / "hooks" / "check.py"
+    hook.parent.mkdir(parents=True)
+    hook.write_text("print('ok')\n")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    python3 = bin_dir / "python3"
+    python3.write_text(
+        '#!/bin/sh\n[ "$1" = -VV ] && { echo "Python 3 ($PY_BUILD)"; exit 0; }\n'
+        f'exec {shutil.which("python3")} "$@"\n'
+    )
+    python3.chmod(0o755)
+    path = f"{bin_dir}:{os.environ['PATH']}"
+    cache = repo / ".git" / "validate-config" / "syntax-ok"
+
+    assert run_validator(repo, copy_script, PATH=path, PY_BUILD="a").returncode == 0
+    # Pretend a broken version of the hook passed under build "a".
+    old_oid = subprocess.run(
+        ["git", "hash-object", str(hook)], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    hook.write_text("def broken(:\n")
+    bad_oid = subprocess.run(
+        ["git", "hash-object", str(hook)], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    cache.write_text(cache.read_text().replace(old_oid, bad_oid))
+    assert run_validator(repo, copy_script, PATH=path, PY_BUILD="a").returncode == 0
+
+    result = run_validator(repo, copy_script, PATH=path, PY_BUILD="b")
+    assert result.returncode == 1
+    assert "check.py" in result.stdout